@@ -0,0 +1,140 @@
+# core/indicator_cache.py
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# === CONFIG ===
+MAX_CACHED_SERIES = 64
+
+# === Indicator registry: name -> func(cache, series_key, **params) -> array ===
+INDICATORS = {}
+
+
+def register_indicator(name):
+    def decorator(func):
+        INDICATORS[name] = func
+        return func
+    return decorator
+
+
+@register_indicator("ema")
+def _ema(cache, key, span: int, column: str = "Close"):
+    return pd.Series(cache.column(key, column)).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+@register_indicator("macd")
+def _macd(cache, key, fast: int = 12, slow: int = 26):
+    return cache.compute(key, "ema", span=fast) - cache.compute(key, "ema", span=slow)
+
+
+@register_indicator("macd_signal")
+def _macd_signal(cache, key, fast: int = 12, slow: int = 26, signal: int = 9):
+    macd = cache.compute(key, "macd", fast=fast, slow=slow)
+    return pd.Series(macd).ewm(span=signal, adjust=False).mean().to_numpy()
+
+
+@register_indicator("range_atr")
+def _range_atr(cache, key, window: int = 14):
+    spread = cache.column(key, "High") - cache.column(key, "Low")
+    return pd.Series(spread).rolling(window=window).mean().to_numpy()
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    values = values.view()
+    values.flags.writeable = False
+    return values
+
+
+def _index_ns(index: pd.Index) -> np.ndarray:
+    return index.values.astype('datetime64[ns]').view(np.int64)
+
+
+def frame_version(df: pd.DataFrame) -> str:
+    """Content fingerprint of a price frame, used when the loader has no version of its own."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(_index_ns(df.index)))
+    for col in df.select_dtypes(include="number").columns:
+        digest.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)))
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Indicator series keyed by (ticker, data version, indicator, params).
+
+    Each series is computed once over a registered price history and stored as a
+    read-only array. Frames that are windows of a registered history (date-range
+    filters, walk-forward folds) are served zero-copy slices of the full-history
+    values. Registered frames are treated as immutable.
+    """
+
+    def __init__(self, max_series: int = MAX_CACHED_SERIES):
+        self.max_series = max_series
+        self._series = OrderedDict()
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, df: pd.DataFrame, ticker: str = None, version: str = None) -> tuple:
+        key = (ticker, version or frame_version(df))
+        if key not in self._series:
+            self._series[key] = {
+                "index": _read_only(_index_ns(df.index)),
+                "columns": {col: _read_only(df[col].to_numpy(dtype=np.float64))
+                            for col in df.select_dtypes(include="number").columns},
+            }
+            while len(self._series) > self.max_series:
+                self._evict(next(iter(self._series)))
+        self._series.move_to_end(key)
+        df.attrs["indicator_key"] = key
+        return key
+
+    def column(self, key: tuple, column: str) -> np.ndarray:
+        return self._series[key]["columns"][column]
+
+    def compute(self, key: tuple, name: str, **params) -> np.ndarray:
+        """Full-history values of one indicator for a registered series."""
+        value_key = key + (name, tuple(sorted(params.items())))
+        values = self._values.get(value_key)
+        if values is not None:
+            self.hits += 1
+            return values
+
+        self.misses += 1
+        values = _read_only(np.asarray(INDICATORS[name](self, key, **params), dtype=np.float64))
+        self._values[value_key] = values
+        return values
+
+    def get(self, df: pd.DataFrame, name: str, **params) -> np.ndarray:
+        """Indicator values aligned row-for-row with df."""
+        key, start = self._locate(df)
+        return self.compute(key, name, **params)[start:start + len(df)]
+
+    def clear(self):
+        self._series.clear()
+        self._values.clear()
+        self.hits = self.misses = 0
+
+    def _locate(self, df: pd.DataFrame) -> tuple:
+        key = df.attrs.get("indicator_key")
+        series = self._series.get(key) if key else None
+        if series is not None and len(df):
+            index = series["index"]
+            first, last = _index_ns(df.index[[0, -1]])
+            start = int(np.searchsorted(index, first))
+            stop = start + len(df)
+            if stop <= len(index) and index[start] == first and index[stop - 1] == last:
+                return key, start
+        return self.register(df, ticker=key[0] if key else None), 0
+
+    def _evict(self, key: tuple):
+        del self._series[key]
+        for value_key in [k for k in self._values if k[:2] == key]:
+            del self._values[value_key]
+
+
+# Process-wide cache shared by every strategy and sweep/walk-forward worker
+INDICATOR_CACHE = IndicatorCache()
@@ -3,36 +3,84 @@
 import pandas as pd
 import numpy as np
 
+METRIC_COLUMNS = [
+    "Total Trades", "Total Return %", "Avg Return %", "Sharpe Ratio",
+    "Max Drawdown %", "Profit Factor", "Expectancy", "Win Rate"
+]
+
+
 def compute_fx_metrics(results_df: pd.DataFrame) -> dict:
     if results_df.empty:
         return {}
 
-    results_df['Return_%'] = (results_df['Exit_Price'] - results_df['Entry_Price']) / results_df['Entry_Price'] * 100
-    results_df['Pips'] = (results_df['Exit_Price'] - results_df['Entry_Price']) * 10000
-
-    equity = results_df['Return_%'].cumsum()
-    peak = equity.cummax()
-    drawdown = peak - equity
-    max_dd = drawdown.max()
-
-    win_trades = results_df[results_df['Result'] == 'Win']
-    loss_trades = results_df[results_df['Result'] == 'Loss']
-
-    total_return = results_df['Return_%'].sum()
-    avg_return = results_df['Return_%'].mean()
-    std_return = results_df['Return_%'].std()
-    sharpe = (avg_return / std_return) * np.sqrt(252) if std_return else 0
-    win_rate = len(win_trades) / len(results_df) if len(results_df) else 0
-    expectancy = (win_rate * win_trades['Return_%'].mean()) + ((1 - win_rate) * loss_trades['Return_%'].mean()) if not win_trades.empty and not loss_trades.empty else 0
-    profit_factor = win_trades['Return_%'].sum() / abs(loss_trades['Return_%'].sum()) if not loss_trades.empty else np.inf
-
-    return {
-        "Total Trades": len(results_df),
-        "Total Return %": round(total_return, 2),
-        "Avg Return %": round(avg_return, 2),
-        "Sharpe Ratio": round(sharpe, 2),
-        "Max Drawdown %": round(max_dd, 2),
-        "Profit Factor": round(profit_factor, 2),
-        "Expectancy": round(expectancy, 2),
-        "Win Rate": f"{win_rate:.2%}"
-    }
+    metrics = compute_fx_metrics_batch(results_df, np.zeros(len(results_df), dtype=np.int8))
+    return metrics.iloc[0].to_dict()
+
+
+def compute_fx_metrics_batch(trades: pd.DataFrame, group_key) -> pd.DataFrame:
+    """
+    compute_fx_metrics for every group of a concatenated trade table in one pass.
+
+    group_key is a column name, a list of column names, or an array aligned with
+    trades. Trades keep their row order within each group (equity and drawdown
+    follow it). The input is never modified. Returns one row per group, in order
+    of first appearance, with the same columns and rounding as compute_fx_metrics.
+    """
+    if isinstance(group_key, str):
+        by = [trades[group_key]]
+    elif isinstance(group_key, list):
+        by = [trades[col] for col in group_key]
+    else:
+        by = [pd.Series(np.asarray(group_key), index=trades.index)]
+
+    if trades.empty:
+        return pd.DataFrame(columns=METRIC_COLUMNS)
+
+    entry = trades['Entry_Price'].to_numpy(dtype=np.float64)
+    exit_ = trades['Exit_Price'].to_numpy(dtype=np.float64)
+    returns = pd.Series((exit_ - entry) / entry * 100, index=trades.index)
+    is_win = trades['Result'].eq('Win')
+    is_loss = trades['Result'].eq('Loss')
+
+    equity = returns.groupby(by, sort=False).cumsum()
+    drawdown = equity.groupby(by, sort=False).cummax() - equity
+
+    frame = pd.DataFrame({
+        'ret': returns,
+        'dd': drawdown,
+        'win': is_win,
+        'loss': is_loss,
+        'win_ret': returns.where(is_win),
+        'loss_ret': returns.where(is_loss),
+    })
+    agg = frame.groupby(by, sort=False).agg(
+        n=('ret', 'size'), total=('ret', 'sum'), avg=('ret', 'mean'), std=('ret', 'std'),
+        max_dd=('dd', 'max'), wins=('win', 'sum'), losses=('loss', 'sum'),
+        win_sum=('win_ret', 'sum'), loss_sum=('loss_ret', 'sum'),
+        win_mean=('win_ret', 'mean'), loss_mean=('loss_ret', 'mean'),
+    )
+
+    std = agg['std'].to_numpy()
+    has_wins = agg['wins'].to_numpy() > 0
+    has_losses = agg['losses'].to_numpy() > 0
+    win_rate = agg['wins'].to_numpy() / agg['n'].to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std == 0, 0.0, agg['avg'].to_numpy() / std * np.sqrt(252))
+        expectancy = np.where(
+            has_wins & has_losses,
+            win_rate * agg['win_mean'].to_numpy() + (1 - win_rate) * agg['loss_mean'].to_numpy(),
+            0.0,
+        )
+        profit_factor = np.where(has_losses, agg['win_sum'].to_numpy() / np.abs(agg['loss_sum'].to_numpy()), np.inf)
+
+    return pd.DataFrame({
+        "Total Trades": agg['n'].to_numpy(),
+        "Total Return %": agg['total'].round(2).to_numpy(),
+        "Avg Return %": agg['avg'].round(2).to_numpy(),
+        "Sharpe Ratio": np.round(sharpe, 2),
+        "Max Drawdown %": agg['max_dd'].round(2).to_numpy(),
+        "Profit Factor": np.round(profit_factor, 2),
+        "Expectancy": np.round(expectancy, 2),
+        "Win Rate": [f"{rate:.2%}" for rate in win_rate],
+    }, index=agg.index)
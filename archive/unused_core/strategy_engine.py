@@ -8,17 +8,20 @@ from core.metrics import compute_fx_metrics
 
 
 def run_strategy_on_ticker(df: pd.DataFrame, strategy_func, strategy_name: str,
-                            atr_mult: float = 1.5, max_bars: int = 20) -> tuple[pd.DataFrame, dict]:
-    df = df.copy()
-    df.sort_index(inplace=True)
+                            atr_mult: float = 1.5, max_bars: int = 20,
+                            **strategy_params) -> tuple[pd.DataFrame, dict]:
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
 
-    trades = strategy_func(df, atr_mult=atr_mult, max_bars=max_bars)
+    trades = strategy_func(df, atr_mult=atr_mult, max_bars=max_bars, **strategy_params)
     if not trades:
         print(f"[⚠️] No trades for {strategy_name}")
         return pd.DataFrame(), {}
 
     results_df = pd.DataFrame(trades)
     results_df['PnL'] = (results_df['Exit_Price'] - results_df['Entry_Price']) * 10000  # in pips
+    results_df['Return_%'] = (results_df['Exit_Price'] - results_df['Entry_Price']) / results_df['Entry_Price'] * 100
+    results_df['Pips'] = results_df['PnL']
     results_df['Result'] = results_df['PnL'].apply(lambda x: 'Win' if x > 0 else 'Loss' if x < 0 else 'Timeout')
 
     metrics = compute_fx_metrics(results_df)
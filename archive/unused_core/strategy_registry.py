@@ -7,6 +7,8 @@ def register_strategy(func):
     """
     Decorator to register a strategy function with a global strategy registry.
     Each strategy must accept a DataFrame and return a list of trade dicts.
+    Strategies read indicators from core.indicator_cache rather than adding
+    columns to the DataFrame, which callers may pass in as a read-only view.
     """
     STRATEGY_REGISTRY[func.__name__] = func
     return func
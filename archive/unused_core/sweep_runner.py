@@ -0,0 +1,166 @@
+# core/sweep_runner.py
+
+import os
+import csv
+import json
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from core.strategy_engine import run_strategy_on_ticker
+from core.metrics import METRIC_COLUMNS
+from core.strategy_registry import STRATEGY_REGISTRY
+from core.indicator_cache import INDICATOR_CACHE, frame_version
+from data.local_loader import load_local_csv
+import core.strategies.macd_strategy  # noqa: F401 - registers the bundled strategies
+
+# === CONFIG ===
+SWEEP_SUMMARY_FILE = "reports/strategy_sweep_summary.csv"
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+DEFAULT_PARAM_GRID = {"atr_mult": [1.5], "max_bars": [20]}
+SUMMARY_COLUMNS = ["Job_Key", "Strategy", "Ticker", "Params"] + METRIC_COLUMNS
+
+# Shared-memory frames attached by this worker process, keyed by block name
+_ATTACHED_FRAMES = {}
+
+
+def expand_param_grid(param_grid: dict) -> list[dict]:
+    """Cartesian product of a {param: [values]} grid, in a stable key order."""
+    keys = sorted(param_grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(param_grid[k] for k in keys))]
+
+
+def make_job_key(strategy_name: str, ticker: str, params: dict) -> str:
+    return f"{strategy_name}|{ticker}|{json.dumps(params, sort_keys=True)}"
+
+
+def _share_frame(df: pd.DataFrame, columns: list[str] = PRICE_COLUMNS) -> tuple[shared_memory.SharedMemory, dict]:
+    """Copy a frame's index and float columns into one shared-memory segment."""
+    rows = len(df)
+    index = df.index.values.astype('datetime64[ns]').view(np.int64)
+    values = df[columns].to_numpy(dtype=np.float64)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(index.nbytes + values.nbytes, 1))
+    np.ndarray((rows,), dtype=np.int64, buffer=shm.buf)[:] = index
+    np.ndarray((rows, len(columns)), dtype=np.float64, buffer=shm.buf, offset=index.nbytes)[:] = values
+    return shm, {"name": shm.name, "rows": rows, "columns": list(columns)}
+
+
+def _attach_frame(spec: dict) -> pd.DataFrame:
+    """Zero-copy DataFrame view over a shared segment; cached for the life of the worker."""
+    name = spec["name"]
+    if name not in _ATTACHED_FRAMES:
+        shm = shared_memory.SharedMemory(name=name)
+        rows, columns = spec["rows"], spec["columns"]
+        index = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf)
+        values = np.ndarray((rows, len(columns)), dtype=np.float64, buffer=shm.buf, offset=rows * 8)
+        values.flags.writeable = False
+        df = pd.DataFrame(values, index=pd.DatetimeIndex(index.view('datetime64[ns]'), name='Date'),
+                          columns=columns, copy=False)
+        INDICATOR_CACHE.register(df, spec.get("ticker"), spec.get("version"))
+        _ATTACHED_FRAMES[name] = (shm, df)
+    return _ATTACHED_FRAMES[name][1]
+
+
+def _run_sweep_job(job: dict) -> dict:
+    df = _attach_frame(job["frame"])
+    strategy_name, ticker, params = job["strategy"], job["ticker"], job["params"]
+
+    _, metrics = run_strategy_on_ticker(
+        df, STRATEGY_REGISTRY[strategy_name], f"{strategy_name}_{ticker}", **params
+    )
+
+    row = {
+        "Job_Key": job["key"],
+        "Strategy": strategy_name,
+        "Ticker": ticker,
+        "Params": json.dumps(params, sort_keys=True),
+        "Total Trades": 0,
+    }
+    row.update({k: v for k, v in metrics.items() if k in METRIC_COLUMNS})
+    return row
+
+
+def _load_completed_keys(summary_path: str) -> set:
+    if not os.path.exists(summary_path):
+        return set()
+    # A crash can leave a half-written last line; skip it so that job is rerun
+    done = pd.read_csv(summary_path, usecols=["Job_Key"], on_bad_lines="skip")
+    return set(done["Job_Key"].dropna())
+
+
+def run_parameter_sweep(tickers: list[str], strategy_registry: dict, param_grids: dict,
+                        start_date: str, end_date: str, max_workers: int = None,
+                        summary_path: str = SWEEP_SUMMARY_FILE, resume: bool = True) -> pd.DataFrame:
+    """
+    Run every (strategy, ticker, params) combination over a process pool.
+
+    param_grids maps a strategy name to a {param: [values]} grid; strategies without
+    an entry use DEFAULT_PARAM_GRID. Each ticker is loaded once and shared with the
+    workers through shared memory. Finished jobs are appended to summary_path as they
+    complete, so a crashed sweep picks up where it stopped when rerun with resume=True.
+    """
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    if not resume and os.path.exists(summary_path):
+        os.remove(summary_path)
+
+    completed = _load_completed_keys(summary_path)
+    all_keys = []
+    pending = []
+    for strategy_name in strategy_registry:
+        for params in expand_param_grid(param_grids.get(strategy_name, DEFAULT_PARAM_GRID)):
+            for ticker in tickers:
+                key = make_job_key(strategy_name, ticker, params)
+                all_keys.append(key)
+                if key not in completed:
+                    pending.append({"key": key, "strategy": strategy_name, "ticker": ticker, "params": params})
+
+    total = len(all_keys)
+    print(f"[🧮] Sweep: {total} jobs, {total - len(pending)} already done, {len(pending)} to run")
+
+    segments = {}
+    try:
+        for ticker in sorted({job["ticker"] for job in pending}):
+            df = load_local_csv(ticker, start_date=start_date, end_date=end_date)
+            if df.empty:
+                print(f"[⚠️] No data for {ticker}, skipping.")
+                continue
+            df = df.sort_index()
+            shm, spec = _share_frame(df)
+            version = df.attrs.get("data_version") or frame_version(df)
+            segments[ticker] = (shm, dict(spec, ticker=ticker, version=version))
+
+        pending = [dict(job, frame=segments[job["ticker"]][1]) for job in pending if job["ticker"] in segments]
+
+        write_header = not os.path.exists(summary_path)
+        with open(summary_path, "a", newline="") as f, ProcessPoolExecutor(max_workers=max_workers) as pool:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+            if write_header:
+                writer.writeheader()
+
+            futures = {pool.submit(_run_sweep_job, job): job for job in pending}
+            done = total - len(futures)
+            for future in as_completed(futures):
+                job = futures[future]
+                done += 1
+                try:
+                    writer.writerow(future.result())
+                    f.flush()
+                    print(f"[⏳] {done}/{total} {job['key']}")
+                except Exception as e:
+                    print(f"[❌] {done}/{total} {job['key']} failed: {e}")
+    finally:
+        for shm, _ in segments.values():
+            shm.close()
+            shm.unlink()
+
+    summary_df = pd.read_csv(summary_path, on_bad_lines="skip")
+    summary_df = summary_df[summary_df["Job_Key"].isin(all_keys)].drop_duplicates("Job_Key", keep="last")
+    params_df = pd.DataFrame([json.loads(p) for p in summary_df["Params"]], index=summary_df.index)
+    summary_df = pd.concat([summary_df.drop(columns=["Params"]), params_df], axis=1)
+
+    print(f"[📊] Sweep summary: {summary_path}")
+    return summary_df.reset_index(drop=True)
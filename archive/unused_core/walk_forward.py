@@ -0,0 +1,158 @@
+# core/walk_forward.py
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.strategy_engine import run_strategy_on_ticker
+from core.strategy_registry import STRATEGY_REGISTRY
+from core.metrics import compute_fx_metrics
+from core.sweep_runner import expand_param_grid, _share_frame, _attach_frame
+from core.indicator_cache import frame_version
+from data.local_loader import load_local_csv
+import core.strategies.macd_strategy  # noqa: F401 - registers the bundled strategies
+
+# === CONFIG ===
+SELECTION_METRIC = "Sharpe Ratio"
+
+
+def make_walk_forward_folds(n_bars: int, train_bars: int, test_bars: int,
+                            step_bars: int = None, anchored: bool = False) -> list[dict]:
+    """
+    Rolling train/test windows as positional (start, stop) ranges.
+    With anchored=True every train window starts at bar 0 (expanding window).
+    """
+    step_bars = step_bars or test_bars
+    folds = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        train_start = 0 if anchored else start
+        train_stop = start + train_bars
+        folds.append({
+            "fold": len(folds),
+            "train": [(train_start, train_stop)],
+            "test": [(train_stop, train_stop + test_bars)],
+        })
+        start += step_bars
+    return folds
+
+
+def make_cv_folds(n_bars: int, n_folds: int = 5, embargo_bars: int = 0) -> list[dict]:
+    """
+    Blocked k-fold: each contiguous block is the test set once, the remaining
+    blocks (minus embargo_bars either side of the test block) are the train set.
+    """
+    edges = np.linspace(0, n_bars, n_folds + 1).astype(int)
+    folds = []
+    for k in range(n_folds):
+        test_start, test_stop = edges[k], edges[k + 1]
+        train = [(0, max(test_start - embargo_bars, 0)), (min(test_stop + embargo_bars, n_bars), n_bars)]
+        folds.append({
+            "fold": k,
+            "train": [(a, b) for a, b in train if b > a],
+            "test": [(test_start, test_stop)],
+        })
+    return folds
+
+
+def _run_ranges(df: pd.DataFrame, strategy_func, strategy_name: str, ranges: list, params: dict) -> pd.DataFrame:
+    # Each range runs separately so no trade spans a gap between train blocks
+    logs = []
+    for start, stop in ranges:
+        trade_log, _ = run_strategy_on_ticker(df.iloc[start:stop], strategy_func, strategy_name, **params)
+        if not trade_log.empty:
+            logs.append(trade_log)
+    return pd.concat(logs, ignore_index=True) if logs else pd.DataFrame()
+
+
+def _evaluate_fold(job: dict) -> tuple[dict, pd.DataFrame]:
+    df = _attach_frame(job["frame"])
+    strategy_name, fold, param_list = job["strategy"], job["fold"], job["param_list"]
+    strategy_func = STRATEGY_REGISTRY[strategy_name]
+
+    best_params, best_score = param_list[0], -np.inf
+    if len(param_list) > 1:
+        for params in param_list:
+            train_trades = _run_ranges(df, strategy_func, strategy_name, fold["train"], params)
+            score = compute_fx_metrics(train_trades).get(job["selection_metric"]) if not train_trades.empty else None
+            if score is not None and score > best_score:
+                best_params, best_score = params, score
+
+    test_trades = _run_ranges(df, strategy_func, strategy_name, fold["test"], best_params)
+    test_start, test_stop = fold["test"][0][0], fold["test"][-1][1]
+    row = {
+        "Fold": fold["fold"],
+        "Test_Start": df.index[test_start],
+        "Test_End": df.index[test_stop - 1],
+        "Train_Score": best_score if np.isfinite(best_score) else np.nan,
+        **best_params,
+    }
+    if not test_trades.empty:
+        row.update(compute_fx_metrics(test_trades))
+        test_trades["Fold"] = fold["fold"]
+    return row, test_trades
+
+
+def run_fold_evaluation(df: pd.DataFrame, strategy_name: str, folds: list[dict], param_grid: dict = None,
+                        selection_metric: str = SELECTION_METRIC, max_workers: int = None,
+                        ticker: str = None) -> tuple[pd.DataFrame, dict, pd.DataFrame]:
+    """
+    Evaluate a strategy over prebuilt folds in parallel.
+
+    The full history is shared with the workers once; each worker's indicator
+    cache computes full-history series a single time and folds take zero-copy
+    slices of them, so EMAs are never recomputed or re-warmed per fold. When
+    param_grid has more than one combination, each fold picks the params with
+    the best in-sample selection_metric and scores them out of sample.
+
+    Returns (per-fold table, aggregated out-of-sample metrics, out-of-sample trades).
+    """
+    df = df.sort_index()
+    columns = list(df.select_dtypes(include="number").columns)
+    param_list = expand_param_grid(param_grid or {})
+
+    shm, spec = _share_frame(df, columns)
+    spec = dict(spec, ticker=ticker, version=df.attrs.get("data_version") or frame_version(df))
+    try:
+        jobs = [{"frame": spec, "strategy": strategy_name, "fold": fold,
+                 "param_list": param_list, "selection_metric": selection_metric} for fold in folds]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_evaluate_fold, jobs))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    fold_df = pd.DataFrame([row for row, _ in results])
+    oos_logs = [trades for _, trades in results if not trades.empty]
+    oos_trades = pd.concat(oos_logs, ignore_index=True) if oos_logs else pd.DataFrame()
+    oos_metrics = compute_fx_metrics(oos_trades) if not oos_trades.empty else {}
+
+    print(f"[🧪] {strategy_name}: {len(folds)} folds, {len(oos_trades)} out-of-sample trades")
+    return fold_df, oos_metrics, oos_trades
+
+
+def run_walk_forward(ticker: str, strategy_name: str, start_date: str, end_date: str,
+                     train_bars: int, test_bars: int, step_bars: int = None, anchored: bool = False,
+                     param_grid: dict = None, selection_metric: str = SELECTION_METRIC,
+                     max_workers: int = None) -> tuple[pd.DataFrame, dict, pd.DataFrame]:
+    df = load_local_csv(ticker, start_date=start_date, end_date=end_date)
+    if df.empty:
+        print(f"[⚠️] No data for {ticker}, skipping.")
+        return pd.DataFrame(), {}, pd.DataFrame()
+
+    folds = make_walk_forward_folds(len(df), train_bars, test_bars, step_bars, anchored)
+    return run_fold_evaluation(df, strategy_name, folds, param_grid, selection_metric, max_workers, ticker)
+
+
+def run_cross_validation(ticker: str, strategy_name: str, start_date: str, end_date: str,
+                         n_folds: int = 5, embargo_bars: int = 0, param_grid: dict = None,
+                         selection_metric: str = SELECTION_METRIC,
+                         max_workers: int = None) -> tuple[pd.DataFrame, dict, pd.DataFrame]:
+    df = load_local_csv(ticker, start_date=start_date, end_date=end_date)
+    if df.empty:
+        print(f"[⚠️] No data for {ticker}, skipping.")
+        return pd.DataFrame(), {}, pd.DataFrame()
+
+    folds = make_cv_folds(len(df), n_folds, embargo_bars)
+    return run_fold_evaluation(df, strategy_name, folds, param_grid, selection_metric, max_workers, ticker)
@@ -1,34 +1,132 @@
 # data/local_loader.py
 
-import pandas as pd # data/local_loader.py
+import os
+import csv
+import json
 
+import numpy as np
 import pandas as pd
-import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional: pandas' C parser handles the same files
+    pa = None
 
 CSV_FOLDER = r"C:\Users\T460\Documents\Quant_trading_research\Quant_framework\data\csv_data"
+CACHE_FOLDER = os.path.join(CSV_FOLDER, "_columnar")
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+DATE_FORMAT = "%m/%d/%Y %H:%M"
 
-def load_local_csv(ticker, start_date=None, end_date=None):
-    try:
-        filepath = os.path.join(CSV_FOLDER, f"{ticker}.csv")
-        print(f"[📄] Loading CSV: {filepath}")
 
-        df = pd.read_csv(filepath, parse_dates=['Date'], decimal=',')
+def _parse_dates(values: pd.Series) -> pd.Series:
+    dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+    if dates.isna().all():
+        dates = pd.to_datetime(values, format='mixed', errors='coerce')
+    return dates
+
+
+def _header_names(filepath: str) -> list:
+    """Column names from the CSV's header line, stripped of padding (and of a UTF-8 BOM)."""
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        return [name.strip() for name in next(csv.reader(f), [])]
+
+
+def _read_source_csv(filepath: str) -> pd.DataFrame:
+    """Parse a comma-decimal CSV straight into typed float columns."""
+    # Both parsers get the stripped header, so padded column names load the same either way
+    names = _header_names(filepath)
+    if pa is not None:
+        table = pa_csv.read_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1),
+            convert_options=pa_csv.ConvertOptions(
+                decimal_point=',',
+                column_types={'Date': pa.string(), **{col: pa.float64() for col in PRICE_COLUMNS}},
+                include_columns=['Date'] + PRICE_COLUMNS,
+            ),
+        )
+        df = table.to_pandas()
+    else:
+        df = pd.read_csv(filepath, decimal=',', header=0, names=names, usecols=['Date'] + PRICE_COLUMNS,
+                         dtype={col: np.float64 for col in PRICE_COLUMNS})
+
+    df['Date'] = _parse_dates(df['Date'])
+    df = df.dropna(subset=['Date'])
+    return df.sort_values('Date', kind='stable')
+
 
-        df.columns = df.columns.str.strip()
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df.dropna(subset=['Date'], inplace=True)
-        df.set_index('Date', inplace=True)
+def _source_version(filepath: str) -> str:
+    stat = os.stat(filepath)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
 
-        for col in ['Open', 'High', 'Low', 'Close']:
-            df[col] = df[col].astype(str).str.replace(',', '.').astype(float)
 
-        print(f"[📥] Loaded {ticker}: full range {df.index.min()} to {df.index.max()}")
+def ingest_csv(ticker: str, force: bool = False) -> dict:
+    """
+    Convert <ticker>.csv into the columnar cache (one .npy per column) once.
+    The cache is rebuilt only when the source file changes. Returns its metadata.
+    """
+    filepath = os.path.join(CSV_FOLDER, f"{ticker}.csv")
+    cache_dir = os.path.join(CACHE_FOLDER, ticker)
+    meta_path = os.path.join(cache_dir, "meta.json")
+    version = _source_version(filepath)
+
+    if not force and os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("version") == version:
+            return meta
+
+    df = _read_source_csv(filepath)
+    os.makedirs(cache_dir, exist_ok=True)
+    columns = {'Date': df['Date'].to_numpy(dtype='datetime64[ns]').view(np.int64)}
+    columns.update({col: df[col].to_numpy(dtype=np.float64) for col in PRICE_COLUMNS})
+    for name, values in columns.items():
+        tmp_path = os.path.join(cache_dir, f"{name}.tmp.npy")
+        np.save(tmp_path, values)
+        os.replace(tmp_path, os.path.join(cache_dir, f"{name}.npy"))
+
+    meta = {"ticker": ticker, "version": version, "rows": len(df)}
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+
+    print(f"[📥] Ingested {ticker}: {len(df)} rows into {cache_dir}")
+    return meta
+
+
+def _range_bound(value, end: bool) -> np.int64:
+    # Match df.loc[start:end] partial-string semantics: '2025-06-18' covers the whole day
+    if isinstance(value, str):
+        period = pd.Period(value)
+        bound = period.end_time if end else period.start_time
+    else:
+        bound = pd.Timestamp(value)
+    return np.datetime64(bound.to_datetime64(), 'ns').view(np.int64)
+
+
+def load_local_csv(ticker, start_date=None, end_date=None):
+    """
+    Load OHLC for ticker, optionally filtered to [start_date, end_date].
+    Reads memory-mapped columns from the cache and only materializes the requested rows.
+    """
+    try:
+        meta = ingest_csv(ticker)
+        cache_dir = os.path.join(CACHE_FOLDER, ticker)
+
+        dates = np.load(os.path.join(cache_dir, "Date.npy"), mmap_mode='r')
+        start = 0 if start_date is None else int(np.searchsorted(dates, _range_bound(start_date, end=False), side='left'))
+        stop = len(dates) if end_date is None else int(np.searchsorted(dates, _range_bound(end_date, end=True), side='right'))
 
-        if start_date and end_date:
-            print(f"[📆] Filtering from {start_date} to {end_date}")
-            df = df.loc[start_date:end_date]
-            print(f"[✅] After filter: {df.shape[0]} rows")
+        index = pd.DatetimeIndex(np.array(dates[start:stop]).view('datetime64[ns]'), name='Date')
+        df = pd.DataFrame({
+            col: np.array(np.load(os.path.join(cache_dir, f"{col}.npy"), mmap_mode='r')[start:stop])
+            for col in PRICE_COLUMNS
+        }, index=index)
 
+        # Identifies exactly these rows of this file version, e.g. for the indicator cache
+        df.attrs["ticker"] = ticker
+        df.attrs["data_version"] = f"{meta['version']}:{start}:{stop}"
         return df
 
     except Exception as e:
@@ -0,0 +1,239 @@
+# benchmarks/load_test.py
+"""
+Headless load test: N concurrent Streamlit sessions (driven through AppTest) click
+through the pages against a local synthetic data provider, so no network is used.
+Reports p50/p95 page latency, memory per session and cache hit rates.
+
+    python -m benchmarks.load_test [--sessions 8] [--rounds 3] [--pages "📊 FX Heatmap" ...]
+"""
+import argparse
+import contextlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from data.synthetic import synthetic_frames_for, synthetic_key_levels, write_key_levels
+
+# === CONFIG ===
+BASE_DIR = Path(__file__).resolve().parents[1]
+APP_FILE = BASE_DIR / "scan_x.py"
+APP_KEY_LEVELS_FILE = BASE_DIR / "data" / "Key_levels_1D.xlsx"
+PAGES = ["📊 FX Heatmap", "💪 Strength Meter", "📍 Zone Locator(NEW!)", "🔗 Correlation Tool"]
+SESSION_TIMEOUT_SECONDS = 300
+BARS_PER_DAY = {"1m": 24 * 60, "5m": 24 * 12, "15m": 24 * 4, "1h": 24, "1d": 1, "1wk": 1 / 5}
+PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (Linux /proc, else peak RSS)."""
+    try:
+        with open("/proc/self/status") as f:
+            return int(re.search(r"VmRSS:\s+(\d+)", f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def period_bars(period: str, interval: str) -> int:
+    """Weekday bars a yfinance period/interval request would return."""
+    if period in ("ytd", "max"):
+        days = 365 if period == "ytd" else 3650
+    else:
+        number, unit = re.fullmatch(r"(\d+)([a-z]+)", period).groups()
+        days = int(number) * PERIOD_DAYS[unit]
+    return max(int(days * 5 / 7 * BARS_PER_DAY.get(interval, 1)), 2)
+
+
+class LocalDataProvider:
+    """
+    Stand-in for Yahoo Finance: answers the panel downloads, per-pair chart history and
+    snapshot requests with deterministic synthetic prices, and counts every request.
+    """
+
+    def __init__(self, seed: int = 0, latency_seconds: float = 0.0):
+        self.seed = seed
+        self.latency_seconds = latency_seconds
+        self.end = pd.Timestamp.now(tz='UTC')
+        self.counts = {"panel_download": 0, "chart_history": 0, "snapshot_download": 0}
+        self._lock = threading.Lock()
+        self._originals = None
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def frames(self, tickers: list, period: str, interval: str) -> dict:
+        self._count("panel_download")
+        return synthetic_frames_for(tickers, period_bars(period, interval), interval, seed=self.seed, end=self.end)
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        self._count("chart_history")
+        frames = synthetic_frames_for([ticker], period_bars(period, interval), interval, seed=self.seed, end=self.end,
+                                      fields=('Open', 'High', 'Low', 'Close'))
+        return pd.DataFrame({field: df[ticker] for field, df in frames.items()})
+
+    def download(self, ticker, period: str = "1d", interval: str = "1h", **kwargs) -> pd.DataFrame:
+        self._count("snapshot_download")
+        frames = synthetic_frames_for([ticker], period_bars(period, interval), interval, seed=self.seed,
+                                      end=self.end, fields=('Close',))
+        return frames['Close'].rename(columns={ticker: 'Close'})
+
+    def install(self):
+        """Route every Yahoo request made by the app to this provider."""
+        import yfinance as yf
+        import data.price_panel as price_panel
+
+        provider = self
+        self._originals = (yf.Ticker, yf.download, price_panel.download_ohlc_frames)
+
+        class Ticker:
+            def __init__(self, ticker):
+                self.ticker = ticker
+
+            def history(self, period="1mo", interval="1d", **kwargs):
+                return provider.history(self.ticker, period, interval)
+
+        yf.Ticker = Ticker
+        yf.download = self.download
+        price_panel.download_ohlc_frames = self.frames
+
+    def uninstall(self):
+        """Put the real Yahoo functions back."""
+        import yfinance as yf
+        import data.price_panel as price_panel
+
+        if self._originals is not None:
+            yf.Ticker, yf.download, price_panel.download_ohlc_frames = self._originals
+            self._originals = None
+
+
+class CallCounter:
+    """Wraps a module attribute so the harness can compare requests with cache misses."""
+
+    def __init__(self, module, name: str, **defaults):
+        self.calls = 0
+        self._lock = threading.Lock()
+        original = getattr(module, name)
+
+        def counted(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            return original(*args, **{**defaults, **kwargs})
+        setattr(module, name, counted)
+
+
+def run_session(session_id: int, pages: list, rounds: int, samples: list, lock: threading.Lock):
+    """One browser tab: open the app, then visit every page `rounds` times."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP_FILE), default_timeout=SESSION_TIMEOUT_SECONDS)
+    start = time.perf_counter()
+    at.run()
+    visits = [("🏠 Home", time.perf_counter() - start, len(at.exception))]
+    for _ in range(rounds):
+        for page in pages:
+            start = time.perf_counter()
+            at.sidebar.selectbox[0].select(page).run()
+            visits.append((page, time.perf_counter() - start, len(at.exception) + len(at.error)))
+    with lock:
+        samples.extend({'Session': session_id, 'Page': page, 'Seconds': seconds, 'Errors': errors}
+                       for page, seconds, errors in visits)
+
+
+def summarize(samples: pd.DataFrame) -> pd.DataFrame:
+    """p50/p95 latency per page (first visit of each session is the cold one)."""
+    grouped = samples.groupby('Page', sort=False)['Seconds']
+    return pd.DataFrame({
+        'Visits': grouped.size(),
+        'p50 (s)': grouped.quantile(0.50).round(3),
+        'p95 (s)': grouped.quantile(0.95).round(3),
+        'Max (s)': grouped.max().round(3),
+        'Errors': samples.groupby('Page', sort=False)['Errors'].sum(),
+    }).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--pages', nargs='*', default=PAGES)
+    parser.add_argument('--latency', type=float, default=0.0, help="simulated provider latency per request (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Keep the run's reports, panels, key levels and zone store out of the real folders.
+    # The levels path is read when core.zone_locator is first imported, so set it before.
+    workdir = Path(tempfile.mkdtemp(prefix="fx_load_test_"))
+    os.makedirs(workdir / "reports", exist_ok=True)
+    os.makedirs(workdir / "data", exist_ok=True)
+    levels_file = workdir / "data" / APP_KEY_LEVELS_FILE.name
+    os.environ["FX_KEY_LEVELS_FILE"] = str(levels_file)
+
+    provider = LocalDataProvider(args.seed, args.latency)
+    provider.install()
+    try:
+        import core.zone_locator as zone_core
+        import core.report_store as report_store
+        import data.price_panel as price_panel
+
+        if Path(zone_core.KEY_LEVELS_FILE) != levels_file:
+            print(f"[⚠️] core.zone_locator was imported before the load test; using {zone_core.KEY_LEVELS_FILE}")
+        elif os.path.exists(APP_KEY_LEVELS_FILE):
+            shutil.copy(APP_KEY_LEVELS_FILE, levels_file)
+        else:
+            history = provider.frames(zone_core.TICKER_LIST, "2y", "1d")['Close']
+            write_key_levels(synthetic_key_levels(history), levels_file)
+            provider.counts["panel_download"] -= 1
+        report_store.REPORT_DB = workdir / "reports" / report_store.REPORT_DB.name
+        os.chdir(workdir)
+
+        # Synthetic panels go to the temp folder, never over the app's cached panels
+        panel_requests = CallCounter(price_panel, "refresh_panel", panel_dir=workdir / "panels")
+        import viz.zone_locator as zone_page
+        chart_requests = CallCounter(zone_page, "get_price_chart_json")
+        for module_name in ("viz.fx_heatmap", "viz.strength_meter", "viz.fx_correlation", "core.zone_stats"):
+            module = __import__(module_name, fromlist=["refresh_panel"])
+            module.refresh_panel = price_panel.refresh_panel
+
+        samples, lock = [], threading.Lock()
+        baseline_mb = rss_mb()
+        started = time.perf_counter()
+        # The pages print their progress; keep the report readable
+        with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet), \
+                ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            futures = [pool.submit(run_session, i, args.pages, args.rounds, samples, lock) for i in range(args.sessions)]
+            for future in futures:
+                future.result()
+    finally:
+        provider.uninstall()
+        os.environ.pop("FX_KEY_LEVELS_FILE", None)
+    wall = time.perf_counter() - started
+    per_session_mb = (rss_mb() - baseline_mb) / max(args.sessions, 1)
+
+    samples = pd.DataFrame(samples)
+    print(f"\n[✅] {args.sessions} sessions x {args.rounds} rounds in {wall:.1f}s\n")
+    print(summarize(samples).to_string(index=False))
+
+    def hit_rate(misses: int, requests: int) -> str:
+        return f"{1 - misses / requests:.1%} hit rate" if requests else "no requests"
+
+    print(f"\n[📈] Memory: {baseline_mb:.0f} MB baseline, ~{per_session_mb:.1f} MB per session")
+    print(f"[📈] Panel cache: {panel_requests.calls} requests, {provider.counts['panel_download']} downloads "
+          f"({hit_rate(provider.counts['panel_download'], panel_requests.calls)})")
+    print(f"[📈] Chart cache: {chart_requests.calls} requests, {provider.counts['chart_history']} downloads "
+          f"({hit_rate(provider.counts['chart_history'], chart_requests.calls)})")
+    print(f"[📈] Snapshot downloads: {provider.counts['snapshot_download']}")
+    return samples
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/stress_engines.py
+"""
+Stress run of the correlation, zone and strength engines on a deterministic synthetic
+universe (default 500 instruments x 10 years of hourly bars).
+
+    python -m benchmarks.stress_engines [--pairs 500] [--years 10] [--seed 0]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.synthetic import currencies_for, synthetic_fx_frames, synthetic_key_levels
+from core.currency_strength import StrengthHistory, least_squares_strength_series, multi_horizon_strength
+from core.zone_locator import zone_bound_table
+from core.zone_probabilities import ZoneReachModel
+from core.zone_scanner import ZoneScanner
+from core.zone_stats import classify_zone_codes, zone_dwell_stats
+
+# === CONFIG ===
+BARS_PER_YEAR = 260 * 24  # weekday hours
+CORRELATION_WINDOW_BARS = 90 * 24
+SCANNER_UPDATE_BARS = 1000
+STREAMING_STRENGTH_BARS = 1000
+
+
+def timed(results: list, engine: str, step: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    out = func(*args, **kwargs)
+    results.append({'Engine': engine, 'Step': step, 'Seconds': round(time.perf_counter() - start, 3)})
+    print(f"[⏱️] {engine:<12} {step:<40} {results[-1]['Seconds']:>8.3f}s")
+    return out
+
+
+def run_correlation(results: list, close_df: pd.DataFrame):
+    returns = close_df.pct_change(fill_method=None)
+    timed(results, 'Correlation', f'window corr ({CORRELATION_WINDOW_BARS} bars)',
+          lambda: returns.iloc[-CORRELATION_WINDOW_BARS:].dropna().corr())
+    timed(results, 'Correlation', 'full-history corr', lambda: returns.corr())
+
+
+def run_zones(results: list, close_df: pd.DataFrame, levels_df: pd.DataFrame):
+    tickers = list(close_df.columns)
+    lower, upper = timed(results, 'Zones', 'bound table', zone_bound_table, levels_df, tickers)
+    codes = timed(results, 'Zones', 'classify full history', classify_zone_codes, close_df.to_numpy(), lower, upper)
+    timed(results, 'Zones', 'dwell statistics', zone_dwell_stats, codes, tickers)
+    timed(results, 'Zones', 'reach model (batch)', ZoneReachModel.from_codes, codes, tickers)
+
+    scanner = ZoneScanner(tickers, lower, upper)
+    tail = close_df.to_numpy()[-SCANNER_UPDATE_BARS:]
+    timed(results, 'Zones', f'scanner updates ({len(tail)} bars)', lambda: [scanner.update_prices(row) for row in tail])
+    return codes
+
+
+def run_strength(results: list, close_df: pd.DataFrame, currencies: list):
+    timed(results, 'Strength', 'multi-horizon average', multi_horizon_strength, close_df, currencies)
+    timed(results, 'Strength', 'least-squares per-bar series', least_squares_strength_series,
+          close_df, 1, currencies)
+    history = StrengthHistory(close_df.columns, currencies)
+    warm, stream = close_df.iloc[:-STREAMING_STRENGTH_BARS], close_df.iloc[-STREAMING_STRENGTH_BARS:]
+    timed(results, 'Strength', 'history (batch)', history.update, warm)
+    timed(results, 'Strength', f'history ({len(stream)} streamed bars)',
+          lambda: [history.update(stream.iloc[i:i + 1]) for i in range(len(stream))])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', type=int, default=500)
+    parser.add_argument('--years', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = []
+    periods = int(args.years * BARS_PER_YEAR)
+    frames = timed(results, 'Synthetic', f'{args.pairs} pairs x {periods} hourly bars',
+                   synthetic_fx_frames, args.pairs, periods, seed=args.seed, fields=('Close',))
+    close_df = frames['Close']
+    levels_df = timed(results, 'Synthetic', 'key levels', synthetic_key_levels, close_df).set_index('Ticker')
+
+    run_correlation(results, close_df)
+    run_zones(results, close_df, levels_df)
+    run_strength(results, close_df, currencies_for(args.pairs))
+
+    summary = pd.DataFrame(results)
+    print(f"\n[✅] Stress run done: {summary['Seconds'].sum():.1f}s total\n")
+    print(summary.to_string(index=False))
+    return summary
+
+
+if __name__ == '__main__':
+    main()
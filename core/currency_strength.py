@@ -0,0 +1,230 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# === CONFIG ===
+CURRENCY_LIST = ['USD','CAD', 'EUR', 'GBP', 'CHF', 'NOK', 'SGD','JPY', 'AUD', 'NZD']
+STRENGTH_HORIZONS = {
+    "1h": pd.Timedelta(hours=1),
+    "4h": pd.Timedelta(hours=4),
+    "1d": pd.Timedelta(days=1),
+    "1w": pd.Timedelta(weeks=1),
+    "1m": pd.Timedelta(days=30),
+}
+
+
+def all_pairs(currencies=CURRENCY_LIST):
+    """Every ordered base/quote pair, as the strength meter has always fetched them."""
+    return [f"{base}{quote}=X" for base in currencies for quote in currencies if base != quote]
+
+
+def split_pair(symbol):
+    pair = symbol.split("=")[0]
+    return pair[:3], pair[3:6]
+
+
+def pair_incidence(symbols, currencies=CURRENCY_LIST):
+    """(pair x currency) matrix: +1 for the base currency, -1 for the quote currency."""
+    position = {ccy: i for i, ccy in enumerate(currencies)}
+    incidence = np.zeros((len(symbols), len(currencies)))
+    for row, symbol in enumerate(symbols):
+        base, quote = split_pair(symbol)
+        if base in position and quote in position:
+            incidence[row, position[base]] = 1.0
+            incidence[row, position[quote]] = -1.0
+    return incidence
+
+
+def average_strength(returns, incidence):
+    """
+    Each currency's mean of +return (as base) and -return (as quote) over the pairs
+    with data. returns is (rows x pairs) with NaN for missing; gives (rows x currency)
+    scores and the number of pairs behind each one.
+    """
+    valid = ~np.isnan(returns)
+    scores = np.where(valid, returns, 0.0) @ incidence
+    counts = valid.astype(np.float64) @ np.abs(incidence)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, scores / counts, np.nan), counts.astype(np.int64)
+
+
+def horizon_returns(close_df, horizons=STRENGTH_HORIZONS):
+    """
+    % change of every pair over every horizon, measured back from the latest bar.
+    All horizons come from the same close panel with one searchsorted per horizon.
+    """
+    filled = close_df.ffill()
+    close = filled.to_numpy(dtype=np.float64)
+    index = close_df.index
+    last = close[-1]
+
+    rows = []
+    for span in horizons.values():
+        pos = index.searchsorted(index[-1] - span, side="right") - 1
+        ref = close[pos] if pos >= 0 else np.full_like(last, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rows.append((last - ref) / ref * 100)
+    return pd.DataFrame(rows, index=list(horizons), columns=close_df.columns)
+
+
+def multi_horizon_strength(close_df, currencies=CURRENCY_LIST, horizons=STRENGTH_HORIZONS):
+    """
+    Strength for every horizon at once from a single close panel.
+    Returns {horizon: DataFrame(Currency, Strength_Score, Data_Points, Rank)} sorted strongest first.
+    """
+    returns = horizon_returns(close_df, horizons)
+    scores, counts = average_strength(returns.to_numpy(), pair_incidence(close_df.columns, currencies))
+
+    results = {}
+    for h, horizon in enumerate(returns.index):
+        df = pd.DataFrame({
+            'Currency': currencies,
+            'Strength_Score': np.round(scores[h], 3),
+            'Data_Points': counts[h],
+        })
+        df = df[df['Data_Points'] > 0]
+        df = df.sort_values('Strength_Score', ascending=False).reset_index(drop=True)
+        df['Rank'] = df.index + 1
+        results[horizon] = df
+    return results
+
+
+def least_squares_strength(returns, incidence, currencies=CURRENCY_LIST, normalize="basket"):
+    """
+    Solve returns[t, pair] ~ s[t, base] - s[t, quote] for one factor per currency per row.
+
+    Every row is solved in one batch: rows are grouped by which pairs have data and
+    each group shares a single pseudo-inverse, so missing pairs simply drop out of
+    that row's equations and both directions of a pair are one consistent equation
+    rather than a double count. Factors are identified up to a constant, fixed by
+    normalize="basket" (zero mean across currencies) or a currency code such as "USD"
+    (that currency is zero). Currencies with no data in a row come back NaN.
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    strength = np.full((len(returns), incidence.shape[1]), np.nan)
+    valid = ~np.isnan(returns) & np.any(incidence != 0, axis=1)
+
+    patterns, group = np.unique(np.packbits(valid, axis=1), axis=0, return_inverse=True)
+    # Rows of each pattern in one sort, instead of scanning every row per pattern
+    order = np.argsort(group.ravel(), kind="stable")
+    bounds = np.flatnonzero(np.diff(group.ravel()[order])) + 1
+    for rows in np.split(order, bounds):
+        pairs = valid[rows[0]]
+        if not pairs.any():
+            continue
+        design = incidence[pairs]
+        covered = np.any(design != 0, axis=0)
+        solved = returns[np.ix_(rows, np.flatnonzero(pairs))] @ np.linalg.pinv(design).T
+        strength[np.ix_(rows, np.flatnonzero(covered))] = solved[:, covered]
+
+    if normalize == "basket":
+        covered = ~np.isnan(strength)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            strength -= (np.nansum(strength, axis=1) / covered.sum(axis=1))[:, None]
+    else:
+        strength -= strength[:, [list(currencies).index(normalize)]]
+    return strength
+
+
+def least_squares_multi_horizon(close_df, currencies=CURRENCY_LIST, horizons=STRENGTH_HORIZONS, normalize="basket"):
+    """multi_horizon_strength counterpart using the least-squares estimator (log returns, %)."""
+    returns = horizon_returns(close_df, horizons)
+    log_returns = np.log1p(returns.to_numpy() / 100) * 100
+    incidence = pair_incidence(close_df.columns, currencies)
+    scores = least_squares_strength(log_returns, incidence, currencies, normalize)
+    counts = (~np.isnan(log_returns)).astype(np.float64) @ np.abs(incidence)
+
+    results = {}
+    for h, horizon in enumerate(returns.index):
+        df = pd.DataFrame({
+            'Currency': currencies,
+            'Strength_Score': np.round(scores[h], 3),
+            'Data_Points': counts[h].astype(np.int64),
+        })
+        df = df[df['Data_Points'] > 0].dropna(subset=['Strength_Score'])
+        df = df.sort_values('Strength_Score', ascending=False).reset_index(drop=True)
+        df['Rank'] = df.index + 1
+        results[horizon] = df
+    return results
+
+
+def least_squares_strength_series(close_df, periods=1, currencies=CURRENCY_LIST, normalize="basket"):
+    """
+    Least-squares strength of every row's `periods`-bar log return (%), as one batched
+    solve over the whole history. periods=1 gives per-bar factors (cumsum for a trend).
+    """
+    close = close_df.to_numpy(dtype=np.float64)
+    log_returns = np.full_like(close, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_returns[periods:] = np.log(close[periods:] / close[:-periods]) * 100
+    scores = least_squares_strength(log_returns, pair_incidence(close_df.columns, currencies), currencies, normalize)
+    return pd.DataFrame(scores, index=close_df.index, columns=list(currencies))
+
+
+class StrengthHistory:
+    """
+    Cumulative per-bar currency strength, extended incrementally as new bars arrive.
+    Only bars newer than the last one seen are processed on each update().
+    """
+
+    def __init__(self, symbols, currencies=CURRENCY_LIST):
+        self.symbols = list(symbols)
+        self.currencies = list(currencies)
+        self.incidence = pair_incidence(self.symbols, self.currencies)
+        self.last_close = np.full(len(self.symbols), np.nan)
+        self.last_timestamp = None
+        self._timestamps = np.empty(0, dtype="datetime64[ns]")
+        self._values = np.empty((0, len(self.currencies)))
+        self._size = 0
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def update(self, close_df):
+        """Fold in any bars of close_df newer than the last update; returns how many were added."""
+        with self._lock:
+            if self.last_timestamp is not None:
+                close_df = close_df[close_df.index > self.last_timestamp]
+            if close_df.empty:
+                return 0
+
+            close = close_df.reindex(columns=self.symbols).to_numpy(dtype=np.float64)
+            # Last known close before each bar, carried across updates
+            filled = pd.DataFrame(np.vstack([self.last_close, close])).ffill().to_numpy()
+            prev = filled[:-1]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                bar_returns = (close - prev) / prev * 100
+            bar_strength, _ = average_strength(bar_returns, self.incidence)
+
+            start = self._values[self._size - 1] if self._size else np.zeros(len(self.currencies))
+            cumulative = start + np.nancumsum(bar_strength, axis=0)
+            self._append(close_df.index, cumulative)
+
+            self.last_close = filled[-1]
+            self.last_timestamp = close_df.index[-1]
+            return len(close_df)
+
+    def frame(self):
+        """Cumulative strength per currency (time x currency)."""
+        with self._lock:
+            if self._frame is None or len(self._frame) != self._size:
+                index = pd.DatetimeIndex(self._timestamps[:self._size], name='Date')
+                if self.last_timestamp is not None and self.last_timestamp.tzinfo is not None:
+                    index = index.tz_localize('UTC').tz_convert(self.last_timestamp.tzinfo)
+                self._frame = pd.DataFrame(self._values[:self._size], index=index, columns=self.currencies)
+            return self._frame
+
+    def _append(self, index, values):
+        # Amortized O(1) appends: grow the backing arrays geometrically
+        needed = self._size + len(values)
+        if needed > len(self._values):
+            capacity = max(needed, 2 * len(self._values), 256)
+            grown_ts = np.empty(capacity, dtype="datetime64[ns]")
+            grown_ts[:self._size] = self._timestamps[:self._size]
+            grown_values = np.empty((capacity, len(self.currencies)))
+            grown_values[:self._size] = self._values[:self._size]
+            self._timestamps, self._values = grown_ts, grown_values
+        utc_index = index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index
+        self._timestamps[self._size:needed] = utc_index.values
+        self._values[self._size:needed] = values
+        self._size = needed
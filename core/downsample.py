@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# === CONFIG ===
+MAX_CHART_POINTS = 800  # roughly one candle per pixel column of a full-width chart
+
+
+def downsample_ohlc(df: pd.DataFrame, max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    """
+    Merge consecutive candles into coarser ones so at most max_points remain.
+    Each merged candle keeps the first Open, highest High, lowest Low and last Close
+    and is stamped with its first bar's time, so wicks and the range are preserved.
+    """
+    n = len(df)
+    if n <= max_points:
+        return df
+
+    bucket = -(-n // max_points)
+    starts = np.arange(0, n, bucket)
+    ends = np.minimum(starts + bucket, n) - 1
+
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        'Open': df['Open'].to_numpy(dtype=np.float64)[starts],
+        'High': np.fmax.reduceat(high, starts),
+        'Low': np.fmin.reduceat(low, starts),
+        'Close': df['Close'].to_numpy(dtype=np.float64)[ends],
+    }, index=df.index[starts])
+
+
+def lttb_indices(y: np.ndarray, max_points: int = MAX_CHART_POINTS) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of the points that best keep the
+    visual shape of a line. The first and last points are always kept.
+    """
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    # Every bucket's mean point, used as the third vertex for the bucket before it
+    sums = np.add.reduceat(y[:n - 1], edges[:-1])
+    counts = np.diff(edges)
+    mean_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    mean_y = sums / counts
+    mean_x = np.append(mean_x[1:], n - 1)
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    picked = np.empty(max_points, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    prev = 0
+    for b in range(max_points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[prev] - mean_x[b]) * (y[lo:hi] - y[prev])
+                      - (x[prev] - x[lo:hi]) * (mean_y[b] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        picked[b + 1] = prev
+    return picked
+
+
+def downsample_line(series: pd.Series, max_points: int = MAX_CHART_POINTS) -> pd.Series:
+    """LTTB-downsampled copy of a price series for line charts."""
+    return series.iloc[lttb_indices(series.to_numpy(), max_points)]
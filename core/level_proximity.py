@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from core.zone_locator import (
+    KEY_LEVELS_FILE, LOOKBACK_HOURS, TICKER_LIST, levels_version, load_key_levels, ticker_level_dict,
+)
+
+# === CONFIG ===
+PROXIMITY_PIPS = 10  # a bar "touches" a level if its range comes within this many pips
+PIP_SIZES = {}  # per-ticker overrides, e.g. {'XAUUSD=X': 0.1}
+TOUCH_COLUMNS = ['Ticker', 'Level Name', 'Level', 'Touches', 'Most Recent Touch']
+
+# levels file -> (levels version, LevelProximityIndex)
+_INDEX_CACHE = {}
+
+
+def pip_size(ticker: str) -> float:
+    """One pip for the instrument: 0.01 for JPY-quoted pairs, 0.0001 otherwise."""
+    if ticker in PIP_SIZES:
+        return PIP_SIZES[ticker]
+    pair = ticker.split("=")[0]
+    return 0.01 if pair[3:6] == "JPY" else 0.0001
+
+
+class LevelProximityIndex:
+    """
+    Each ticker's key levels sorted once, so the levels inside a bar's [low, high] range
+    (widened by the touch tolerance) are found with two binary searches per bar.
+    """
+
+    def __init__(self, key_levels_df: pd.DataFrame, tickers: list = None):
+        tickers = list(key_levels_df.index) if tickers is None else tickers
+        self.levels = {}
+        for ticker in tickers:
+            if ticker not in key_levels_df.index:
+                continue
+            level_dict = ticker_level_dict(key_levels_df, ticker)
+            order = np.argsort(list(level_dict.values()), kind="stable")
+            self.levels[ticker] = (
+                np.asarray(list(level_dict.values()), dtype=np.float64)[order],
+                np.asarray(list(level_dict.keys()), dtype=object)[order],
+            )
+
+    @classmethod
+    def from_file(cls, filepath=KEY_LEVELS_FILE, tickers: list = None) -> "LevelProximityIndex":
+        return cls(load_key_levels(filepath), tickers)
+
+    def touches(self, ticker: str, high: np.ndarray, low: np.ndarray, tolerance_pips: float = PROXIMITY_PIPS):
+        """(bar positions, level positions) of every touch, vectorized over the bar arrays."""
+        values, _ = self.levels.get(ticker, (np.empty(0), None))
+        tolerance = tolerance_pips * pip_size(ticker)
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+
+        first = np.searchsorted(values, low - tolerance, side="left")
+        stop = np.searchsorted(values, high + tolerance, side="right")
+        counts = np.where(np.isnan(high) | np.isnan(low), 0, np.maximum(stop - first, 0))
+
+        bars = np.repeat(np.arange(len(high)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return bars, first[bars] + offsets
+
+    def touch_events(self, ticker: str, bars_df: pd.DataFrame, tolerance_pips: float = PROXIMITY_PIPS) -> pd.DataFrame:
+        """One row per (bar, level) touch for a High/Low frame indexed by time."""
+        bars, levels = self.touches(ticker, bars_df['High'].to_numpy(), bars_df['Low'].to_numpy(), tolerance_pips)
+        values, names = self.levels.get(ticker, (np.empty(0), np.empty(0, dtype=object)))
+        return pd.DataFrame({
+            'Ticker': ticker,
+            'Level Name': names[levels],
+            'Level': np.round(values[levels], 5),
+            'Time': bars_df.index[bars],
+        })
+
+
+def get_proximity_index(filepath=KEY_LEVELS_FILE) -> LevelProximityIndex:
+    """Proximity index over every ticker in the levels file, rebuilt only when the file changes."""
+    version = levels_version(filepath)
+    cached = _INDEX_CACHE.get(str(filepath))
+    if cached is None or cached[0] != version:
+        cached = (version, LevelProximityIndex.from_file(filepath))
+        _INDEX_CACHE[str(filepath)] = cached
+    return cached[1]
+
+
+def summarize_touches(events: pd.DataFrame) -> pd.DataFrame:
+    """Touch count and most recent touch per (ticker, level)."""
+    if events.empty:
+        return pd.DataFrame(columns=TOUCH_COLUMNS)
+    summary = events.groupby(['Ticker', 'Level Name', 'Level'], sort=False).agg(
+        Touches=('Time', 'size'), **{'Most Recent Touch': ('Time', 'max')}
+    ).reset_index()
+    return summary.sort_values(['Most Recent Touch', 'Ticker'], ascending=[False, True]).reset_index(drop=True)
+
+
+def scan_level_touches(panel, tickers: list = TICKER_LIST, lookback_hours: float = LOOKBACK_HOURS,
+                       index: LevelProximityIndex = None, tolerance_pips: float = PROXIMITY_PIPS) -> pd.DataFrame:
+    """Key level touches over the last lookback_hours of a High/Low price panel, for every ticker."""
+    index = index or get_proximity_index()
+    bar_times = panel.index
+    start = bar_times.searchsorted(bar_times[-1] - pd.Timedelta(hours=lookback_hours), side="right") if len(bar_times) else 0
+
+    high = panel.frame('High', tickers).iloc[start:]
+    low = panel.frame('Low', tickers).iloc[start:]
+    events = [
+        index.touch_events(ticker, pd.DataFrame({'High': high[ticker], 'Low': low[ticker]}), tolerance_pips)
+        for ticker in tickers if ticker in high.columns
+    ]
+    return summarize_touches(pd.concat(events, ignore_index=True) if events else pd.DataFrame())
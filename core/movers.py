@@ -0,0 +1,209 @@
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.price_panel import refresh_panel
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+REPORTS_DIR = BASE_DIR / "reports"
+
+# === CONFIG ===
+LOOKBACK_BARS = 10
+STD_THRESHOLD = 1.5
+EXT_LOG_FILE = REPORTS_DIR / "extension_alert_log.csv"
+RESYNC_EVERY = 10_000  # recompute running stats exactly from the window to cap float drift
+# interval -> (panel download period, panel max age in seconds)
+PANEL_SETTINGS = {
+    "1d": ("3mo", 15 * 60),
+    "1h": ("1mo", 5 * 60),
+    "15m": ("5d", 2 * 60),
+    "5m": ("5d", 60),
+}
+TICKERS = [
+    'USDCAD=X', 'USDGBP=X', 'USDNOK=X', 'USDPLN=X', 'USDAUD=X', 'USDSGD=X',
+    'USDJPY=X', 'USDZAR=X', 'USDBRL=X', 'EURUSD=X', 'EURGBP=X', 'EURCHF=X',
+    'EURPLN=X', 'EURCZK=X', 'EURNZD=X', 'EURSEK=X', 'EURZAR=X', 'EURSGD=X',
+    'GBPNOK=X', 'GBPJPY=X', 'GBPAUD=X', 'GBPCAD=X', 'SEKNOK=X', 'SEKJPY=X',
+    'CHFNOK=X', 'CADNOK=X', 'AUDNZD=X', 'AUDJPY=X', 'AUDSEK=X', 'AUDCAD=X',
+    'NZDSGD=X', 'NZDCHF=X', 'NZDNOK=X', 'SGDJPY=X', 'SGDHKD=X', 'EURCAD=X',
+    'USDCHF=X', 'GBPCHF=X', 'EURNOK=X'
+]
+ALERT_COLUMNS = ['Ticker', 'Today % Change', 'Avg % Change', 'Std Dev', 'Z-Score']
+
+
+class RollingMoverStats:
+    """
+    Windowed Welford mean/variance of the last `window` % changes, for every symbol at once.
+    Each update is O(symbols); NaN changes (no new bar for a symbol) leave its window untouched.
+    """
+
+    def __init__(self, n_symbols: int, window: int = LOOKBACK_BARS):
+        self.window = window
+        self.buffer = np.full((window, n_symbols), np.nan)
+        self.head = np.zeros(n_symbols, dtype=np.int64)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.mean = np.zeros(n_symbols)
+        self.m2 = np.zeros(n_symbols)
+        self.updates = 0
+
+    @property
+    def std(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(np.maximum(self.m2, 0) / (self.count - 1)), np.nan)
+
+    @property
+    def ready(self) -> np.ndarray:
+        return self.count == self.window
+
+    def update(self, changes: np.ndarray):
+        valid = ~np.isnan(changes)
+        cols = np.flatnonzero(valid)
+        x = changes[cols]
+        full = self.count[cols] == self.window
+
+        # Window full: replace the oldest value in one step
+        f_cols, f_x = cols[full], x[full]
+        old = self.buffer[self.head[f_cols], f_cols]
+        old_mean = self.mean[f_cols]
+        new_mean = old_mean + (f_x - old) / self.window
+        self.m2[f_cols] += (f_x - old) * (f_x - new_mean + old - old_mean)
+        self.mean[f_cols] = new_mean
+
+        # Window still filling: plain Welford add
+        g_cols, g_x = cols[~full], x[~full]
+        self.count[g_cols] += 1
+        delta = g_x - self.mean[g_cols]
+        self.mean[g_cols] += delta / self.count[g_cols]
+        self.m2[g_cols] += delta * (g_x - self.mean[g_cols])
+
+        self.buffer[self.head[cols], cols] = x
+        self.head[cols] = (self.head[cols] + 1) % self.window
+
+        self.updates += 1
+        if self.updates % RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        with np.errstate(invalid="ignore"):
+            self.mean = np.where(self.count > 0, np.nanmean(self.buffer, axis=0), 0.0)
+            self.m2 = np.where(self.count > 1, np.nanvar(self.buffer, axis=0) * self.count, 0.0)
+
+
+def _pct_changes(close_df: pd.DataFrame) -> pd.DataFrame:
+    """% change of each bar against the symbol's previous priced bar; NaN where there is no bar."""
+    return (close_df / close_df.ffill().shift(1) - 1) * 100
+
+
+def _flag_movers(symbols, changes, avg, std, std_threshold) -> pd.DataFrame:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit = np.abs(changes) > avg + std_threshold * std
+        z = (changes - avg) / std
+    idx = np.flatnonzero(hit)
+    return pd.DataFrame({
+        'Ticker': np.asarray(symbols)[idx],
+        'Today % Change': np.round(changes[idx], 2),
+        'Avg % Change': np.round(avg[idx], 2),
+        'Std Dev': np.round(std[idx], 2),
+        'Z-Score': np.round(z[idx], 2),
+    }, columns=ALERT_COLUMNS)
+
+
+def scan_unusual_movers(close_df: pd.DataFrame, lookback: int = LOOKBACK_BARS,
+                        std_threshold: float = STD_THRESHOLD) -> pd.DataFrame:
+    """
+    Flag symbols whose latest % change is unusual versus their previous `lookback` changes.
+    close_df is a (time x symbol) close panel aligned on every symbol's timestamps; each
+    symbol's stats use its own priced bars only, so a gap never blanks its window.
+    """
+    changes = _pct_changes(close_df).to_numpy(dtype=np.float64)
+    if not len(changes):
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+    latest = changes[-1]
+
+    # Rank every priced bar within its column; the window is the `lookback` ranks before the latest
+    valid = ~np.isnan(changes)
+    rank = np.cumsum(valid, axis=0)
+    total = rank[-1]
+    window = valid & (rank >= total - lookback) & (rank < total)
+    ready = ~np.isnan(latest) & (total > lookback)
+
+    prior = np.where(window, changes, 0.0)
+    avg = prior.sum(axis=0) / lookback
+    std = np.sqrt((np.where(window, changes - avg, 0.0) ** 2).sum(axis=0) / (lookback - 1))
+    avg, std = np.where(ready, avg, np.nan), np.where(ready, std, np.nan)
+    return _flag_movers(close_df.columns, latest, avg, std, std_threshold)
+
+
+class MoversScanner:
+    """Streaming version of scan_unusual_movers: call on_bar() as each new bar lands."""
+
+    def __init__(self, symbols: list, lookback: int = LOOKBACK_BARS, std_threshold: float = STD_THRESHOLD):
+        self.symbols = list(symbols)
+        self.std_threshold = std_threshold
+        self.stats = RollingMoverStats(len(self.symbols), lookback)
+        self.last_close = np.full(len(self.symbols), np.nan)
+
+    @classmethod
+    def from_history(cls, close_df: pd.DataFrame, lookback: int = LOOKBACK_BARS,
+                     std_threshold: float = STD_THRESHOLD) -> "MoversScanner":
+        scanner = cls(close_df.columns, lookback, std_threshold)
+        for row in _pct_changes(close_df).to_numpy(dtype=np.float64)[1:]:
+            scanner.stats.update(row)
+        if len(close_df):
+            scanner.last_close = close_df.ffill().iloc[-1].to_numpy(dtype=np.float64)
+        return scanner
+
+    def on_bar(self, closes: np.ndarray) -> pd.DataFrame:
+        """Score a new bar of closes (NaN = no bar for that symbol), then fold it into the stats."""
+        closes = np.asarray(closes, dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            changes = (closes / self.last_close - 1) * 100
+
+        ready = self.stats.ready
+        avg = np.where(ready, self.stats.mean, np.nan)
+        std = np.where(ready, self.stats.std, np.nan)
+        alerts = _flag_movers(self.symbols, changes, avg, std, self.std_threshold)
+
+        self.stats.update(changes)
+        self.last_close = np.where(np.isnan(closes), self.last_close, closes)
+        return alerts
+
+
+def append_alerts(df_alerts: pd.DataFrame, log_file: Path = EXT_LOG_FILE):
+    """Append a whole scan's alerts to the extension log in one write."""
+    if df_alerts.empty:
+        return
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    df_alerts.to_csv(log_file, mode="a", index=False, header=not os.path.exists(log_file))
+
+
+def run_overextension_scan(interval: str = "1d", tickers: list = TICKERS) -> pd.DataFrame:
+    if interval == "1d" and datetime.now().weekday() >= 5:
+        print("⏸ Market closed (Weekend) — skipping mover scan")
+        return pd.DataFrame()
+
+    period, max_age = PANEL_SETTINGS[interval]
+    panel = refresh_panel(f"movers_{interval}", tickers, period=period, interval=interval,
+                          max_age_seconds=max_age)
+    if panel is None:
+        print("[⚠️] No price data for mover scan")
+        return pd.DataFrame()
+
+    df_extensions = scan_unusual_movers(panel.frame('Close', tickers))
+    df_extensions["Timestamp"] = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    append_alerts(df_extensions)
+
+    if df_extensions.empty:
+        print("[✅] No unusual extension movers found.")
+    else:
+        print("[✅] Unusual Extension Movers:")
+        print(df_extensions.sort_values(by='Z-Score', ascending=False).to_string(index=False))
+
+    return df_extensions
+
+
+if __name__ == "__main__":
+    run_overextension_scan()
@@ -0,0 +1,204 @@
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.zone_locator import REPORTS_DIR, TICKER_LIST
+from core.zone_scanner import ZoneScanner
+from core.zone_stats import ZONE_NAMES, get_history_panel, history_zone_codes
+from core.currency_strength import StrengthHistory
+from core.tick_hooks import TRANSITION_COLUMNS
+
+# === CONFIG ===
+REPLAY_SPEED = 100.0  # simulated seconds per wall-clock second
+REPLAY_SPEEDS = {"1x": 1.0, "10x": 10.0, "100x": 100.0, "1000x": 1000.0, "Max": None}
+REPLAY_DIR = REPORTS_DIR / "replay"
+
+
+def _utc(timestamp) -> pd.Timestamp:
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+
+class ReplayClock:
+    """
+    Simulated time running from start to end at `speed` x wall-clock time (None = jump
+    straight to end). Anything reading now() sees the same replayed moment.
+    """
+
+    def __init__(self, start, end, speed: float = REPLAY_SPEED):
+        self.start, self.end = _utc(start), _utc(end)
+        self.speed = speed
+        self._origin = self.start
+        self._wall_start = time.monotonic()
+        self._paused_at = None
+
+    def now(self) -> pd.Timestamp:
+        if self.speed is None:
+            return self.end
+        wall = self._paused_at if self._paused_at is not None else time.monotonic()
+        elapsed = pd.Timedelta(seconds=(wall - self._wall_start) * self.speed)
+        return min(self._origin + elapsed, self.end)
+
+    @property
+    def finished(self) -> bool:
+        return self.now() >= self.end
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._wall_start += time.monotonic() - self._paused_at
+            self._paused_at = None
+
+    def seek(self, timestamp):
+        """Jump to timestamp (clamped to the range) and keep running from there."""
+        self._origin = min(max(_utc(timestamp), self.start), self.end)
+        self._wall_start = self._paused_at if self._paused_at is not None else time.monotonic()
+
+
+class ReplaySession:
+    """
+    Feeds stored hourly bars in [start, end] through the zone snapshot/transition scanner
+    and the strength history, catching up to the clock each time advance() is called.
+    """
+
+    def __init__(self, clock: ReplayClock, panel=None, tickers: list = TICKER_LIST):
+        self.clock = clock
+        self.panel = get_history_panel(tickers) if panel is None else panel
+        self.tickers = list(tickers)
+        self.scanner = ZoneScanner.from_levels(self.tickers)
+        self.strength = StrengthHistory(self.tickers)
+
+        index = self.panel.index
+        self.first_row = index.searchsorted(clock.start, side="left")
+        self.stop_row = self.panel.closed_rows(clock.end)
+        self.next_row = self.first_row
+        self._close = self.panel.frame('Close').reindex(columns=self.tickers)
+        self._transitions = []
+
+    def advance(self) -> int:
+        """Process every bar that has closed by the clock time and was not processed yet."""
+        stop = min(self.panel.closed_rows(self.clock.now()), self.stop_row)
+        if stop <= self.next_row:
+            return 0
+
+        block = self._close.iloc[self.next_row:stop]
+        zone_names = np.asarray(ZONE_NAMES + ['Unknown'], dtype=object)
+        tickers = np.asarray(self.tickers, dtype=object)
+        for timestamp, prices in zip(block.index, block.to_numpy(dtype=np.float64)):
+            changed, previous = self.scanner.update_prices(prices)
+            if len(changed):
+                self._transitions.append(pd.DataFrame({
+                    'Date': timestamp,
+                    'Ticker': tickers[changed],
+                    'From Zone': zone_names[previous],
+                    'To Zone': zone_names[self.scanner.codes[changed]],
+                }, columns=TRANSITION_COLUMNS))
+        self.strength.update(block)
+
+        processed = stop - self.next_row
+        self.next_row = stop
+        return processed
+
+    @property
+    def done(self) -> bool:
+        return self.next_row >= self.stop_row
+
+    def snapshot(self) -> pd.DataFrame:
+        """Current zone snapshot at the replay time, same columns as generate_current_zone_snapshot."""
+        priced = np.flatnonzero(~np.isnan(self.scanner.prices))
+        zone_names = np.asarray(ZONE_NAMES + ['Unknown'], dtype=object)
+        return pd.DataFrame({
+            'Ticker': np.asarray(self.tickers, dtype=object)[priced],
+            'Current Zone': zone_names[self.scanner.codes[priced]],
+            'Current Price': self.scanner.prices[priced],
+        }).sort_values(by='Current Zone')
+
+    def transitions(self) -> pd.DataFrame:
+        if not self._transitions:
+            return pd.DataFrame(columns=TRANSITION_COLUMNS)
+        return pd.concat(self._transitions, ignore_index=True)
+
+    def run(self, poll_seconds: float = 0.05):
+        """Headless replay: advance in real time until the clock reaches the end."""
+        while not self.done:
+            self.advance()
+            if not self.done:
+                time.sleep(poll_seconds)
+        return self.transitions()
+
+    def export(self, output_dir: Path = REPLAY_DIR):
+        """Write the replayed transition log and final snapshot next to the live reports."""
+        os.makedirs(output_dir, exist_ok=True)
+        self.transitions().to_csv(Path(output_dir) / "zone_transition_log.csv", index=False)
+        self.snapshot().to_csv(Path(output_dir) / "current_zone_snapshot.csv", index=False)
+        print(f"[💾] Exported replay transitions and snapshot to: {output_dir}")
+
+
+def batch_transitions(panel, tickers: list = TICKER_LIST, start=None, end=None) -> pd.DataFrame:
+    """
+    Offline transition log over the same bars, straight from the classified code matrix:
+    a transition is any change of code between a ticker's consecutive priced bars.
+    """
+    index = panel.index
+    first = index.searchsorted(_utc(start), side="left") if start is not None else 0
+    stop = index.searchsorted(_utc(end), side="right") if end is not None else len(index)
+    close = panel.frame('Close').reindex(columns=tickers).to_numpy(dtype=np.float64)[first:stop]
+    codes = history_zone_codes(panel, tickers)[first:stop]
+
+    rows, cols, previous = [], [], []
+    for col in range(len(tickers)):
+        priced = np.flatnonzero(~np.isnan(close[:, col]))
+        ticker_codes = codes[priced, col]
+        moves = np.flatnonzero(ticker_codes[1:] != ticker_codes[:-1]) + 1
+        rows.append(priced[moves])
+        cols.append(np.full(len(moves), col))
+        previous.append(ticker_codes[moves - 1])
+    rows, cols, previous = np.concatenate(rows), np.concatenate(cols), np.concatenate(previous)
+    order = np.lexsort((cols, rows))
+    rows, cols, previous = rows[order], cols[order], previous[order]
+
+    zone_names = np.asarray(ZONE_NAMES + ['Unknown'], dtype=object)
+    return pd.DataFrame({
+        'Date': index[first:stop][rows],
+        'Ticker': np.asarray(tickers, dtype=object)[cols],
+        'From Zone': zone_names[previous],
+        'To Zone': zone_names[codes[rows, cols]],
+    }, columns=TRANSITION_COLUMNS)
+
+
+def verify_transitions(session: ReplaySession):
+    """(matches, mismatched rows) comparing the replayed log with the batch computation."""
+    replayed = session.transitions().reset_index(drop=True)
+    end = session.panel.index[session.next_row - 1] if session.next_row > session.first_row else session.clock.start
+    expected = batch_transitions(session.panel, session.tickers, session.clock.start, end)
+    for log in (replayed, expected):
+        log['Date'] = pd.to_datetime(log['Date'], utc=True)
+    merged = replayed.merge(expected, how='outer', indicator=True)
+    mismatched = merged[merged['_merge'] != 'both']
+    return mismatched.empty and len(replayed) == len(expected), mismatched
+
+
+if __name__ == "__main__":
+    panel = get_history_panel()
+    if panel is None or len(panel.index) < 2:
+        print("[⚠️] No stored hourly history to replay")
+    else:
+        end = panel.index[-1]
+        clock = ReplayClock(end - pd.Timedelta(days=30), end, speed=None)
+        session = ReplaySession(clock, panel)
+        session.run()
+        matches, mismatched = verify_transitions(session)
+        print(f"[{'✅' if matches else '❌'}] Replayed {session.next_row - session.first_row} bars, "
+              f"{len(session.transitions())} transitions; batch match: {matches}")
+        if not matches:
+            print(mismatched.to_string(index=False))
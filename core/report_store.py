@@ -0,0 +1,388 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from core.zone_locator import REPORTS_DIR, ZONE_STATE_FILE, write_zone_heatmap
+
+# === CONFIG ===
+REPORT_DB = REPORTS_DIR / "zone_reports.sqlite"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"  # scans in the same second must stay distinct
+LEGACY_TIMESTAMP_CHARS = 19  # "%Y-%m-%d %H:%M:%S", as the old transition log wrote it
+LEGACY_FILES = {
+    "state": ZONE_STATE_FILE.name,
+    "history": "zone_history.csv",
+    "transitions": "zone_transition_log.csv",
+    "snapshot": "current_zone_snapshot.xlsx",
+}
+HEATMAP_FILE = "current_zone_snapshot_heatmap.xlsx"
+SNAPSHOT_COLUMNS = ["Ticker", "Current Zone", "Current Price"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    timestamp TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    zone TEXT NOT NULL,
+    price REAL
+);
+CREATE TABLE IF NOT EXISTS daily_history (
+    date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    first_zone TEXT NOT NULL,
+    last_zone TEXT NOT NULL,
+    majority_zone TEXT NOT NULL,
+    changes INTEGER NOT NULL,
+    scans INTEGER NOT NULL,
+    zone_counts TEXT NOT NULL,
+    PRIMARY KEY (date, ticker)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    timestamp TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    from_zone TEXT NOT NULL,
+    to_zone TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scanner_state (
+    ticker TEXT PRIMARY KEY,
+    zone TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_ticker_ts ON snapshots (ticker, timestamp);
+CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON snapshots (timestamp);
+CREATE INDEX IF NOT EXISTS idx_daily_history_ticker_date ON daily_history (ticker, date);
+CREATE INDEX IF NOT EXISTS idx_transitions_ticker_ts ON transitions (ticker, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transitions_ts ON transitions (timestamp);
+"""
+
+DAILY_COLUMNS = ["date", "ticker", "first_zone", "last_zone", "majority_zone", "changes", "scans", "zone_counts"]
+HISTORY_COLUMNS = ["Date", "Ticker", "First Zone", "Last Zone", "Majority Zone", "Changes", "Scans"]
+UPSERT_DAILY = (
+    f"INSERT INTO daily_history ({', '.join(DAILY_COLUMNS)}) VALUES ({', '.join('?' * len(DAILY_COLUMNS))}) "
+    "ON CONFLICT(date, ticker) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in DAILY_COLUMNS[2:])
+)
+
+# path -> ReportStore; one connection per process, shared by every session
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def fold_zone_history(days: dict, dates, tickers, zones) -> dict:
+    """
+    Fold time-ordered (date, ticker, zone) observations into days {(date, ticker): day},
+    one day per pair with its first, last and majority zone (ties go to the zone that
+    reached the count first), the number of intraday zone changes and of scans.
+    """
+    for date, ticker, zone in zip(dates, tickers, zones):
+        day = days.get((date, ticker))
+        if day is None:
+            days[(date, ticker)] = {"first_zone": zone, "last_zone": zone, "majority_zone": zone,
+                                    "changes": 0, "scans": 1, "zone_counts": {zone: 1}}
+            continue
+        counts = day["zone_counts"]
+        counts[zone] = counts.get(zone, 0) + 1
+        if counts[zone] > counts[day["majority_zone"]]:
+            day["majority_zone"] = zone
+        if zone != day["last_zone"]:
+            day["changes"] += 1
+            day["last_zone"] = zone
+        day["scans"] += 1
+    return days
+
+
+def _daily_rows(days: dict) -> list:
+    return [(date, ticker, d["first_zone"], d["last_zone"], d["majority_zone"], d["changes"], d["scans"],
+             json.dumps(d["zone_counts"])) for (date, ticker), d in days.items()]
+
+
+def _history_frame(days: dict) -> pd.DataFrame:
+    return pd.DataFrame([row[:-1] for row in _daily_rows(days)], columns=HISTORY_COLUMNS)
+
+
+def compact_history_file(path, output_path=None) -> pd.DataFrame:
+    """
+    Rewrite an old zone_history.csv (a Date/Ticker/Zone row per ticker per refresh) as one
+    row per (date, ticker); in place unless output_path is given. Already compacted files
+    are left alone.
+    """
+    path = Path(path)
+    df = pd.read_csv(path)
+    if "Zone" not in df.columns:
+        print(f"[ℹ️] {path.name} is already compacted")
+        return df
+    compacted = _history_frame(fold_zone_history({}, df["Date"].astype(str), df["Ticker"], df["Zone"]))
+    compacted.to_csv(output_path or path, index=False)
+    print(f"[💾] Compacted {path.name}: {len(df)} rows → {len(compacted)}")
+    return compacted
+
+
+class ReportStore:
+    """
+    Zone reports in one embedded SQLite file (WAL mode, so readers never block the scan
+    that is writing). Replaces last_known_zone.json, zone_history.csv,
+    zone_transition_log.csv and current_zone_snapshot.xlsx; export_legacy() writes
+    those files again on demand.
+    """
+
+    def __init__(self, path=REPORT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._workbooks = {}  # xlsx path -> snapshot timestamp it was written from
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return all(
+                self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+                for table in ("snapshots", "daily_history", "transitions", "scanner_state")
+            )
+
+    def record_scan(self, timestamp, snapshot_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Store one scan in a single transaction: the snapshot rows, each ticker's row for the
+        day upserted into daily_history, the transitions and the new scanner state.
+        snapshot_df has the generate_current_zone_snapshot columns.
+
+        Transitions are diffed against the stored scanner_state inside the same (immediate)
+        transaction, so several processes sharing the store log each change once, and a
+        scan older than the stored state neither logs a transition nor overwrites it.
+        Returns the logged transitions (Date, Ticker, From Zone, To Zone).
+        """
+        timestamp = pd.Timestamp(timestamp)
+        stamp = timestamp.strftime(TIMESTAMP_FORMAT)
+        date = timestamp.strftime("%Y-%m-%d")
+        tickers = snapshot_df["Ticker"].tolist()
+        zones = snapshot_df["Current Zone"].tolist()
+        prices = [float(p) for p in snapshot_df["Current Price"]]
+
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            state = {ticker: (zone, updated) for ticker, zone, updated in
+                     self.conn.execute("SELECT ticker, zone, updated FROM scanner_state")}
+            transitions = [(stamp, t, state[t][0], z) for t, z in zip(tickers, zones)
+                           if t in state and state[t][1] <= stamp and state[t][0] != z]
+
+            self.conn.executemany(
+                "INSERT INTO snapshots (timestamp, ticker, zone, price) VALUES (?, ?, ?, ?)",
+                [(stamp, t, z, p) for t, z, p in zip(tickers, zones, prices)],
+            )
+            days = self._days(date)
+            fold_zone_history(days, [date] * len(tickers), tickers, zones)
+            self.conn.executemany(UPSERT_DAILY, _daily_rows(days))
+            self.conn.executemany(
+                "INSERT INTO transitions (timestamp, ticker, from_zone, to_zone) VALUES (?, ?, ?, ?)", transitions)
+            self.conn.executemany(
+                "INSERT INTO scanner_state (ticker, zone, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(ticker) DO UPDATE SET zone = excluded.zone, updated = excluded.updated "
+                "WHERE excluded.updated >= scanner_state.updated",
+                [(t, z, stamp) for t, z in zip(tickers, zones)],
+            )
+        return pd.DataFrame([(timestamp.strftime(TIMESTAMP_FORMAT)[:LEGACY_TIMESTAMP_CHARS], *row[1:])
+                             for row in transitions], columns=["Date", "Ticker", "From Zone", "To Zone"])
+
+    def _days(self, date: str = None) -> dict:
+        """daily_history rows as fold_zone_history days (all dates, or one); caller holds the lock."""
+        where, params = ("WHERE date = ?", (date,)) if date is not None else ("", ())
+        rows = self.conn.execute(f"SELECT {', '.join(DAILY_COLUMNS)} FROM daily_history {where}", params)
+        return {(r[0], r[1]): {"first_zone": r[2], "last_zone": r[3], "majority_zone": r[4], "changes": r[5],
+                               "scans": r[6], "zone_counts": json.loads(r[7])} for r in rows}
+
+    def load_state(self) -> dict:
+        """{ticker: last known zone}, what last_known_zone.json used to hold."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT ticker, zone FROM scanner_state").fetchall())
+
+    def _query(self, sql: str, params=(), columns=None) -> pd.DataFrame:
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=columns)
+
+    def latest_snapshot(self) -> pd.DataFrame:
+        """Most recent scan in the generate_current_zone_snapshot layout."""
+        return self._query(
+            "SELECT ticker, zone, price FROM snapshots WHERE timestamp = (SELECT MAX(timestamp) FROM snapshots) "
+            "ORDER BY zone, rowid",
+            columns=SNAPSHOT_COLUMNS,
+        )
+
+    def snapshot_workbook(self, output_path=None, timestamp=None):
+        """
+        Path of one snapshot (the scan recorded at timestamp, the latest by default) as a
+        colour-coded xlsx (export_current_zone_heatmap formatting), or None if there is no
+        such scan. The workbook is streamed straight from the database and only rewritten
+        when a different snapshot is asked for.
+        """
+        path = Path(output_path or self.path.parent / HEATMAP_FILE)
+        with self._lock:
+            if timestamp is None:
+                stamp = self.conn.execute("SELECT MAX(timestamp) FROM snapshots").fetchone()[0]
+            else:
+                stamp = pd.Timestamp(timestamp).strftime(TIMESTAMP_FORMAT)
+                if self.conn.execute("SELECT 1 FROM snapshots WHERE timestamp = ? LIMIT 1", (stamp,)).fetchone() is None:
+                    stamp = None
+            if stamp is None:
+                return None
+            if self._workbooks.get(path) == stamp and path.exists():
+                return path
+            rows = self.conn.execute(
+                "SELECT ticker, zone, price FROM snapshots WHERE timestamp = ? ORDER BY zone, rowid", (stamp,))
+            n_rows = write_zone_heatmap(rows, SNAPSHOT_COLUMNS, path)
+            self._workbooks[path] = stamp
+        print(f"[💾] Exported {n_rows} snapshot rows to: {path}")
+        return path
+
+    def snapshot_workbook_bytes(self, timestamp=None) -> bytes:
+        """Snapshot workbook contents, for download buttons (empty if there is no such scan)."""
+        path = self.snapshot_workbook(timestamp=timestamp)
+        return path.read_bytes() if path is not None else b""
+
+    def transitions(self, since=None, ticker: str = None) -> pd.DataFrame:
+        """Transition log (Date, Ticker, From Zone, To Zone), oldest first."""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(pd.Timestamp(since).strftime(TIMESTAMP_FORMAT))
+        if ticker is not None:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(
+            f"SELECT substr(timestamp, 1, {LEGACY_TIMESTAMP_CHARS}), ticker, from_zone, to_zone FROM transitions "
+            f"{where} ORDER BY timestamp, rowid",
+            params, columns=["Date", "Ticker", "From Zone", "To Zone"],
+        )
+
+    def history(self, ticker: str = None, since=None) -> pd.DataFrame:
+        """Daily zone history, one row per (date, ticker), oldest first."""
+        clauses, params = [], []
+        if ticker is not None:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        if since is not None:
+            clauses.append("date >= ?")
+            params.append(pd.Timestamp(since).strftime("%Y-%m-%d"))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT {', '.join(DAILY_COLUMNS[:-1])} FROM daily_history {where} ORDER BY date, rowid",
+                           params, columns=HISTORY_COLUMNS)
+
+    def compact_history(self) -> int:
+        """
+        Fold the per-scan `history` table of older stores into daily_history, drop it and
+        reclaim the space. Runs when the store is opened, before any new scan lands in
+        daily_history. Returns the number of rows folded.
+        """
+        with self._lock:
+            exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history'").fetchone()
+            if exists is None:
+                return 0
+            with self.conn:
+                rows = self.conn.execute("SELECT date, ticker, zone FROM history ORDER BY timestamp, rowid").fetchall()
+                days = fold_zone_history({}, *zip(*rows)) if rows else {}
+                self.conn.executemany(UPSERT_DAILY, _daily_rows(days))
+                self.conn.execute("DROP TABLE history")
+            self.conn.execute("VACUUM")
+        print(f"[💾] Compacted {len(rows)} history rows into {len(days)} daily rows")
+        return len(rows)
+
+    def import_legacy(self, reports_dir=None) -> dict:
+        """Load the old report files next to the store into it (used once, when the store is created)."""
+        reports_dir = Path(reports_dir or self.path.parent)
+        files = {key: reports_dir / name for key, name in LEGACY_FILES.items()}
+        counts = {}
+        with self._lock, self.conn:
+            if os.path.exists(files["history"]):
+                df = pd.read_csv(files["history"])
+                if "Zone" in df.columns:
+                    days = fold_zone_history({}, df["Date"].astype(str), df["Ticker"], df["Zone"])
+                    self.conn.executemany(UPSERT_DAILY, _daily_rows(days))
+                else:  # already compacted: no per-zone counts, so the majority zone stands in for them
+                    self.conn.executemany(UPSERT_DAILY, [
+                        (*row[:-1], json.dumps({row[4]: row[-1]}))
+                        for row in df[HISTORY_COLUMNS].astype({"Date": str}).itertuples(index=False)
+                    ])
+                counts["history"] = len(df)
+            if os.path.exists(files["transitions"]):
+                df = pd.read_csv(files["transitions"])
+                self.conn.executemany(
+                    "INSERT INTO transitions (timestamp, ticker, from_zone, to_zone) VALUES (?, ?, ?, ?)",
+                    list(zip(df["Date"].astype(str), df["Ticker"], df["From Zone"], df["To Zone"])),
+                )
+                counts["transitions"] = len(df)
+            if os.path.exists(files["snapshot"]):
+                df = pd.read_excel(files["snapshot"])
+                stamp = pd.Timestamp(os.path.getmtime(files["snapshot"]), unit="s").strftime(TIMESTAMP_FORMAT)
+                self.conn.executemany(
+                    "INSERT INTO snapshots (timestamp, ticker, zone, price) VALUES (?, ?, ?, ?)",
+                    [(stamp, t, z, float(p)) for t, z, p in zip(df["Ticker"], df["Current Zone"], df["Current Price"])],
+                )
+                counts["snapshot"] = len(df)
+            if os.path.exists(files["state"]):
+                with open(files["state"], "r") as f:
+                    state = json.load(f)
+                stamp = pd.Timestamp.utcnow().strftime(TIMESTAMP_FORMAT)
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO scanner_state (ticker, zone, updated) VALUES (?, ?, ?)",
+                    [(t, z, stamp) for t, z in state.items()],
+                )
+                counts["state"] = len(state)
+        return counts
+
+    def export_legacy(self, output_dir=None) -> list:
+        """Write last_known_zone.json, zone_history.csv (compacted, one row per date and
+        ticker), zone_transition_log.csv and current_zone_snapshot.xlsx from the store, next
+        to it by default."""
+        output_dir = Path(output_dir or self.path.parent)
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+
+        path = output_dir / LEGACY_FILES["state"]
+        with open(path, "w") as f:
+            json.dump(self.load_state(), f)
+        written.append(path)
+
+        path = output_dir / LEGACY_FILES["history"]
+        self.history().to_csv(path, index=False)
+        written.append(path)
+
+        path = output_dir / LEGACY_FILES["transitions"]
+        self.transitions().to_csv(path, index=False)
+        written.append(path)
+
+        path = output_dir / LEGACY_FILES["snapshot"]
+        self.latest_snapshot().to_excel(path, index=False)
+        written.append(path)
+
+        print(f"[💾] Exported {len(written)} report files to: {output_dir}")
+        return written
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def get_report_store(path=None) -> ReportStore:
+    """Process-wide store. A new store file is seeded from the legacy report files if they exist."""
+    path = Path(path or REPORT_DB)
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = ReportStore(path)
+            store.compact_history()
+            if store.is_empty():
+                counts = store.import_legacy()
+                if counts:
+                    print(f"[💾] Imported legacy zone reports into {path.name}: {counts}")
+            _STORES[path] = store
+        return store
+
+
+if __name__ == "__main__":
+    get_report_store().export_legacy()
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from data.ticks import Bar, BarAggregator
+from core.currency_strength import StrengthHistory
+from core.movers import MoversScanner, append_alerts
+from core.zone_scanner import ZoneScanner
+from core.zone_stats import ZONE_NAMES
+
+# === CONFIG ===
+TRANSITION_COLUMNS = ['Date', 'Ticker', 'From Zone', 'To Zone']
+
+
+def _aligner(bar_symbols: list, target_symbols: list):
+    """Function mapping a bar's (symbol,) array onto target_symbols order, NaN for symbols the bar lacks."""
+    position = {s: i for i, s in enumerate(bar_symbols)}
+    source = np.array([position.get(s, -1) for s in target_symbols], dtype=np.int64)
+    present = source >= 0
+
+    def align(values: np.ndarray) -> np.ndarray:
+        out = np.full(len(target_symbols), np.nan)
+        out[present] = values[source[present]]
+        return out
+    return align
+
+
+def zone_scanner_hook(scanner: ZoneScanner, on_transitions=None):
+    """Push bar closes into the zone scanner; on_transitions(df) gets any zone changes."""
+    align = None
+    zone_names = np.asarray(ZONE_NAMES + ['Unknown'], dtype=object)
+    tickers = np.asarray(scanner.tickers, dtype=object)
+
+    def hook(bar: Bar):
+        nonlocal align
+        align = align or _aligner(bar.symbols, scanner.tickers)
+        changed, previous = scanner.update_prices(align(bar.close))
+        if len(changed) and on_transitions is not None:
+            on_transitions(pd.DataFrame({
+                'Date': bar.timestamp,
+                'Ticker': tickers[changed],
+                'From Zone': zone_names[previous],
+                'To Zone': zone_names[scanner.codes[changed]],
+            }, columns=TRANSITION_COLUMNS))
+    return hook
+
+
+def strength_hook(history: StrengthHistory):
+    """Extend the cumulative strength history with each bar's closes."""
+    def hook(bar: Bar):
+        history.update(bar.frame('close'))
+    return hook
+
+
+def movers_hook(scanner: MoversScanner, on_alerts=append_alerts):
+    """Score each bar for unusual movers; on_alerts(df) gets the flagged rows, stamped with
+    the bar time in the Timestamp column run_overextension_scan writes."""
+    align = None
+
+    def hook(bar: Bar):
+        nonlocal align
+        align = align or _aligner(bar.symbols, scanner.symbols)
+        alerts = scanner.on_bar(align(bar.close))
+        if not alerts.empty and on_alerts is not None:
+            alerts["Timestamp"] = bar.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            on_alerts(alerts)
+    return hook
+
+
+def attach_scanners(aggregator: BarAggregator, zone_scanner: ZoneScanner = None, strength: StrengthHistory = None,
+                    movers: MoversScanner = None, zone_interval: str = "1m", strength_interval: str = "1h",
+                    movers_interval: str = "1d", on_transitions=None, on_alerts=append_alerts) -> BarAggregator:
+    """Wire the live scanners to the aggregator's completed bars (each at its own interval)."""
+    if zone_scanner is not None:
+        aggregator.add_hook(zone_scanner_hook(zone_scanner, on_transitions), [zone_interval])
+    if strength is not None:
+        aggregator.add_hook(strength_hook(strength), [strength_interval])
+    if movers is not None:
+        aggregator.add_hook(movers_hook(movers, on_alerts), [movers_interval])
+    return aggregator
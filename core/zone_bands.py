@@ -0,0 +1,122 @@
+import math
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from core.zone_locator import (
+    KEY_LEVELS_FILE, REPORTS_DIR, TICKER_LIST, ZONE_COLORS, ZONE_DEFINITIONS,
+    levels_version, load_key_levels, ticker_level_dict, zone_bounds,
+)
+
+# === CONFIG ===
+BAND_OPACITY = 0.15
+ZONE_CHART_DIR = REPORTS_DIR / "zone_charts"
+
+# levels file -> (levels version, {ticker: band overlay}); rebuilt only when the file changes
+_BAND_CACHE = {}
+
+
+def band_geometry(level_dict: dict) -> list:
+    """
+    [(zone, lower, upper)] with finite edges for drawing. The open-ended top and bottom
+    zones are drawn as tall as their neighbour so they do not stretch the price axis.
+    """
+    bounds = zone_bounds(ZONE_DEFINITIONS, level_dict)
+    finite = [upper - lower for _, lower, upper in bounds if math.isfinite(upper - lower)]
+    if not finite:
+        return []
+
+    geometry = []
+    for i, (zone, lower, upper) in enumerate(bounds):
+        if not math.isfinite(upper) and math.isfinite(lower):
+            neighbour = bounds[i + 1] if i + 1 < len(bounds) else None
+            height = neighbour[2] - neighbour[1] if neighbour else float("nan")
+            upper = lower + (height if math.isfinite(height) else finite[0])
+        elif not math.isfinite(lower) and math.isfinite(upper):
+            neighbour = bounds[i - 1] if i > 0 else None
+            height = neighbour[2] - neighbour[1] if neighbour else float("nan")
+            lower = upper - (height if math.isfinite(height) else finite[-1])
+        if math.isfinite(lower) and math.isfinite(upper) and upper > lower:
+            geometry.append((zone, lower, upper))
+    return geometry
+
+
+def band_overlay(level_dict: dict) -> dict:
+    """Plotly layout shapes (one rectangle per zone) plus a right-edge label for each."""
+    shapes, annotations = [], []
+    for zone, lower, upper in band_geometry(level_dict):
+        shapes.append(dict(
+            type="rect", xref="paper", x0=0, x1=1, yref="y", y0=lower, y1=upper,
+            fillcolor=ZONE_COLORS.get(zone, "#6b7280"), opacity=BAND_OPACITY,
+            layer="below", line=dict(width=0),
+        ))
+        annotations.append(dict(
+            xref="paper", x=1, xanchor="left", yref="y", y=(lower + upper) / 2,
+            text=zone, showarrow=False, font=dict(size=10, color="#6b7280"),
+        ))
+    return {"shapes": shapes, "annotations": annotations}
+
+
+def get_zone_bands(filepath=KEY_LEVELS_FILE) -> dict:
+    """{ticker: band overlay} for every ticker in the levels file, cached per levels version."""
+    version = levels_version(filepath)
+    cached = _BAND_CACHE.get(str(filepath))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    bands = {}
+    if version != "missing":
+        key_levels_df = load_key_levels(filepath)
+        for ticker in key_levels_df.index:
+            bands[ticker] = band_overlay(ticker_level_dict(key_levels_df, ticker))
+
+    _BAND_CACHE[str(filepath)] = (version, bands)
+    return bands
+
+
+def attach_zone_bands(fig, ticker: str, filepath=KEY_LEVELS_FILE):
+    """Draw the ticker's zone bands on fig (before any other shapes are added)."""
+    overlay = get_zone_bands(filepath).get(ticker)
+    if overlay:
+        fig.update_layout(shapes=overlay["shapes"], annotations=overlay["annotations"])
+    return fig
+
+
+def export_zone_charts(tickers: list = TICKER_LIST, period: str = "6mo", output_dir: Path = ZONE_CHART_DIR):
+    """Write a daily candlestick chart with zone bands for each ticker as standalone HTML."""
+    import plotly.graph_objects as go
+    import yfinance as yf
+
+    data = yf.download(list(tickers), period=period, interval="1d", progress=False,
+                       auto_adjust=False, group_by="ticker", threads=True)
+    if data.empty:
+        print("[⚠️] No price data for zone charts")
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for ticker in tickers:
+        try:
+            hist = data[ticker].dropna(subset=["Close"]) if isinstance(data.columns, pd.MultiIndex) else data
+        except KeyError:
+            print(f"[⚠️] No data for {ticker}")
+            continue
+        if hist.empty:
+            print(f"[⚠️] No data for {ticker}")
+            continue
+
+        fig = go.Figure(go.Candlestick(
+            x=hist.index, open=hist["Open"], high=hist["High"], low=hist["Low"], close=hist["Close"],
+            name=ticker, increasing_line_color="#059669", decreasing_line_color="#dc2626",
+        ))
+        attach_zone_bands(fig, ticker)
+        fig.update_layout(title=f"{ticker} - Zones", template="plotly_white", height=500,
+                          showlegend=False, margin=dict(r=90))
+
+        outpath = Path(output_dir) / f"{ticker.split('=')[0]}_zones.html"
+        fig.write_html(outpath, include_plotlyjs="cdn")
+        written.append(outpath)
+
+    print(f"[💾] Exported {len(written)} zone charts to: {output_dir}")
+    return written
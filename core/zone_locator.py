@@ -1,4 +1,5 @@
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -6,7 +7,6 @@ from collections import defaultdict
 import pytz
 import smtplib
 import os
-import json
 
 from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parents[1]  # adjust as needed
@@ -16,7 +16,8 @@ REPORTS_DIR.mkdir(exist_ok=True)
 
 # === CONFIG ===
 ZONE_STATE_FILE = REPORTS_DIR / "last_known_zone.json"
-KEY_LEVELS_FILE = DATA_DIR / "Key_levels_1D.xlsx"  
+# FX_KEY_LEVELS_FILE points a whole process at other levels (the load test uses it)
+KEY_LEVELS_FILE = Path(os.environ.get("FX_KEY_LEVELS_FILE", DATA_DIR / "Key_levels_1D.xlsx"))
 TICKER_LIST = [
     'GBPNZD=X', 'EURCHF=X', 'NZDCAD=X', 'USDZAR=X', 'CADCHF=X',
     'GBPJPY=X', 'AUDNZD=X', 'GBPCHF=X', 'USDCAD=X', 'CADJPY=X',
@@ -37,18 +38,32 @@ ZONE_DEFINITIONS = [
     ("Reset", "Purple lower", float("-inf"))
 ]
 
-if os.path.exists(ZONE_STATE_FILE):
-    with open(ZONE_STATE_FILE, "r") as f:
-        last_known_zone = json.load(f)
-else:
-    last_known_zone = {}
+ZONE_COLORS = {
+    "Premium+": "#DA70D6",
+    "Premium": "#FFD700",
+    "Plus+": "#FFA500",
+    "Fair": "#90EE90",
+    "Budget": "#ADD8E6",
+    "Discount": "#FF9999",
+    "Clearance": "#FF5555",
+    "Reset": "#A9A9A9"
+}
 
 def load_key_levels(filepath):
     df = pd.read_excel(filepath)
     df.set_index("Ticker", inplace=True)
     return df
 
-def compute_current_zone(price, zone_definitions, level_dict):
+def levels_version(filepath=KEY_LEVELS_FILE):
+    """Changes whenever the key levels file is edited; used to key anything derived from it."""
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return "missing"
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+def zone_bounds(zone_definitions, level_dict):
+    """[(zone, lower, upper)] in zone_definitions order; missing levels fall back to +/-inf."""
     levels = {}
     for _, upper_bound, lower_bound in zone_definitions:
         if isinstance(upper_bound, str):
@@ -59,110 +74,131 @@ def compute_current_zone(price, zone_definitions, level_dict):
     levels["Purple upper"] = float(level_dict.get("Purple upper", float("inf")))
     levels["Purple lower"] = float(level_dict.get("Purple lower", float("-inf")))
 
+    bounds = []
     for zone_name, upper_bound, lower_bound in zone_definitions:
         upper_value = levels.get(upper_bound, float("inf")) if isinstance(upper_bound, str) else upper_bound
         lower_value = levels.get(lower_bound, float("-inf")) if isinstance(lower_bound, str) else lower_bound
+        bounds.append((zone_name, lower_value, upper_value))
+    return bounds
+
+def ticker_level_dict(key_levels_df, ticker):
+    """Numeric key levels for one ticker as {level name: value}."""
+    return pd.to_numeric(key_levels_df.loc[ticker], errors="coerce").dropna().astype(float).to_dict()
+
+def zone_bound_table(key_levels_df, tickers, zone_definitions=ZONE_DEFINITIONS):
+    """
+    (lower, upper) arrays of shape (tickers x zones) in zone_definitions order, so a
+    whole universe can be classified with array comparisons. Unknown tickers get NaN.
+    """
+    lower = np.full((len(tickers), len(zone_definitions)), np.nan)
+    upper = np.full((len(tickers), len(zone_definitions)), np.nan)
+    for i, ticker in enumerate(tickers):
+        if ticker not in key_levels_df.index:
+            continue
+        for z, (_, lo, hi) in enumerate(zone_bounds(zone_definitions, ticker_level_dict(key_levels_df, ticker))):
+            lower[i, z], upper[i, z] = lo, hi
+    return lower, upper
+
+def compute_current_zone(price, zone_definitions, level_dict):
+    for zone_name, lower_value, upper_value in zone_bounds(zone_definitions, level_dict):
         if lower_value < price <= upper_value:
             return zone_name
     return "Unknown"
 
-def generate_current_zone_snapshot():
-    key_levels_df = load_key_levels(KEY_LEVELS_FILE)
-    current_zone_results = []
+def generate_current_zone_snapshot(now=None):
+    # The scanner caches each ticker's current zone interval, so only tickers whose
+    # price left that interval are reclassified. Transitions are diffed by the store
+    # against the shared scanner_state, not against this process's scanner.
+    from core.zone_scanner import get_zone_scanner
+    from core.report_store import get_report_store
+
+    store = get_report_store()
+    scanner = get_zone_scanner(TICKER_LIST)
+    has_levels = ~np.isnan(scanner.lower).all(axis=1)
 
-    for ticker in TICKER_LIST:
+    prices = np.full(len(TICKER_LIST), np.nan)
+    for i, ticker in enumerate(TICKER_LIST):
         print(f"[→] Checking {ticker} current zone...")
+        if not has_levels[i]:
+            print(f"[❌] Failed for {ticker}: no key levels")
+            continue
         try:
             data = yf.download(ticker, period="1d", interval="1h", progress=False)
             if data.empty:
                 print(f"[⚠️] No data for {ticker}")
                 continue
-
-            latest_close = data["Close"].iloc[-1].item()
-            short = ticker.split("=")[0] + "=X" if "=X" in ticker else ticker
-            levels_series = key_levels_df.loc[short].dropna()
-            level_dict = {k: float(v) for k, v in levels_series.items()}
-            zone = compute_current_zone(latest_close, ZONE_DEFINITIONS, level_dict)
-
-            history_row = {
-                "Date": pd.Timestamp.utcnow().strftime("%Y-%m-%d"),
-                "Ticker": ticker,
-                "Zone": zone
-            }
-            history_file = "reports/zone_history.csv"
-            pd.DataFrame([history_row]).to_csv(history_file, mode="a", index=False, header=not os.path.exists(history_file))
-
-            previous_zone = last_known_zone.get(ticker, None)
-            if previous_zone != zone and previous_zone is not None:
-                transition_row = {
-                    "Date": pd.Timestamp.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-                    "Ticker": ticker,
-                    "From Zone": previous_zone,
-                    "To Zone": zone
-                }
-                transition_file = "reports/zone_transition_log.csv"
-                pd.DataFrame([transition_row]).to_csv(transition_file, mode="a", index=False, header=not os.path.exists(transition_file))
-            last_known_zone[ticker] = zone
-
-            print(f"[✓] {ticker} → Zone: {zone} (Price: {latest_close:.4f})")
-            current_zone_results.append({
-                "Ticker": ticker,
-                "Current Zone": zone,
-                "Current Price": latest_close
-            })
+            prices[i] = data["Close"].iloc[-1].item()
         except Exception as e:
             print(f"[❌] Failed for {ticker}: {e}")
 
-    with open(ZONE_STATE_FILE, "w") as f:
-        json.dump(last_known_zone, f)
+    scanner.update_prices(prices)
+    zone_names = np.asarray([zone for zone, _, _ in ZONE_DEFINITIONS] + ["Unknown"], dtype=object)
+    priced = np.flatnonzero(~np.isnan(prices))
+    now = pd.Timestamp.utcnow() if now is None else pd.Timestamp(now)
 
-    df_current_zones = pd.DataFrame(current_zone_results).sort_values(by="Current Zone")
+    current_zone_results = []
+    for i in priced:
+        zone = zone_names[scanner.codes[i]]
+        print(f"[✓] {TICKER_LIST[i]} → Zone: {zone} (Price: {prices[i]:.4f})")
+        current_zone_results.append({
+            "Ticker": TICKER_LIST[i],
+            "Current Zone": zone,
+            "Current Price": prices[i]
+        })
+
+    df_current_zones = pd.DataFrame(current_zone_results, columns=["Ticker", "Current Zone", "Current Price"])
+    df_current_zones = df_current_zones.sort_values(by="Current Zone")
     print("[✅] Current Zone Snapshot:\n")
     print(df_current_zones.to_string(index=False))
 
-    os.makedirs("reports", exist_ok=True)
-    outpath = "reports/current_zone_snapshot.xlsx"
-    df_current_zones.to_excel(outpath, index=False)
-    print(f"[💾] Exported current zone snapshot to: {outpath}")
+    # Snapshot, history, transitions and scanner state go in one transaction
+    transitions = store.record_scan(now, df_current_zones)
+    print(f"[💾] Stored current zone snapshot ({len(transitions)} transitions) in: {store.path}")
     return df_current_zones
 
+def write_zone_heatmap(rows, columns, output_path):
+    """
+    Stream rows into an xlsx sheet with each zone cell coloured by ZONE_COLORS. The
+    workbook uses constant_memory, so only the current row is held; rows must arrive
+    in order (a DataFrame's itertuples() or a database cursor).
+    """
+    import xlsxwriter
+
+    os.makedirs(Path(output_path).parent, exist_ok=True)
+    workbook = xlsxwriter.Workbook(str(output_path), {"constant_memory": True})
+    worksheet = workbook.add_worksheet("Current Zones")
+    worksheet.write_row(0, 0, columns, workbook.add_format({"bold": True}))
+    n_rows = 0
+    for n_rows, row in enumerate(rows, start=1):
+        worksheet.write_row(n_rows, 0, row)
+
+    zone_col = chr(65 + list(columns).index("Current Zone"))
+    zone_range = f"${zone_col}2:${zone_col}{n_rows + 1}"
+    for zone, color in ZONE_COLORS.items():
+        zone_format = workbook.add_format({"bg_color": color, "bold": zone == "Premium"})
+        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": zone,
+                                                  "format": zone_format})
+    workbook.close()
+    return n_rows
+
 def export_current_zone_heatmap(df_current_zones, output_path="reports/current_zone_snapshot_heatmap.xlsx"):
     if df_current_zones.empty:
         print("[⚠️] No current zones to export.")
         return
 
     print("[🎨] Exporting color heatmap version...")
-    with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-        df_current_zones.to_excel(writer, sheet_name="Current Zones", index=False)
-        workbook = writer.book
-        worksheet = writer.sheets["Current Zones"]
-
-        format_premium_plus = workbook.add_format({"bg_color": "#DA70D6"})  # Purple-Gold
-        format_premium = workbook.add_format({"bg_color": "#FFD700", "bold": True})  # Gold
-        format_plus = workbook.add_format({"bg_color": "#FFA500"})  # Orange
-        format_fair = workbook.add_format({"bg_color": "#90EE90"})  # LightGreen
-        format_budget = workbook.add_format({"bg_color": "#ADD8E6"})  # LightBlue
-        format_discount = workbook.add_format({"bg_color": "#FF9999"})  # LightRed
-        format_clearance = workbook.add_format({"bg_color": "#FF5555"})  # Deep Red
-        format_reset = workbook.add_format({"bg_color": "#A9A9A9"})  # Gray
-
-
-        zone_col = df_current_zones.columns.get_loc("Current Zone")
-        zone_range = f"${chr(65 + zone_col)}2:${chr(65 + zone_col)}{len(df_current_zones)+1}"
-
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Premium+", "format": format_premium_plus})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Premium", "format": format_premium})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Plus+", "format": format_plus})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Fair", "format": format_fair})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Budget", "format": format_budget})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Discount", "format": format_discount})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Clearance", "format": format_clearance})
-        worksheet.conditional_format(zone_range, {"type": "text", "criteria": "containing", "value": "Reset", "format": format_reset})
-
+    write_zone_heatmap(df_current_zones.itertuples(index=False, name=None), list(df_current_zones.columns),
+                       output_path)
     print(f"[💾] Exported color heatmap to: {output_path}")
 
 if __name__ == "__main__":
+    from core.report_store import get_report_store
+
     df_current_zones = generate_current_zone_snapshot()
-    export_current_zone_heatmap(df_current_zones)
+    get_report_store().snapshot_workbook()
+
+    from core.zone_scanner import near_boundary_watchlist
+    print("\n[🚨] Pairs nearest a zone boundary:\n")
+    print(near_boundary_watchlist(df_current_zones).to_string(index=False))
 
   
\ No newline at end of file
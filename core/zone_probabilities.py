@@ -0,0 +1,166 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.zone_locator import KEY_LEVELS_FILE, TICKER_LIST, levels_version
+from core.zone_stats import ZONE_NAMES, UNKNOWN_CODE, get_history_panel, history_zone_codes
+
+# === CONFIG ===
+REACH_HORIZONS = {"1h": 1, "4h": 4, "1d": 24, "1w": 120}  # label -> hourly bars ahead
+
+# (tickers, horizons, replay view) -> (levels version, model); extended in place as new bars arrive
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def next_occurrence(codes: np.ndarray, zone: int) -> np.ndarray:
+    """For every bar of a (time x ticker) code array, the index of the next later bar in zone (or len)."""
+    n_rows = len(codes)
+    positions = np.where(codes == zone, np.arange(n_rows)[:, None], n_rows)
+    following = np.minimum.accumulate(positions[::-1], axis=0)[::-1]
+    return np.vstack([following[1:], np.full((1, codes.shape[1]), n_rows)])
+
+
+class ZoneReachModel:
+    """
+    counts[ticker, from, to, horizon]: bars that started in `from` and were in `to`
+    at least once within the next `horizon` bars. totals[ticker, from, horizon]: bars
+    that started in `from` with their whole horizon observed. Probabilities are
+    counts / totals, looked up in O(1). update() folds in each new bar incrementally.
+    """
+
+    def __init__(self, tickers: list, horizons: dict = REACH_HORIZONS):
+        self.tickers = list(tickers)
+        self.horizons = dict(horizons)
+        self.spans = np.array(list(self.horizons.values()), dtype=np.int64)
+        n_tickers, n_zones, n_horizons = len(self.tickers), len(ZONE_NAMES), len(self.spans)
+        self.counts = np.zeros((n_tickers, n_zones, n_zones, n_horizons), dtype=np.uint32)
+        self.totals = np.zeros((n_tickers, n_zones, n_horizons), dtype=np.uint32)
+        self.tail = np.full((self.spans.max() + 1, n_tickers), UNKNOWN_CODE, dtype=np.int8)
+        self.n_bars = 0
+        self.last_timestamp = None
+        self._ticker_pos = {t: i for i, t in enumerate(self.tickers)}
+        self._zone_pos = {z: i for i, z in enumerate(ZONE_NAMES)}
+        self._horizon_pos = {h: i for i, h in enumerate(self.horizons)}
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, tickers: list, horizons: dict = REACH_HORIZONS) -> "ZoneReachModel":
+        """Build the whole counts cube from a (time x ticker) code history in one vectorized pass."""
+        model = cls(tickers, horizons)
+        codes = np.asarray(codes, dtype=np.int8)
+        n_rows, n_tickers = codes.shape
+        n_zones = len(ZONE_NAMES)
+        bar = np.arange(n_rows)[:, None]
+        known = codes != UNKNOWN_CODE
+        base_key = np.arange(n_tickers)[None, :] * n_zones + codes.astype(np.int64)
+
+        observed = [known & (bar + span < n_rows) for span in model.spans]
+        for h, mask in enumerate(observed):
+            model.totals[:, :, h] = np.bincount(
+                base_key[mask], minlength=n_tickers * n_zones
+            ).reshape(n_tickers, n_zones)
+        for z in range(n_zones):
+            wait = next_occurrence(codes, z) - bar
+            for h, span in enumerate(model.spans):
+                reached = observed[h] & (wait <= span)
+                model.counts[:, :, z, h] = np.bincount(
+                    base_key[reached], minlength=n_tickers * n_zones
+                ).reshape(n_tickers, n_zones)
+
+        keep = min(n_rows, len(model.tail))
+        if keep:
+            model.tail[-keep:] = codes[-keep:]
+        model.n_bars = n_rows
+        return model
+
+    def update(self, codes_row: np.ndarray):
+        """Append one bar of codes (one per ticker). Only bars whose horizon just completed are counted."""
+        self.tail = np.roll(self.tail, -1, axis=0)
+        self.tail[-1] = np.asarray(codes_row, dtype=np.int8)
+        self.n_bars += 1
+
+        n_zones = len(ZONE_NAMES)
+        columns = np.arange(len(self.tickers))
+        for h, span in enumerate(self.spans):
+            if self.n_bars <= span:
+                continue
+            start = self.tail[-span - 1]
+            window = self.tail[-span:]
+            valid = start != UNKNOWN_CODE
+            cols, from_zone = columns[valid], start[valid].astype(np.int64)
+            reached = (window[:, valid, None] == np.arange(n_zones)).any(axis=0)
+            self.totals[cols, from_zone, h] += 1
+            self.counts[cols, from_zone, :, h] += reached.astype(np.uint32)
+
+    def probability(self, ticker: str, from_zone: str, to_zone: str, horizon: str) -> float:
+        """P(in to_zone at least once within horizon | currently in from_zone); NaN if never observed."""
+        t, f = self._ticker_pos[ticker], self._zone_pos[from_zone]
+        z, h = self._zone_pos[to_zone], self._horizon_pos[horizon]
+        total = self.totals[t, f, h]
+        return float(self.counts[t, f, z, h]) / total if total else float("nan")
+
+    def reach_table(self, ticker: str, from_zone: str) -> pd.DataFrame:
+        """(zone x horizon) probabilities in % for one ticker starting from its current zone."""
+        t, f = self._ticker_pos[ticker], self._zone_pos[from_zone]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table = self.counts[t, f] / self.totals[t, f][None, :] * 100
+        return pd.DataFrame(np.round(table, 1), index=ZONE_NAMES, columns=list(self.horizons))
+
+    def save(self, path):
+        """Store the cube compactly (counts are uint32, most cells are zero)."""
+        np.savez_compressed(path, counts=self.counts, totals=self.totals, tail=self.tail,
+                            n_bars=self.n_bars, tickers=np.array(self.tickers),
+                            horizon_labels=np.array(list(self.horizons)), spans=self.spans)
+
+    @classmethod
+    def load(cls, path) -> "ZoneReachModel":
+        data = np.load(path)
+        model = cls(data["tickers"].tolist(), dict(zip(data["horizon_labels"].tolist(), data["spans"].tolist())))
+        model.counts, model.totals, model.tail = data["counts"], data["totals"], data["tail"]
+        model.n_bars = int(data["n_bars"])
+        return model
+
+
+def get_reach_model(tickers: list = TICKER_LIST, force_refresh: bool = False, as_of=None):
+    """
+    Reach model over the shared hourly history. Built once per key levels version and
+    then extended with only the bars that are new since the last call. The newest panel
+    row is left out because that hourly bar may still be forming.
+
+    Replay views (as_of) get their own model, and a model is rebuilt whenever its panel
+    ends before the last bar it has counted, so no count comes from after the clock.
+    """
+    panel = get_history_panel(tickers, force_refresh, as_of)
+    if panel is None:
+        return None
+
+    version = levels_version(KEY_LEVELS_FILE)
+    cache_key = (tuple(tickers), tuple(REACH_HORIZONS.items()), as_of is not None)
+    with _MODEL_LOCK:
+        cached = _MODEL_CACHE.get(cache_key)
+        index = panel.index[:-1]
+        moved_back = (cached is not None and cached[1].last_timestamp is not None
+                      and (not len(index) or index[-1] < cached[1].last_timestamp))
+        if cached is None or cached[0] != version or moved_back:
+            codes = history_zone_codes(panel, tickers)[:-1]
+            model = ZoneReachModel.from_codes(codes, tickers)
+            _MODEL_CACHE[cache_key] = (version, model)
+        else:
+            model = cached[1]
+            start = index.searchsorted(model.last_timestamp, side="right") if model.last_timestamp is not None else 0
+            if start < len(index):
+                codes = history_zone_codes(panel, tickers)[start:len(index)]
+                for row in codes:
+                    model.update(row)
+        if len(index):
+            model.last_timestamp = index[-1]
+    return model
+
+
+if __name__ == "__main__":
+    model = get_reach_model()
+    if model is None:
+        print("[⚠️] No price history for the reach model")
+    else:
+        print(f"[✅] Reach model over {model.n_bars} hourly bars for {len(model.tickers)} tickers")
@@ -0,0 +1,183 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.zone_locator import KEY_LEVELS_FILE, TICKER_LIST, levels_version, load_key_levels, zone_bound_table
+from core.zone_stats import ZONE_NAMES, UNKNOWN_CODE, classify_zone_codes, get_history_panel
+from core.level_proximity import pip_size
+
+# === CONFIG ===
+ATR_PERIOD = 14  # daily bars
+WATCHLIST_SIZE = 5
+WATCHLIST_COLUMNS = ['Ticker', 'Current Zone', 'Current Price', 'Next Zone Up', 'To Upper (pips)',
+                     'To Upper (ATR)', 'Next Zone Down', 'To Lower (pips)', 'To Lower (ATR)']
+
+# levels file -> (levels version, ZoneScanner); one scanner per process, shared by every session
+_SCANNERS = {}
+_SCANNER_LOCK = threading.Lock()
+# tickers -> (history panel version, daily ATR) for the watchlist
+_ATR_CACHE = {}
+
+
+def daily_atr(panel, tickers: list, period: int = ATR_PERIOD) -> np.ndarray:
+    """Latest daily ATR per ticker from an intraday OHLC panel (resampled to days)."""
+    daily = {
+        field: panel.frame(field, tickers).reindex(columns=tickers).resample('1D').agg(how)
+        for field, how in (('High', 'max'), ('Low', 'min'), ('Close', 'last'))
+    }
+    prev_close = daily['Close'].shift(1)
+    true_range = np.fmax(daily['High'] - daily['Low'],
+                         np.fmax((daily['High'] - prev_close).abs(), (daily['Low'] - prev_close).abs()))
+    true_range = true_range.dropna(how='all')
+    return true_range.rolling(period, min_periods=1).mean().iloc[-1].to_numpy(dtype=np.float64) \
+        if len(true_range) else np.full(len(tickers), np.nan)
+
+
+class ZoneScanner:
+    """
+    Zone state for a whole universe: current code per ticker, signed distances to the
+    current zone's upper/lower boundary, and the top-k tickers closest to changing zone
+    (one argpartition over the distances, so no ordering is kept between updates).
+
+    Each ticker's current (lower, upper] interval is cached, so a price update is one
+    vectorized bounds check; only the tickers that left their interval are reclassified.
+    """
+
+    def __init__(self, tickers: list, lower: np.ndarray, upper: np.ndarray, atr: np.ndarray = None):
+        self.tickers = list(tickers)
+        self.lower, self.upper = lower, upper
+        self.pips = np.array([pip_size(t) for t in self.tickers])
+        self.atr = np.full(len(self.tickers), np.nan) if atr is None else np.asarray(atr, dtype=np.float64)
+        self.prices = np.full(len(self.tickers), np.nan)
+        self.codes = np.full(len(self.tickers), UNKNOWN_CODE, dtype=np.int8)
+        self.seen = np.zeros(len(self.tickers), dtype=bool)
+        self.zone_lower = np.full(len(self.tickers), np.nan)
+        self.zone_upper = np.full(len(self.tickers), np.nan)
+
+    @classmethod
+    def from_levels(cls, tickers: list = TICKER_LIST, key_levels_df: pd.DataFrame = None, atr=None) -> "ZoneScanner":
+        key_levels_df = load_key_levels(KEY_LEVELS_FILE) if key_levels_df is None else key_levels_df
+        lower, upper = zone_bound_table(key_levels_df, tickers)
+        return cls(tickers, lower, upper, atr)
+
+    def _set_codes(self, positions: np.ndarray, codes: np.ndarray):
+        """Store new codes and cache the (lower, upper] interval of each one; NaN when unknown."""
+        codes = np.asarray(codes, dtype=np.int8)
+        self.codes[positions] = codes
+        known = codes != UNKNOWN_CODE
+        safe = np.where(known, codes, 0).astype(np.int64)
+        self.zone_lower[positions] = np.where(known, self.lower[positions, safe], np.nan)
+        self.zone_upper[positions] = np.where(known, self.upper[positions, safe], np.nan)
+
+    def boundaries(self, positions: np.ndarray = None):
+        """(lower, upper) of each ticker's current zone; NaN where the zone is unknown."""
+        positions = np.arange(len(self.tickers)) if positions is None else positions
+        return self.zone_lower[positions], self.zone_upper[positions]
+
+    def distances(self, positions: np.ndarray = None):
+        """Signed distance to the upper (>= 0) and lower (< 0) boundary, in pips and in ATR units."""
+        positions = np.arange(len(self.tickers)) if positions is None else positions
+        lower, upper = self.boundaries(positions)
+        prices = self.prices[positions]
+        to_upper, to_lower = upper - prices, lower - prices
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                'up_pips': to_upper / self.pips[positions],
+                'down_pips': to_lower / self.pips[positions],
+                'up_atr': to_upper / self.atr[positions],
+                'down_atr': to_lower / self.atr[positions],
+            }
+
+    def update_prices(self, prices: np.ndarray):
+        """
+        Apply new prices (NaN = no update for that ticker). Returns (positions, previous codes)
+        of the tickers whose zone changed and had a zone before; seen-for-the-first-time
+        tickers are classified but not reported as transitions.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        moved = ~np.isnan(prices)
+        self.prices[moved] = prices[moved]
+
+        left = np.flatnonzero(moved & ~((prices > self.zone_lower) & (prices <= self.zone_upper)))
+        previous = self.codes[left].copy()
+        self._set_codes(left, classify_zone_codes(prices[left][None, :], self.lower[left], self.upper[left])[0])
+
+        changed = (self.codes[left] != previous) & self.seen[left]
+        self.seen[moved] = True
+        return left[changed], previous[changed]
+
+    def top_k(self, k: int = WATCHLIST_SIZE) -> np.ndarray:
+        """Positions of the k tickers nearest a zone boundary (ATR units first, pips if no ATR)."""
+        dist = self.distances()
+        atr_gap = np.fmin(np.abs(dist['up_atr']), np.abs(dist['down_atr']))
+        pip_gap = np.where(np.isfinite(atr_gap), np.nan, np.fmin(np.abs(dist['up_pips']), np.abs(dist['down_pips'])))
+        picked, remaining = [np.empty(0, dtype=np.int64)], k
+        for gap in (atr_gap, pip_gap):
+            candidates = np.flatnonzero(np.isfinite(gap))
+            n = min(remaining, len(candidates))
+            if n <= 0:
+                continue
+            nearest = candidates[np.argpartition(gap[candidates], n - 1)[:n]]
+            picked.append(nearest[np.lexsort((nearest, gap[nearest]))])
+            remaining -= n
+        return np.concatenate(picked)
+
+    def watchlist(self, k: int = WATCHLIST_SIZE) -> pd.DataFrame:
+        """Top-k near-boundary tickers with their distances, nearest first."""
+        positions = self.top_k(k)
+        if positions.size == 0:
+            return pd.DataFrame(columns=WATCHLIST_COLUMNS)
+        dist = self.distances(positions)
+        codes = self.codes[positions]
+        names = np.asarray(ZONE_NAMES + ['Unknown'], dtype=object)
+        up_name = np.where(codes > 0, names[np.maximum(codes - 1, 0)], '–')
+        down_name = np.where((codes >= 0) & (codes < len(ZONE_NAMES) - 1), names[np.minimum(codes + 1, len(ZONE_NAMES) - 1)], '–')
+        return pd.DataFrame({
+            'Ticker': np.asarray(self.tickers, dtype=object)[positions],
+            'Current Zone': names[codes],
+            'Current Price': np.round(self.prices[positions], 5),
+            'Next Zone Up': up_name,
+            'To Upper (pips)': np.round(dist['up_pips'], 1),
+            'To Upper (ATR)': np.round(dist['up_atr'], 2),
+            'Next Zone Down': down_name,
+            'To Lower (pips)': np.round(dist['down_pips'], 1),
+            'To Lower (ATR)': np.round(dist['down_atr'], 2),
+        }, columns=WATCHLIST_COLUMNS)
+
+
+def get_zone_scanner(tickers: list = TICKER_LIST) -> ZoneScanner:
+    """Process-wide scanner, rebuilt (empty) when the key levels file changes."""
+    version = levels_version(KEY_LEVELS_FILE)
+    with _SCANNER_LOCK:
+        cached = _SCANNERS.get(tuple(tickers))
+        if cached is None or cached[0] != version:
+            cached = (version, ZoneScanner.from_levels(tickers))
+            _SCANNERS[tuple(tickers)] = cached
+        return cached[1]
+
+
+def watchlist_atr(tickers: list, as_of=None) -> np.ndarray:
+    """Daily ATR per ticker, recomputed only when the hourly history panel changes."""
+    panel = get_history_panel(tickers, as_of=as_of)
+    if panel is None:
+        return None
+    with _SCANNER_LOCK:
+        cached = _ATR_CACHE.get(tuple(tickers))
+        if cached is None or cached[0] != panel.version:
+            cached = (panel.version, daily_atr(panel, tickers))
+            _ATR_CACHE[tuple(tickers)] = cached
+        return cached[1]
+
+
+def near_boundary_watchlist(zone_df: pd.DataFrame, k: int = WATCHLIST_SIZE, as_of=None) -> pd.DataFrame:
+    """
+    Top-k watchlist for a snapshot's prices. Uses its own scanner over the shared zone
+    bounds: the snapshot may be stale or replayed, and must never change the zones the
+    live scan compares against.
+    """
+    shared = get_zone_scanner()
+    scanner = ZoneScanner(shared.tickers, shared.lower, shared.upper, watchlist_atr(shared.tickers, as_of))
+    prices = zone_df.set_index('Ticker')['Current Price'].reindex(scanner.tickers).to_numpy(dtype=np.float64)
+    scanner.update_prices(prices)
+    return scanner.watchlist(k)
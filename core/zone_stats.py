@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from core.zone_locator import (
+    KEY_LEVELS_FILE, TICKER_LIST, ZONE_DEFINITIONS, levels_version, load_key_levels, zone_bound_table,
+)
+from data.price_panel import refresh_panel
+
+# === CONFIG ===
+ZONE_NAMES = [zone for zone, _, _ in ZONE_DEFINITIONS]
+UNKNOWN_CODE = -1
+HISTORY_PANEL = "zone_hourly"
+HISTORY_PERIOD = "730d"  # longest hourly history Yahoo serves
+HISTORY_INTERVAL = "1h"
+HISTORY_MAX_AGE_SECONDS = 60 * 60
+BAR_HOURS = {"1h": 1, "1d": 24}
+CLASSIFY_CHUNK_ROWS = 4096
+STATS_COLUMNS = ['Ticker', 'Zone', 'Bars', 'Time %', 'Visits', 'Avg Dwell (bars)',
+                 'Max Dwell (bars)', 'Avg Dwell (h)']
+
+# (levels version, panel version) -> dwell stats, so reruns reuse the last computation
+_STATS_CACHE = {}
+
+
+def classify_zone_codes(prices: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Zone code (index into ZONE_DEFINITIONS, -1 = unknown/no price) for every price of a
+    (time x ticker) array, using the same lower < price <= upper rule as compute_current_zone.
+    lower/upper are (ticker x zone) from zone_bound_table.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    codes = np.full(prices.shape, UNKNOWN_CODE, dtype=np.int8)
+    for start in range(0, len(prices), CLASSIFY_CHUNK_ROWS):
+        block = prices[start:start + CLASSIFY_CHUNK_ROWS, :, None]
+        inside = (block > lower) & (block <= upper)
+        found = inside.any(axis=2)
+        codes[start:start + CLASSIFY_CHUNK_ROWS] = np.where(found, inside.argmax(axis=2), UNKNOWN_CODE)
+    return codes
+
+
+def run_length_encode(codes: np.ndarray):
+    """(starts, lengths, values) of the runs in each column of a (time x ticker) code array,
+    flattened column by column; runs never cross from one ticker into the next."""
+    codes = np.asarray(codes)
+    if codes.ndim == 1:
+        codes = codes[:, None]
+    n_rows = codes.shape[0]
+    flat = codes.T.ravel()
+    if flat.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, flat
+
+    boundary = np.empty(flat.size, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = flat[1:] != flat[:-1]
+    boundary[::n_rows] = True
+    starts = np.flatnonzero(boundary)
+    lengths = np.diff(np.append(starts, flat.size))
+    return starts, lengths, flat[starts]
+
+
+def priced_runs(codes: np.ndarray, priced: np.ndarray):
+    """
+    (columns, lengths, values) of the runs in each column of a (time x ticker) code array
+    after dropping each ticker's unpriced bars. The panel is aligned on every ticker's
+    timestamps, so a gap where only other tickers traded must not split a run.
+    """
+    n_rows, n_tickers = codes.shape
+    keep = np.asarray(priced, dtype=bool).T.ravel()
+    flat = codes.T.ravel()[keep]
+    columns = np.repeat(np.arange(n_tickers), n_rows)[keep]
+    if flat.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, flat
+
+    boundary = np.empty(flat.size, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = (flat[1:] != flat[:-1]) | (columns[1:] != columns[:-1])
+    starts = np.flatnonzero(boundary)
+    lengths = np.diff(np.append(starts, flat.size))
+    return columns[starts], lengths, flat[starts]
+
+
+def zone_dwell_stats(codes: np.ndarray, tickers: list, bar_hours: float = 1.0,
+                     priced: np.ndarray = None) -> pd.DataFrame:
+    """
+    Time-in-zone share, visit count and dwell durations per (ticker, zone), from a
+    (time x ticker) code array. Unknown bars are left out of every figure; bars where
+    `priced` is False (no close for that ticker) are dropped before the runs are counted.
+    """
+    n_rows, n_tickers = codes.shape
+    n_zones = len(ZONE_NAMES)
+    if priced is None:
+        starts, lengths, values = run_length_encode(codes)
+        columns = starts // max(n_rows, 1)
+    else:
+        columns, lengths, values = priced_runs(codes, priced)
+
+    known = values != UNKNOWN_CODE
+    key = columns[known] * n_zones + values[known].astype(np.int64)
+    size = n_tickers * n_zones
+    bars = np.bincount(key, weights=lengths[known], minlength=size)
+    visits = np.bincount(key, minlength=size)
+    longest = np.zeros(size)
+    np.maximum.at(longest, key, lengths[known])
+
+    bars_per_ticker = bars.reshape(n_tickers, n_zones).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = bars / np.repeat(bars_per_ticker, n_zones) * 100
+        avg_dwell = bars / visits
+
+    stats = pd.DataFrame({
+        'Ticker': np.repeat(np.asarray(tickers, dtype=object), n_zones),
+        'Zone': np.tile(ZONE_NAMES, n_tickers),
+        'Bars': bars.astype(np.int64),
+        'Time %': np.round(np.nan_to_num(share), 2),
+        'Visits': visits,
+        'Avg Dwell (bars)': np.round(np.nan_to_num(avg_dwell), 1),
+        'Max Dwell (bars)': longest.astype(np.int64),
+        'Avg Dwell (h)': np.round(np.nan_to_num(avg_dwell) * bar_hours, 1),
+    }, columns=STATS_COLUMNS)
+    return stats
+
+
+def get_history_panel(tickers: list = TICKER_LIST, force_refresh: bool = False, as_of=None):
+    """Shared hourly price history for the zone universe (cut at as_of while replaying)."""
+    return refresh_panel(HISTORY_PANEL, tickers, period=HISTORY_PERIOD, interval=HISTORY_INTERVAL,
+                         max_age_seconds=HISTORY_MAX_AGE_SECONDS, force=force_refresh, as_of=as_of)
+
+
+def history_zone_codes(panel, tickers: list = TICKER_LIST) -> np.ndarray:
+    """Zone codes of every hourly close in the panel (time x ticker), against the current key levels."""
+    close = panel.frame('Close', tickers).reindex(columns=tickers)
+    lower, upper = zone_bound_table(load_key_levels(KEY_LEVELS_FILE), tickers)
+    return classify_zone_codes(close.to_numpy(), lower, upper)
+
+
+def get_zone_dwell_stats(tickers: list = TICKER_LIST, force_refresh: bool = False, as_of=None) -> pd.DataFrame:
+    """Dwell statistics over the hourly history, recomputed only when the levels or the prices change."""
+    panel = get_history_panel(tickers, force_refresh, as_of)
+    if panel is None:
+        return pd.DataFrame(columns=STATS_COLUMNS)
+
+    cache_key = (levels_version(KEY_LEVELS_FILE), panel.version, tuple(tickers))
+    if cache_key not in _STATS_CACHE:
+        codes = history_zone_codes(panel, tickers)
+        priced = panel.frame('Close', tickers).reindex(columns=tickers).notna().to_numpy()
+        _STATS_CACHE.clear()
+        _STATS_CACHE[cache_key] = zone_dwell_stats(codes, tickers, BAR_HOURS.get(panel.interval, 1), priced)
+    return _STATS_CACHE[cache_key]
+
+
+if __name__ == "__main__":
+    stats = get_zone_dwell_stats()
+    print(stats[stats['Bars'] > 0].to_string(index=False))
@@ -0,0 +1,329 @@
+# data/price_panel.py
+import os
+import re
+import json
+import time
+import hashlib
+import contextlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+PANEL_DIR = BASE_DIR / "data" / "panels"
+
+# === CONFIG ===
+OHLC_FIELDS = ['Open', 'High', 'Low', 'Close']
+PANEL_FIELDS = OHLC_FIELDS + ['Return']
+PANEL_MAGIC = b"FXPANEL1"
+HEADER_ALIGN = 64
+LOCK_STALE_SECONDS = 120
+LOCK_POLL_SECONDS = 0.25
+POINTER_RETRIES = 40  # x LOCK_POLL_SECONDS; Windows refuses to replace a file another reader has open
+PERIOD_UNIT_DAYS = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+INTERVAL_UNITS = {"m": "minutes", "h": "hours", "d": "days", "wk": "weeks", "mo": "months"}
+
+# pointer path -> (pointer stamp, PricePanel); one mapping per process, shared by every session
+_OPEN_PANELS = {}
+# (panel version, rows) -> truncated PricePanel view, shared by every replaying session
+_AS_OF_VIEWS = {}
+_AS_OF_VIEW_LIMIT = 32
+
+
+class PricePanel:
+    """
+    Read-only (field x time x symbol) float64 panel backed by a memory-mapped file.
+
+    Every Streamlit session in a process gets the same object, and every process
+    maps the same file, so the OS page cache holds a single copy of the prices.
+    """
+
+    def __init__(self, header: dict, timestamps: np.ndarray, values: np.ndarray):
+        self.header = header
+        self.symbols = header["symbols"]
+        self.fields = header["fields"]
+        self.interval = header["interval"]
+        self.version = header["version"]
+        self.created = header["created"]
+        self.timestamps = timestamps
+        self.values = values
+        self._symbol_pos = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._index = None
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self._index is None:
+            index = pd.DatetimeIndex(self.timestamps.view('datetime64[ns]'), name='Date')
+            tz = self.header.get("tz")
+            self._index = index.tz_localize('UTC').tz_convert(tz) if tz else index
+        return self._index
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.created
+
+    def field(self, name: str) -> np.ndarray:
+        """Zero-copy (time x symbol) view of one field."""
+        return self.values[self.fields.index(name)]
+
+    def frame(self, name: str, symbols: list = None) -> pd.DataFrame:
+        """DataFrame over one field; a view unless a symbol subset is requested."""
+        df = pd.DataFrame(self.field(name), index=self.index, columns=self.symbols, copy=False)
+        return df[[s for s in symbols if s in self._symbol_pos]] if symbols is not None else df
+
+    def covers(self, symbols) -> bool:
+        """True if every symbol was requested when this panel was built (even if it had no data)."""
+        requested = set(self.header.get("requested", self.symbols))
+        return all(s in requested for s in symbols)
+
+    def covers_period(self, period: str) -> bool:
+        """True if the panel was downloaded with a period at least as long as `period`."""
+        stored = self.header.get("period")
+        return stored is not None and period_days(stored) >= period_days(period)
+
+    def closed_rows(self, timestamp) -> int:
+        """Number of bars that have closed by timestamp (bar start + interval <= timestamp)."""
+        timestamp = pd.Timestamp(timestamp)
+        utc = timestamp.tz_convert('UTC').tz_localize(None) if timestamp.tzinfo else timestamp
+        last_start = utc - interval_offset(self.interval)
+        return int(np.searchsorted(self.timestamps, last_start.value, side="right"))
+
+    def as_of(self, timestamp) -> "PricePanel":
+        """
+        Zero-copy view holding only the bars that had closed by timestamp; same interface
+        as the full panel. A daily bar stamped 00:00 carries that evening's close, so it
+        only appears once the day is over.
+        """
+        rows = self.closed_rows(timestamp)
+        if rows == len(self.timestamps):
+            return self
+        key = (self.version, rows)
+        view = _AS_OF_VIEWS.get(key)
+        if view is None:
+            header = dict(self.header, rows=rows, version=f"{self.version}@{rows}")
+            view = PricePanel(header, self.timestamps[:rows], self.values[:, :rows])
+            if len(_AS_OF_VIEWS) >= _AS_OF_VIEW_LIMIT:
+                _AS_OF_VIEWS.pop(next(iter(_AS_OF_VIEWS)))
+            _AS_OF_VIEWS[key] = view
+        return view
+
+
+def period_days(period: str) -> float:
+    """Rough length of a yfinance period string ("5d", "3mo", "730d", "ytd", "max") in days."""
+    if period == "max":
+        return float("inf")
+    if period == "ytd":
+        return float(pd.Timestamp.now().dayofyear)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if match is None:
+        raise ValueError(f"Unknown period: {period}")
+    return int(match.group(1)) * PERIOD_UNIT_DAYS[match.group(2)]
+
+
+def interval_offset(interval: str) -> pd.DateOffset:
+    """Length of one bar for a yfinance interval string ("1m", "1h", "1d", "1wk", "1mo")."""
+    match = re.fullmatch(r"(\d+)(m|h|d|wk|mo)", interval)
+    if match is None:
+        raise ValueError(f"Unknown interval: {interval}")
+    return pd.DateOffset(**{INTERVAL_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def panel_path(name: str, panel_dir: Path = PANEL_DIR) -> Path:
+    """Pointer file naming the data file that currently holds the panel."""
+    return Path(panel_dir) / f"{name}.current"
+
+
+def _replace_pointer(tmp_path: Path, path: Path):
+    for attempt in range(POINTER_RETRIES):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == POINTER_RETRIES - 1:
+                raise
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+def _remove_old_panels(name: str, panel_dir: Path, keep: str):
+    """Delete superseded data files; on Windows one still mapped somewhere fails and is retried next publish."""
+    for old in [*Path(panel_dir).glob(f"{name}.*.panel"), Path(panel_dir) / f"{name}.panel"]:
+        if old.name != keep:
+            with contextlib.suppress(OSError):
+                os.remove(old)
+
+
+def publish_panel(name: str, frames: dict, interval: str, panel_dir: Path = PANEL_DIR,
+                  requested: list = None, period: str = None) -> str:
+    """
+    Write {field: wide DataFrame} as a new aligned panel file and atomically point the
+    panel's pointer file at it. A published data file is never overwritten (Windows
+    cannot replace a file that is memory-mapped), so readers holding the previous file
+    keep a valid mapping until they reopen.
+    """
+    fields = list(frames)
+    index = frames[fields[0]].index
+    for df in frames.values():
+        index = index.union(df.index)
+    symbols = sorted(set().union(*(df.columns for df in frames.values())))
+
+    values = np.stack([
+        frames[f].reindex(index=index, columns=symbols).to_numpy(dtype=np.float64) for f in fields
+    ])
+    tz = str(index.tz) if index.tz is not None else None
+    utc_index = index.tz_convert('UTC').tz_localize(None) if tz else index
+    timestamps = np.ascontiguousarray(utc_index.values.astype('datetime64[ns]').view(np.int64))
+
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(timestamps)
+    digest.update(np.ascontiguousarray(values))
+    digest.update(json.dumps(symbols).encode())
+    header = {
+        "symbols": symbols,
+        "fields": fields,
+        "interval": interval,
+        "period": period,
+        "requested": sorted(requested) if requested is not None else symbols,
+        "tz": tz,
+        "rows": len(timestamps),
+        "version": digest.hexdigest(),
+        "created": time.time(),
+    }
+
+    header_bytes = json.dumps(header).encode()
+    data_offset = -(-(len(PANEL_MAGIC) + 8 + len(header_bytes)) // HEADER_ALIGN) * HEADER_ALIGN
+
+    path = panel_path(name, panel_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data_name = f"{name}.{header['version']}-{os.getpid()}-{time.time_ns():x}.panel"
+    with open(path.parent / data_name, "wb") as f:
+        f.write(PANEL_MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(timestamps.tobytes())
+        f.write(np.ascontiguousarray(values).tobytes())
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(data_name)
+    _replace_pointer(tmp_path, path)
+    _remove_old_panels(name, path.parent, keep=data_name)
+
+    print(f"[💾] Published panel {name}: {len(timestamps)} x {len(symbols)} ({header['version']})")
+    return header["version"]
+
+
+def _map_panel(path: Path) -> PricePanel:
+    with open(path, "rb") as f:
+        if f.read(len(PANEL_MAGIC)) != PANEL_MAGIC:
+            raise ValueError(f"{path} is not a price panel file")
+        header_len = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_len))
+        # Mapped through the open handle, so a publish removing the file right after cannot break it
+        raw = np.memmap(f, dtype=np.uint8, mode="r")
+    data_offset = -(-(len(PANEL_MAGIC) + 8 + header_len) // HEADER_ALIGN) * HEADER_ALIGN
+
+    rows, n_symbols, n_fields = header["rows"], len(header["symbols"]), len(header["fields"])
+    ts_end = data_offset + rows * 8
+    timestamps = raw[data_offset:ts_end].view(np.int64)
+    values = raw[ts_end:ts_end + rows * n_symbols * n_fields * 8].view(np.float64)
+    return PricePanel(header, timestamps, values.reshape(n_fields, rows, n_symbols))
+
+
+def open_panel(name: str, panel_dir: Path = PANEL_DIR):
+    """Memory-map a published panel; reuses the process-wide mapping until the pointer moves."""
+    pointer = panel_path(name, panel_dir)
+    for _ in range(POINTER_RETRIES):
+        try:
+            stat = os.stat(pointer)
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            cached = _OPEN_PANELS.get(pointer)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            panel = _map_panel(pointer.parent / pointer.read_text().strip())
+        except FileNotFoundError:
+            if not pointer.exists():
+                return None
+            continue  # a publish moved the pointer and removed the file it named; read it again
+        _OPEN_PANELS[pointer] = (stamp, panel)
+        return panel
+    return None
+
+
+def download_ohlc_frames(tickers: list, period: str, interval: str) -> dict:
+    """One batched yfinance request for all tickers, split into {field: wide DataFrame}."""
+    data = yf.download(list(tickers), period=period, interval=interval, progress=False,
+                       auto_adjust=False, group_by="column", threads=True)
+    if data.empty:
+        return {}
+
+    frames = {}
+    for field in OHLC_FIELDS:
+        block = data[field]
+        if isinstance(block, pd.Series):
+            block = block.to_frame(tickers[0])
+        frames[field] = block
+    valid_rows = frames['Close'].notna().any(axis=1)
+    frames = {field: df.loc[valid_rows] for field, df in frames.items()}
+    frames['Return'] = frames['Close'].pct_change(fill_method=None)
+    return frames
+
+
+def _acquire_lock(lock_path: Path) -> bool:
+    """Cross-process publish lock. Returns False if another process held it and has since finished."""
+    waited = False
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return not waited
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(lock_path).st_mtime > LOCK_STALE_SECONDS:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            waited = True
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+def refresh_panel(name: str, tickers: list, period: str, interval: str,
+                  max_age_seconds: float, force: bool = False, panel_dir: Path = PANEL_DIR, as_of=None):
+    """
+    Return the published panel if it is fresh and covers tickers; otherwise download
+    and publish it. Only one process downloads at a time, the others reuse its result.
+    With as_of (a replaying session's clock time) a stored panel is never refreshed and
+    is cut at that time.
+    """
+    def view(panel):
+        return panel.as_of(as_of) if as_of is not None and panel is not None else panel
+
+    def is_fresh(panel):
+        return (panel is not None and panel.interval == interval and panel.covers_period(period)
+                and panel.age_seconds < max_age_seconds and panel.covers(tickers))
+
+    panel = open_panel(name, panel_dir)
+    if as_of is not None and panel is not None and panel.interval == interval and panel.covers(tickers):
+        return view(panel)
+    if not force and is_fresh(panel):
+        return view(panel)
+
+    lock_path = panel_path(name, panel_dir).with_suffix(".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    first_in_line = _acquire_lock(lock_path)
+    try:
+        panel = open_panel(name, panel_dir)
+        if (force and first_in_line) or not is_fresh(panel):
+            frames = download_ohlc_frames(tickers, period, interval)
+            if not frames:
+                print(f"[⚠️] No data downloaded for panel {name}")
+                return view(panel)
+            publish_panel(name, frames, interval, panel_dir, requested=tickers, period=period)
+            panel = open_panel(name, panel_dir)
+    finally:
+        # A waiter may already have removed the lock as stale if the download was slow
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(lock_path)
+    return view(panel)
@@ -0,0 +1,169 @@
+# data/synthetic.py
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.price_panel import publish_panel
+
+# === CONFIG ===
+# 3-letter codes so split_pair()/pair_incidence() treat synthetic crosses like real ones
+SYNTH_CURRENCIES = [
+    'USD', 'EUR', 'JPY', 'GBP', 'CHF', 'CAD', 'AUD', 'NZD', 'NOK', 'SEK', 'SGD', 'ZAR',
+    'MXN', 'HKD', 'DKK', 'PLN', 'CZK', 'HUF', 'TRY', 'CNH', 'INR', 'KRW', 'TWD', 'THB',
+    'BRL', 'CLP', 'COP', 'ILS', 'PHP', 'IDR', 'MYR', 'RON', 'ISK', 'PEN', 'KZT', 'SAR',
+]
+BASE_PRIORITY = ['EUR', 'GBP', 'AUD', 'NZD', 'USD', 'CAD', 'CHF']  # market quoting order; others follow list order
+# Approximate USD value of each currency, so synthetic majors trade near real prices
+USD_VALUE = {'USD': 1.0, 'EUR': 1.10, 'GBP': 1.27, 'AUD': 0.66, 'NZD': 0.60, 'CAD': 0.73, 'CHF': 1.13,
+             'JPY': 0.0067, 'NOK': 0.094, 'SEK': 0.096, 'SGD': 0.75, 'ZAR': 0.054}
+SYNTH_START = "2015-01-01"
+SYNTH_FREQ = "1h"
+SYNTH_ANNUAL_VOL = 0.09  # per currency factor
+SYNTH_GLOBAL_FACTORS = 3  # shared drivers (USD, risk-on/off, ...) that make currencies co-move
+SYNTH_BAR_RANGE = 0.35  # high/low extension as a share of the bar's volatility
+KEY_LEVEL_COLUMNS = ["Purple upper", "Red  Upper", "Yellow Upper", "Green", "Yellow Lower", "Red Lower", "Purple lower"]
+KEY_LEVEL_QUANTILES = [0.98, 0.90, 0.75, 0.50, 0.25, 0.10, 0.02]  # one per column, top to bottom
+HOURS_PER_YEAR = 252 * 24
+
+
+def currencies_for(n_pairs: int, currencies: list = None) -> list:
+    """Smallest prefix of the currency list whose crosses give at least n_pairs instruments."""
+    currencies = SYNTH_CURRENCIES if currencies is None else list(currencies)
+    needed = math.ceil((1 + math.sqrt(1 + 8 * n_pairs)) / 2)
+    if needed > len(currencies):
+        raise ValueError(f"{n_pairs} pairs need {needed} currencies, only {len(currencies)} available")
+    return currencies[:max(needed, 2)]
+
+
+def synthetic_pairs(n_pairs: int, currencies: list = None) -> list:
+    """n_pairs crosses (BASEQUOTE=X, quoted the market way round) over currencies_for(n_pairs), majors first."""
+    currencies = currencies_for(n_pairs, currencies)
+    rank = {c: (BASE_PRIORITY.index(c) if c in BASE_PRIORITY else len(BASE_PRIORITY) + i) for i, c in enumerate(currencies)}
+    pairs = []
+    for j, second in enumerate(currencies):
+        for first in currencies[:j]:
+            base, quote = (first, second) if rank[first] < rank[second] else (second, first)
+            pairs.append(f"{base}{quote}=X")
+    return pairs[:n_pairs]
+
+
+def synthetic_index(periods: int, freq: str = SYNTH_FREQ, start=SYNTH_START, end=None) -> pd.DatetimeIndex:
+    """UTC bar timestamps on weekdays only, like a Yahoo FX history; counted back from end if given."""
+    step = pd.Timedelta(freq)
+    per_week = max(int(pd.Timedelta(days=7) / step), 1)
+    span = int(periods * 7 / 5) + per_week
+    if end is not None:
+        end = pd.Timestamp(end)
+        end = end.tz_localize('UTC') if end.tzinfo is None else end.tz_convert('UTC')
+        raw = pd.date_range(end=end.floor(step), periods=span, freq=step, name='Date')
+        return raw[raw.dayofweek < 5][-periods:]
+    raw = pd.date_range(start=start, periods=span, freq=step, tz='UTC', name='Date')
+    return raw[raw.dayofweek < 5][:periods]
+
+
+def currency_factor_paths(currencies: list, index: pd.DatetimeIndex, annual_vol: float = SYNTH_ANNUAL_VOL,
+                          n_global: int = SYNTH_GLOBAL_FACTORS, seed: int = 0) -> np.ndarray:
+    """
+    Log value of each currency (time x currency). Each step is a loading on a few shared
+    factors plus its own shock, so pairs come out correlated. Deterministic per seed.
+    """
+    rng = np.random.default_rng(seed)
+    n_steps, n_ccy = len(index), len(currencies)
+    bar_years = (index[1] - index[0]) / pd.Timedelta(hours=1) / HOURS_PER_YEAR if n_steps > 1 else 1 / HOURS_PER_YEAR
+    step_vol = annual_vol * math.sqrt(bar_years)
+
+    loadings = rng.normal(0.0, 1.0, (n_global, n_ccy)) * rng.uniform(0.3, 0.9, n_global)[:, None]
+    scale = step_vol / np.sqrt((loadings ** 2).sum(axis=0) + 1.0)  # idiosyncratic shock has unit variance
+
+    log_values = np.empty((n_steps, n_ccy))
+    level = rng.uniform(-1.5, 1.5, n_ccy)  # currencies without a reference value get a random one
+    known = [i for i, c in enumerate(currencies) if c in USD_VALUE]
+    level[known] = np.log([USD_VALUE[currencies[i]] for i in known])
+    # Blocked so 10 years of hourly shocks never sit in memory at once
+    for start in range(0, n_steps, 8192):
+        stop = min(start + 8192, n_steps)
+        shocks = rng.standard_normal((stop - start, n_global)) @ loadings + rng.standard_normal((stop - start, n_ccy))
+        path = np.cumsum(shocks * scale, axis=0) + level
+        log_values[start:stop] = path
+        level = path[-1]
+    return log_values
+
+
+def synthetic_fx_frames(n_pairs: int = 45, periods: int = 24 * 260, freq: str = SYNTH_FREQ, start=SYNTH_START,
+                        seed: int = 0, currencies: list = None, fields=('Open', 'High', 'Low', 'Close', 'Return'),
+                        end=None) -> dict:
+    """
+    {field: wide DataFrame} in the download_ohlc_frames layout for n_pairs synthetic
+    crosses. See synthetic_frames_for for how the prices are built.
+    """
+    return synthetic_frames_for(synthetic_pairs(n_pairs, currencies), periods, freq, start, seed,
+                                currencies_for(n_pairs, currencies), fields, end)
+
+
+def synthetic_frames_for(pairs: list, periods: int, freq: str = SYNTH_FREQ, start=SYNTH_START, seed: int = 0,
+                         currencies: list = None, fields=('Open', 'High', 'Low', 'Close', 'Return'), end=None) -> dict:
+    """
+    Synthetic frames for any list of BASEQUOTE=X symbols. Every close is
+    exp(base factor - quote factor), so crosses are exactly triangular-consistent
+    (EURJPY = EURUSD * USDJPY). Opens are the previous close; highs/lows add a
+    deterministic wick around the open/close range.
+    """
+    pairs = list(pairs)
+    ccy = list(SYNTH_CURRENCIES if currencies is None else currencies)
+    ccy += sorted({c for p in pairs for c in (p[:3], p[3:6])} - set(ccy))
+    index = synthetic_index(periods, freq, start, end)
+    log_values = currency_factor_paths(ccy, index, seed=seed)
+    position = {c: i for i, c in enumerate(ccy)}
+    base = np.array([position[p[:3]] for p in pairs], dtype=np.int64)
+    quote = np.array([position[p[3:6]] for p in pairs], dtype=np.int64)
+
+    log_close = log_values[:, base] - log_values[:, quote]
+    close = np.exp(log_close)
+    frames = {}
+    if 'Close' in fields:
+        frames['Close'] = pd.DataFrame(close, index=index, columns=pairs)
+    if {'Open', 'High', 'Low'} & set(fields):
+        open_ = np.vstack([close[:1], close[:-1]])
+        if 'Open' in fields:
+            frames['Open'] = pd.DataFrame(open_, index=index, columns=pairs)
+        if {'High', 'Low'} & set(fields):
+            wick = np.abs(np.random.default_rng(seed + 2).standard_normal(close.shape)) * \
+                SYNTH_BAR_RANGE * np.abs(np.diff(log_close, axis=0, prepend=log_close[:1])).mean(axis=0)
+            if 'High' in fields:
+                frames['High'] = pd.DataFrame(np.maximum(open_, close) * np.exp(wick), index=index, columns=pairs)
+            if 'Low' in fields:
+                frames['Low'] = pd.DataFrame(np.minimum(open_, close) * np.exp(-wick), index=index, columns=pairs)
+    if 'Return' in fields:
+        frames['Return'] = pd.DataFrame(close, index=index, columns=pairs).pct_change(fill_method=None)
+    return {field: frames[field] for field in fields if field in frames}
+
+
+def synthetic_key_levels(close_df: pd.DataFrame) -> pd.DataFrame:
+    """Key levels in the Key_levels_1D.xlsx schema, placed at quantiles of each pair's history
+    so every zone is visited."""
+    levels = np.nanquantile(close_df.to_numpy(dtype=np.float64), KEY_LEVEL_QUANTILES, axis=0).T
+    df = pd.DataFrame(np.round(levels, 5), columns=KEY_LEVEL_COLUMNS)
+    df.insert(0, 'Ticker', list(close_df.columns))
+    return df
+
+
+def write_key_levels(levels_df: pd.DataFrame, filepath):
+    """Write levels exactly like the hand-maintained file (Ticker column, no index)."""
+    filepath = Path(filepath)
+    os.makedirs(filepath.parent, exist_ok=True)
+    levels_df.to_excel(filepath, index=False)
+    print(f"[💾] Exported {len(levels_df)} synthetic key levels to: {filepath}")
+    return filepath
+
+
+def publish_synthetic_panel(name: str, n_pairs: int = 45, periods: int = 24 * 260, freq: str = SYNTH_FREQ,
+                            seed: int = 0, key_levels_file=None, **kwargs) -> dict:
+    """Publish a synthetic OHLC panel under name (and optionally matching key levels); returns the frames."""
+    frames = synthetic_fx_frames(n_pairs, periods, freq, seed=seed, **kwargs)
+    publish_panel(name, frames, freq, requested=list(frames['Close'].columns))
+    if key_levels_file is not None:
+        write_key_levels(synthetic_key_levels(frames['Close']), key_levels_file)
+    return frames
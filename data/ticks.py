@@ -0,0 +1,183 @@
+# data/ticks.py
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# === CONFIG ===
+BAR_INTERVALS = {"1m": 60, "5m": 5 * 60, "1h": 60 * 60, "1d": 24 * 60 * 60}  # label -> seconds
+TICK_COLUMNS = ['Timestamp', 'Symbol', 'Price']
+SIM_TICK_SECONDS = 1.0
+SIM_VOL_PER_TICK = 0.00005
+REPLAY_CHUNK_ROWS = 100_000
+
+
+class Tick(NamedTuple):
+    timestamp: pd.Timestamp  # UTC
+    symbol: str
+    price: float
+
+
+class Bar(NamedTuple):
+    """One completed bar for the whole universe; NaN where a symbol had no ticks."""
+    interval: str
+    timestamp: pd.Timestamp  # bucket start, UTC
+    symbols: list
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def frame(self, field: str = 'close') -> pd.DataFrame:
+        """One-row wide DataFrame of a field, the shape the batch scanners take."""
+        return pd.DataFrame([getattr(self, field)], index=pd.DatetimeIndex([self.timestamp], name='Date'),
+                            columns=self.symbols)
+
+
+class SimulatedTickSource:
+    """
+    Deterministic random-walk feed: each tick moves one randomly chosen symbol.
+    Timestamps advance by tick_seconds, so bar boundaries are reproducible.
+    """
+
+    def __init__(self, symbols: list, start_prices=None, start=None, tick_seconds: float = SIM_TICK_SECONDS,
+                 vol_per_tick: float = SIM_VOL_PER_TICK, n_ticks: int = None, seed: int = 0):
+        self.symbols = list(symbols)
+        self.start_prices = np.ones(len(self.symbols)) if start_prices is None else np.asarray(start_prices, dtype=np.float64)
+        start = pd.Timestamp.now(tz='UTC').floor('D') if start is None else pd.Timestamp(start)
+        self.start = start.tz_localize('UTC') if start.tzinfo is None else start.tz_convert('UTC')
+        self.tick_seconds = tick_seconds
+        self.vol_per_tick = vol_per_tick
+        self.n_ticks = n_ticks
+        self.seed = seed
+
+    def __iter__(self):
+        rng = np.random.default_rng(self.seed)
+        log_prices = np.log(self.start_prices)
+        start_ns = self.start.value
+        step_ns = int(self.tick_seconds * 1e9)
+        i = 0
+        while self.n_ticks is None or i < self.n_ticks:
+            # Draw in blocks so the generator is not dominated by per-tick RNG calls
+            block = 4096 if self.n_ticks is None else min(4096, self.n_ticks - i)
+            picks = rng.integers(0, len(self.symbols), block)
+            shocks = rng.normal(0.0, self.vol_per_tick, block)
+            for pick, shock in zip(picks, shocks):
+                log_prices[pick] += shock
+                yield Tick(pd.Timestamp(start_ns + i * step_ns, tz='UTC'), self.symbols[pick], float(np.exp(log_prices[pick])))
+                i += 1
+
+
+class ReplayTickSource:
+    """Ticks from a Timestamp,Symbol,Price CSV (time-ordered), read in chunks so large files stream."""
+
+    def __init__(self, path, symbols: list = None, chunk_rows: int = REPLAY_CHUNK_ROWS):
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self._filter = set(symbols) if symbols is not None else None
+        self.symbols = list(symbols) if symbols is not None else None
+
+    def __iter__(self):
+        for chunk in pd.read_csv(self.path, chunksize=self.chunk_rows):
+            if self._filter is not None:
+                chunk = chunk[chunk['Symbol'].isin(self._filter)]
+            stamps = pd.to_datetime(chunk['Timestamp'], utc=True)
+            for ts, symbol, price in zip(stamps, chunk['Symbol'], chunk['Price'].astype(float)):
+                yield Tick(ts, symbol, price)
+
+
+def record_ticks(ticks, path):
+    """Write an iterable of ticks as a replay file for ReplayTickSource."""
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    df = pd.DataFrame(list(ticks), columns=TICK_COLUMNS)
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'], utc=True).dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    df.to_csv(path, index=False)
+    print(f"[💾] Recorded {len(df)} ticks to: {path}")
+    return path
+
+
+class BarAggregator:
+    """
+    Incremental OHLC bars for every symbol and interval. A tick costs O(1) per interval:
+    it only touches that symbol's open/high/low/close slot. Buckets are aligned across the
+    universe, so when the first tick of a new bucket arrives the previous bucket is emitted
+    as one Bar to every hook registered for that interval.
+    """
+
+    def __init__(self, symbols: list, intervals=tuple(BAR_INTERVALS)):
+        self.symbols = list(symbols)
+        self.intervals = list(intervals)
+        self.widths = np.array([BAR_INTERVALS[i] * 10**9 for i in self.intervals], dtype=np.int64)
+        shape = (len(self.intervals), len(self.symbols))
+        self.open = np.full(shape, np.nan)
+        self.high = np.full(shape, np.nan)
+        self.low = np.full(shape, np.nan)
+        self.close = np.full(shape, np.nan)
+        self.bucket = np.full(len(self.intervals), np.iinfo(np.int64).min, dtype=np.int64)
+        self.late_ticks = 0
+        self.n_ticks = 0
+        self._symbol_pos = {s: i for i, s in enumerate(self.symbols)}
+        self._hooks = {interval: [] for interval in self.intervals}
+
+    def add_hook(self, hook, intervals=None):
+        """Call hook(bar) for each completed bar of the given intervals (default: all)."""
+        for interval in intervals or self.intervals:
+            self._hooks[interval].append(hook)
+        return hook
+
+    def on_tick(self, tick: Tick):
+        pos = self._symbol_pos.get(tick.symbol)
+        if pos is None:
+            return
+        ts = tick.timestamp.value
+        self.n_ticks += 1
+        for k in range(len(self.intervals)):
+            bucket = ts - ts % self.widths[k]
+            if bucket != self.bucket[k]:
+                if bucket < self.bucket[k]:
+                    # Tick belongs to a bar already emitted
+                    self.late_ticks += 1
+                    continue
+                self._emit(k)
+                self.bucket[k] = bucket
+            price = tick.price
+            if self.open[k, pos] != self.open[k, pos]:  # NaN: first tick of this bar
+                self.open[k, pos] = self.high[k, pos] = self.low[k, pos] = price
+            else:
+                if price > self.high[k, pos]:
+                    self.high[k, pos] = price
+                if price < self.low[k, pos]:
+                    self.low[k, pos] = price
+            self.close[k, pos] = price
+
+    def flush(self):
+        """Emit every in-progress bar (e.g. at the end of a replay)."""
+        for k in range(len(self.intervals)):
+            self._emit(k)
+            self.bucket[k] = np.iinfo(np.int64).min
+
+    def _emit(self, k: int):
+        if self.bucket[k] == np.iinfo(np.int64).min or np.isnan(self.close[k]).all():
+            return
+        bar = Bar(self.intervals[k], pd.Timestamp(int(self.bucket[k]), tz='UTC'), self.symbols,
+                  self.open[k].copy(), self.high[k].copy(), self.low[k].copy(), self.close[k].copy())
+        for field in (self.open, self.high, self.low, self.close):
+            field[k] = np.nan
+        for hook in self._hooks[self.intervals[k]]:
+            hook(bar)
+
+
+def run_ticks(source, aggregator: BarAggregator, max_ticks: int = None, flush: bool = True) -> int:
+    """Pump ticks from a source into the aggregator; returns how many were consumed."""
+    count = 0
+    for tick in source:
+        if max_ticks is not None and count >= max_ticks:
+            break
+        aggregator.on_tick(tick)
+        count += 1
+    if flush:
+        aggregator.flush()
+    return count
@@ -57,6 +57,14 @@ def safe_import_fx_correlation():
         st.info(f"FX correlation not available: {e}")
         return None, str(e)
 
+def safe_import_replay():
+    try:
+        from viz.replay import replay_sidebar
+        return replay_sidebar, None
+    except Exception as e:
+        st.info(f"Replay mode not available: {e}")
+        return None, str(e)
+
 # Import functions safely
 home_func, home_error = safe_import()
 fx_heatmap_func, fx_error = safe_import_fx_heatmap()
@@ -64,6 +72,7 @@ zone_locator_func, zl_error = safe_import_zone_locator()
 zone_transitions_func, zt_error = safe_import_zone_transitions()
 strength_meter_func, sm_error = safe_import_strength_meter()
 fx_correlation_func, fc_error = safe_import_fx_correlation()
+replay_sidebar_func, rp_error = safe_import_replay()
 
 # Placeholder functions for missing components
 def placeholder_strength_meter():
@@ -143,6 +152,8 @@ if any([home_error, fx_error, zl_error, zt_error]):
 
 # Navigation
 selected_tab = st.sidebar.selectbox("🧭 Navigate", list(TABS.keys()))
+if replay_sidebar_func:
+    replay_sidebar_func()
 
 # Route to selected function
 try:
@@ -2,14 +2,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from itertools import combinations
 
+from data.price_panel import refresh_panel
+from viz.replay import replay_time
+
 # === CONFIG (Same as your other tools) ===
 CURRENCY_LIST = ['USD','CAD', 'EUR', 'GBP', 'CHF', 'NOK', 'SGD','JPY', 'AUD', 'NZD']
+PANEL_NAME = "fx_correlation_daily"
+PANEL_PERIOD = "6mo"  # covers the longest selectable window (90 days)
+PANEL_MAX_AGE_SECONDS = 15 * 60
 
 def generate_major_pairs():
     """Generate list of major FX pairs that actually exist in YFinance"""
@@ -31,116 +36,58 @@ def generate_major_pairs():
     
     return major_pairs
 
-def get_historical_data(ticker, days=30):
-    """Get historical price data for correlation calculation"""
-    try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        data = yf.download(
-            ticker, 
-            start=start_date, 
-            end=end_date, 
-            interval="1d", 
-            progress=False, 
-            auto_adjust=False
-        )
-        
-        if len(data) < 5:  # Need minimum data points
-            return None
-            
-        # Calculate daily returns (percentage change)
-        # Ensure we get a proper Series, not DataFrame
-        close_prices = data['Close']
-        if isinstance(close_prices, pd.DataFrame):
-            close_prices = close_prices.iloc[:, 0]  # Get first column if DataFrame
-        
-        returns = close_prices.pct_change().dropna()
-        
-        # Verify we have a proper Series
-        if isinstance(returns, pd.DataFrame):
-            returns = returns.iloc[:, 0]  # Convert to Series if still DataFrame
-            
-        return returns
-        
-    except Exception as e:
-        print(f"[⚠️] Error fetching {ticker}: {e}")
-        return None
+def get_returns_panel(pairs, force_refresh=False):
+    """Shared daily panel for all pairs (one download, published once for every worker/session)"""
+    return refresh_panel(
+        PANEL_NAME, pairs, period=PANEL_PERIOD, interval="1d",
+        max_age_seconds=PANEL_MAX_AGE_SECONDS, force=force_refresh, as_of=replay_time()
+    )
 
-def calculate_correlation_matrix(pairs, time_period=30):
+def calculate_correlation_matrix(pairs, time_period=30, force_refresh=False):
     """Calculate correlation matrix for all FX pairs"""
     
-    # Progress tracking
-    progress_bar = st.progress(0)
     status_text = st.empty()
+    status_text.text("📊 Loading shared price panel...")
     
-    # Dictionary to store returns data
-    returns_data = {}
-    failed_pairs = []
+    panel = get_returns_panel(pairs, force_refresh)
+    if panel is None or panel.index.empty:
+        status_text.empty()
+        st.error("❌ No price data available")
+        return None, None
     
-    status_text.text("📊 Fetching historical data...")
+    # Zero-copy view of the shared returns, then only the requested window is touched
+    returns_df = panel.frame('Return', pairs)
+    cutoff = returns_df.index[-1] - timedelta(days=time_period)
+    returns_df = returns_df[returns_df.index >= cutoff]
+    returns_df.columns = [pair.replace('=X', '') for pair in returns_df.columns]
     
-    # Fetch data for all pairs
-    for i, pair in enumerate(pairs):
-        pair_name = pair.replace('=X', '')
-        status_text.text(f"Fetching {pair_name}...")
-        
-        returns = get_historical_data(pair, time_period)
-        if returns is not None and len(returns) >= 5:  # Need minimum 5 data points
-            returns_data[pair_name] = returns
-            print(f"✅ {pair_name}: {len(returns)} data points")
-        else:
-            failed_pairs.append(pair_name)
-            print(f"❌ {pair_name}: Failed or insufficient data")
-            
-        progress_bar.progress((i + 1) / len(pairs))
-    
-    # Clear progress indicators
-    progress_bar.empty()
+    # Need minimum 5 data points per pair
+    valid_counts = returns_df.count()
+    failed_pairs = list(valid_counts[valid_counts < 5].index)
+    failed_pairs += [pair.replace('=X', '') for pair in pairs if pair not in panel.symbols]
+    returns_df = returns_df.loc[:, valid_counts >= 5]
     
-    # Debug info
-    st.write(f"**Debug:** Successfully fetched {len(returns_data)} pairs, {len(failed_pairs)} failed")
+    st.write(f"**Debug:** Successfully loaded {returns_df.shape[1]} pairs, {len(failed_pairs)} failed")
     if failed_pairs:
         st.write(f"**Failed pairs:** {', '.join(failed_pairs[:5])}")
     
-    if len(returns_data) < 2:
+    if returns_df.shape[1] < 2:
+        status_text.empty()
         st.error("❌ Need at least 2 currency pairs with valid data")
         return None, None
     
     status_text.text("🧮 Calculating correlations...")
     
-    # Find common date range across all pairs
-    common_dates = None
-    for pair_name, returns in returns_data.items():
-        if common_dates is None:
-            common_dates = returns.index
-        else:
-            common_dates = common_dates.intersection(returns.index)
-    
-    st.write(f"**Debug:** Found {len(common_dates)} common trading days")
+    # Align all returns to common dates
+    returns_df = returns_df.dropna()
+    st.write(f"**Debug:** Found {len(returns_df)} common trading days")
     
-    if len(common_dates) < 5:
+    if len(returns_df) < 5:
+        status_text.empty()
         st.error("❌ Not enough common trading days across pairs")
         return None, None
     
-    # Align all returns to common dates and verify data structure
-    aligned_returns = {}
-    for pair_name, returns in returns_data.items():
-        aligned_data = returns.loc[common_dates]
-        if len(aligned_data) > 0 and not aligned_data.empty:
-            aligned_returns[pair_name] = aligned_data
-        
-    st.write(f"**Debug:** {len(aligned_returns)} pairs aligned successfully")
-    
-    if len(aligned_returns) < 2:
-        st.error("❌ Not enough pairs after alignment")
-        return None, None
-    
-    # Create DataFrame with explicit index
     try:
-        returns_df = pd.DataFrame(aligned_returns, index=common_dates)
-        st.write(f"**Debug:** DataFrame created: {returns_df.shape}")
-        
         # Calculate correlation matrix
         correlation_matrix = returns_df.corr()
         
@@ -337,27 +284,18 @@ def fx_correlation():
     # Generate pairs list
     pairs_list = generate_major_pairs()
     
-    # Cache key based on time period
-    cache_key = f'correlation_cache_{time_period}d'
-    timestamp_key = f'correlation_timestamp_{time_period}d'
+    # Correlations are recomputed from the shared panel; no per-session price copies
+    with st.spinner("Analyzing currency pair relationships..."):
+        correlation_matrix, summary_stats = calculate_correlation_matrix(
+            pairs_list, time_period, force_refresh=refresh_data
+        )
+    
+    if correlation_matrix is None:
+        st.error("❌ Could not calculate correlations - insufficient data")
+        return
     
-    # Generate or use cached data
-    if refresh_data or cache_key not in st.session_state:
-        st.info(f"🚀 Calculating {time_period}-day correlations...")
-        
-        with st.spinner("Analyzing currency pair relationships..."):
-            correlation_matrix, summary_stats = calculate_correlation_matrix(pairs_list, time_period)
-            
-            if correlation_matrix is not None:
-                st.session_state[cache_key] = (correlation_matrix, summary_stats)
-                st.session_state[timestamp_key] = datetime.now()
-            else:
-                st.error("❌ Could not calculate correlations - insufficient data")
-                return
-    else:
-        correlation_matrix, summary_stats = st.session_state[cache_key]
-        cache_time = st.session_state.get(timestamp_key, datetime.now())
-        st.caption(f"📋 Cached data from: {cache_time.strftime('%H:%M:%S')}")
+    panel = get_returns_panel(pairs_list)
+    st.caption(f"📋 Shared price panel from: {datetime.fromtimestamp(panel.created).strftime('%H:%M:%S')}")
     
     # Display results
     if correlation_matrix is not None:
@@ -3,63 +3,79 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timezone
 import plotly.express as px
 import plotly.graph_objects as go
 
+from core.currency_strength import all_pairs
+from data.price_panel import refresh_panel
+from viz.replay import replay_time
+
 # === CONFIG ===
 CURRENCY_LIST = ['USD','CAD', 'EUR', 'GBP', 'CHF','SGD','JPY', 'AUD', 'NZD']
+PAIR_LIST = all_pairs(CURRENCY_LIST)
+PANEL_NAME = "fx_heatmap_daily"
+PANEL_PERIOD = "2y"  # covers YTD and the longest rolling horizon
+PANEL_MAX_AGE_SECONDS = 15 * 60
+# label -> lookback (None = today's open to close, "ytd" = since last close of previous year)
+HEATMAP_HORIZONS = {
+    "1D": None,
+    "1W": pd.DateOffset(weeks=1),
+    "1M": pd.DateOffset(months=1),
+    "YTD": "ytd",
+}
 
-def get_daily_pct_change(ticker):
-    """Get daily percentage change for a currency pair"""
-    try:
-        data = yf.download(ticker, period="2d", interval="1d", progress=False, auto_adjust=False)
-        if len(data) < 2:
-            return None
-        open_val = data['Open'].iloc[-1].item()
-        close_val = data['Close'].iloc[-1].item()
-        return (close_val - open_val) / open_val * 100
-    except Exception as e:
-        print(f"[⚠️] Error fetching {ticker}: {e}")
-        return None
+def get_heatmap_panel(force_refresh=False):
+    """Shared daily OHLC panel for every pair (one download serves all horizons), as of the replay clock"""
+    return refresh_panel(
+        PANEL_NAME, PAIR_LIST, period=PANEL_PERIOD, interval="1d",
+        max_age_seconds=PANEL_MAX_AGE_SECONDS, force=force_refresh, as_of=replay_time()
+    )
 
-def generate_live_heatmap():
-    """Generate live FX percentage change heatmap"""
-    matrix = pd.DataFrame(index=CURRENCY_LIST, columns=CURRENCY_LIST, dtype=float)
-    
-    # Progress bar for data fetching
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    total_pairs = len(CURRENCY_LIST) * (len(CURRENCY_LIST) - 1)
-    current_pair = 0
-    
-    for base in CURRENCY_LIST:
-        for quote in CURRENCY_LIST:
-            if base == quote:
-                matrix.at[base, quote] = 0.0  # Same currency = 0%
-                continue
-                
-            pair = f"{base}{quote}=X"
-            status_text.text(f"Fetching {pair}...")
-            
-            pct_change = get_daily_pct_change(pair)
-            if pct_change is not None:
-                matrix.at[base, quote] = round(pct_change, 2)
+def horizon_pct_changes(open_df, close_df, horizons=HEATMAP_HORIZONS):
+    """
+    % change of every pair for every horizon, as a (horizon x pair) frame.
+    Reference rows are found with one searchsorted per horizon on the shared index.
+    """
+    if close_df.empty:
+        return pd.DataFrame(columns=close_df.columns, dtype=np.float64)
+    close = close_df.ffill().to_numpy(dtype=np.float64)
+    open_ = open_df.ffill().to_numpy(dtype=np.float64)
+    index = close_df.index
+    last = close[-1]
+
+    rows = []
+    for lookback in horizons.values():
+        if lookback is None:
+            ref = open_[-1]
+        else:
+            if lookback == "ytd":
+                cutoff = pd.Timestamp(year=index[-1].year, month=1, day=1, tz=index.tz)
+                pos = index.searchsorted(cutoff, side="left") - 1
             else:
-                matrix.at[base, quote] = np.nan
-                
-            current_pair += 1
-            progress_bar.progress(current_pair / total_pairs)
-    
-    # Clear progress indicators
-    progress_bar.empty()
-    status_text.empty()
+                pos = index.searchsorted(index[-1] - lookback, side="right") - 1
+            ref = close[pos] if pos >= 0 else np.full_like(last, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rows.append((last - ref) / ref * 100)
+    return pd.DataFrame(rows, index=list(horizons), columns=close_df.columns)
+
+def to_heatmap_matrix(changes):
+    """Base x quote matrix from one row of pair changes (diagonal = 0%)"""
+    grid = np.array([[f"{base}{quote}=X" for quote in CURRENCY_LIST] for base in CURRENCY_LIST])
+    values = changes.reindex(grid.ravel()).to_numpy(dtype=np.float64, copy=True).reshape(grid.shape)
+    np.fill_diagonal(values, 0.0)
+    return pd.DataFrame(np.round(values, 2), index=CURRENCY_LIST, columns=CURRENCY_LIST)
+
+def generate_heatmaps(force_refresh=False):
+    """Heatmap matrices for every horizon from the shared daily panel"""
+    panel = get_heatmap_panel(force_refresh)
+    if panel is None:
+        return {}, None
     
-    return matrix
+    changes = horizon_pct_changes(panel.frame('Open', PAIR_LIST), panel.frame('Close', PAIR_LIST))
+    return {horizon: to_heatmap_matrix(changes.loc[horizon]) for horizon in changes.index}, panel
 
-def create_beautiful_heatmap(matrix):
+def create_beautiful_heatmap(matrix, horizon="1D"):
     """Create a beautiful plotly heatmap with your preferred styling"""
     
     # Create custom colorscale (Green -> Yellow -> Red)
@@ -84,7 +100,7 @@ def create_beautiful_heatmap(matrix):
     
     fig.update_layout(
     title={
-        'text': f"FX Daily % Change Heatmap - {datetime.now().strftime('%Y-%m-%d')}",
+        'text': f"FX {horizon} % Change Heatmap - {datetime.now().strftime('%Y-%m-%d')}",
         'x': 0.5,
         'y': 0.95,  # Move title up slightly
         'font': {'size': 18, 'color': 'white', 'family': 'Arial Black'}
@@ -117,7 +133,7 @@ def create_beautiful_heatmap(matrix):
     return fig
 
 def fx_heatmap():
-    st.title("📊 FX Daily % Change Heatmap")
+    st.title("📊 FX % Change Heatmap")
     
     # Add refresh button and info
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -125,25 +141,28 @@ def fx_heatmap():
     with col1:
         refresh_data = st.button("🔄 Refresh Live Data", help="Fetch latest FX data")
     
+    with col2:
+        horizon = st.radio(
+            "⏱️ Horizon",
+            list(HEATMAP_HORIZONS),
+            horizontal=True,
+            help="All horizons are computed together from one daily panel"
+        )
+    
     with col3:
         st.info(f"🕐 {datetime.now().strftime('%H:%M UTC')}")
     
-    # Generate or use cached data
-    if refresh_data or 'fx_heatmap_cache' not in st.session_state:
-        st.info("🚀 Fetching live FX data...")
-        
-        with st.spinner("Loading currency data..."):
-            matrix = generate_live_heatmap()
-            st.session_state.fx_heatmap_cache = matrix
-            st.session_state.heatmap_timestamp = datetime.now()
-    else:
-        matrix = st.session_state.fx_heatmap_cache
-        cache_time = st.session_state.get('heatmap_timestamp', datetime.now())
-        st.caption(f"📋 Cached data from: {cache_time.strftime('%H:%M:%S')}")
+    with st.spinner("Loading currency data..."):
+        heatmaps, panel = generate_heatmaps(force_refresh=refresh_data)
+    
+    if panel is not None:
+        st.caption(f"📋 Shared price panel from: {datetime.fromtimestamp(panel.created).strftime('%H:%M:%S')}")
+    
+    matrix = heatmaps.get(horizon, pd.DataFrame())
     
     # Create and display beautiful heatmap
     if not matrix.empty:
-        fig = create_beautiful_heatmap(matrix)
+        fig = create_beautiful_heatmap(matrix, horizon)
         st.plotly_chart(fig, use_container_width=True)
         
         # Summary stats
@@ -174,7 +193,7 @@ def fx_heatmap():
             st.download_button(
                 "📥 Download CSV",
                 csv_data,
-                file_name=f"fx_heatmap_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                file_name=f"fx_heatmap_{horizon}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                 mime="text/csv"
             )
         
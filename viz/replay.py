@@ -0,0 +1,89 @@
+# viz/replay.py
+import streamlit as st
+import pandas as pd
+
+from core.replay import REPLAY_SPEEDS, ReplayClock, ReplaySession, verify_transitions
+from core.zone_stats import HISTORY_PANEL, get_history_panel
+from data.price_panel import open_panel
+
+# === CONFIG ===
+REPLAY_REFRESH_SECONDS = 2
+DEFAULT_REPLAY_DAYS = 7
+
+
+def active_replay():
+    """This session's ReplaySession, advanced to its clock time; None when replay is off"""
+    session = st.session_state.get('replay_session')
+    if session is not None:
+        session.advance()
+    return session
+
+
+def replay_time():
+    """This session's replay clock time, to pass as as_of to the panel loaders; None when live"""
+    session = st.session_state.get('replay_session')
+    return session.clock.now() if session is not None else None
+
+
+def start_replay(start, end, speed):
+    """Turn on replay for this browser session only; other sessions keep reading live panels"""
+    clock = ReplayClock(start, end, speed)
+    st.session_state.replay_session = ReplaySession(clock, get_history_panel())
+
+
+def stop_replay():
+    st.session_state.pop('replay_session', None)
+    st.session_state.pop('replay_row', None)
+
+
+@st.fragment(run_every=REPLAY_REFRESH_SECONDS)
+def replay_ticker():
+    """Reruns the app while this session's replay clock moves, so every page follows it"""
+    session = active_replay()
+    if session is None:
+        return
+    clock = session.clock
+    st.caption(f"⏱️ {clock.now().strftime('%Y-%m-%d %H:%M')} UTC · {len(session.transitions())} transitions")
+    if not clock.paused and st.session_state.get('replay_row') != session.next_row:
+        st.rerun(scope="app")
+
+
+def replay_sidebar():
+    """Replay controls: pick a stored date range and speed; pages then read the replay clock"""
+    with st.sidebar.expander("⏪ Replay Mode", expanded=active_replay() is not None):
+        session = active_replay()
+        if session is None:
+            panel = open_panel(HISTORY_PANEL)
+            if panel is None or len(panel.index) < 2:
+                st.info("ℹ️ No stored hourly history to replay")
+                return
+            first, last = panel.index[0].date(), panel.index[-1].date()
+            default_start = max(first, (panel.index[-1] - pd.Timedelta(days=DEFAULT_REPLAY_DAYS)).date())
+            dates = st.date_input("📅 Date range", (default_start, last), min_value=first, max_value=last)
+            speed = st.select_slider("⏩ Speed", list(REPLAY_SPEEDS), value="100x")
+            if st.button("▶️ Start Replay") and len(dates) == 2:
+                start_replay(pd.Timestamp(dates[0]), pd.Timestamp(dates[1]) + pd.Timedelta(days=1), REPLAY_SPEEDS[speed])
+                st.rerun()
+            return
+
+        clock = session.clock
+        st.session_state.replay_row = session.next_row
+        st.progress(min(1.0, (clock.now() - clock.start) / (clock.end - clock.start)))
+        replay_ticker()
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("▶️ Resume" if clock.paused else "⏸️ Pause"):
+                clock.resume() if clock.paused else clock.pause()
+                st.rerun()
+        with col2:
+            if st.button("⏹️ Stop"):
+                stop_replay()
+                st.rerun()
+
+        if session.done:
+            matches, mismatched = verify_transitions(session)
+            if matches:
+                st.success("✅ Replayed transitions match the batch computation")
+            else:
+                st.error(f"❌ {len(mismatched)} transitions differ from the batch computation")
@@ -3,80 +3,60 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timezone
 import plotly.express as px
 import plotly.graph_objects as go
 
+from core.currency_strength import (
+    CURRENCY_LIST, STRENGTH_HORIZONS, StrengthHistory, all_pairs, multi_horizon_strength,
+    least_squares_multi_horizon, least_squares_strength_series
+)
+from data.price_panel import refresh_panel
+from viz.replay import replay_time
+
 # === CONFIG (Same as your heatmap) ===
-CURRENCY_LIST = ['USD','CAD', 'EUR', 'GBP', 'CHF', 'NOK', 'SGD','JPY', 'AUD', 'NZD']
+PAIR_LIST = all_pairs(CURRENCY_LIST)
+PANEL_NAME = "strength_hourly"
+PANEL_PERIOD = "3mo"  # covers the longest horizon (1 month)
+PANEL_MAX_AGE_SECONDS = 5 * 60
+ESTIMATORS = {"Pair Average": "average", "Least Squares": "least_squares"}
+NORMALIZATIONS = {"Basket (mean = 0)": "basket", "USD = 0": "USD"}
 
-def get_daily_pct_change(ticker):
-    """Get daily percentage change for a currency pair (same as heatmap)"""
-    try:
-        data = yf.download(ticker, period="2d", interval="1d", progress=False, auto_adjust=False)
-        if len(data) < 2:
-            return None
-        open_val = data['Open'].iloc[-1].item()
-        close_val = data['Close'].iloc[-1].item()
-        return (close_val - open_val) / open_val * 100
-    except Exception as e:
-        print(f"[⚠️] Error fetching {ticker}: {e}")
-        return None
+def get_strength_panel(force_refresh=False):
+    """Shared hourly OHLC panel for every pair (one download serves all horizons), as of the replay clock"""
+    return refresh_panel(
+        PANEL_NAME, PAIR_LIST, period=PANEL_PERIOD, interval="1h",
+        max_age_seconds=PANEL_MAX_AGE_SECONDS, force=force_refresh, as_of=replay_time()
+    )
 
-def calculate_currency_strength():
-    """Calculate individual currency strength by averaging against all pairs"""
-    
-    # Dictionary to store each currency's performance against others
-    currency_scores = {currency: [] for currency in CURRENCY_LIST}
-    
-    # Progress bar for data fetching
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    total_pairs = len(CURRENCY_LIST) * (len(CURRENCY_LIST) - 1)
-    current_pair = 0
-    
-    for base in CURRENCY_LIST:
-        for quote in CURRENCY_LIST:
-            if base == quote:
-                continue  # Skip same currency pairs
-                
-            pair = f"{base}{quote}=X"
-            status_text.text(f"Analyzing {pair}...")
-            
-            pct_change = get_daily_pct_change(pair)
-            
-            if pct_change is not None:
-                # Base currency gains strength when pair goes UP
-                currency_scores[base].append(pct_change)
-                # Quote currency gains strength when pair goes DOWN
-                currency_scores[quote].append(-pct_change)
-            
-            current_pair += 1
-            progress_bar.progress(current_pair / total_pairs)
-    
-    # Clear progress indicators
-    progress_bar.empty()
-    status_text.empty()
+@st.cache_resource
+def get_strength_history():
+    """Process-wide strength history, extended with new bars instead of recomputed"""
+    return StrengthHistory(PAIR_LIST, CURRENCY_LIST)
+
+def calculate_currency_strength(force_refresh=False, estimator="average", normalize="basket"):
+    """Calculate currency strength for every horizon from the shared hourly panel"""
+    panel = get_strength_panel(force_refresh)
+    if panel is None or panel.index.empty:
+        return {}, None
     
-    # Calculate average strength for each currency
-    strength_data = []
-    for currency, scores in currency_scores.items():
-        if scores:  # Only if we have data
-            avg_strength = np.mean(scores)
-            strength_data.append({
-                'Currency': currency,
-                'Strength_Score': round(avg_strength, 3),
-                'Data_Points': len(scores)
-            })
+    close_df = panel.frame('Close', PAIR_LIST)
+    if estimator == "least_squares":
+        strength_by_horizon = least_squares_multi_horizon(close_df, CURRENCY_LIST, normalize=normalize)
+    else:
+        strength_by_horizon = multi_horizon_strength(close_df, CURRENCY_LIST)
     
-    # Convert to DataFrame and sort by strength
-    df = pd.DataFrame(strength_data)
-    df = df.sort_values('Strength_Score', ascending=False).reset_index(drop=True)
-    df['Rank'] = df.index + 1
+    history = get_strength_history()
+    history.update(close_df)
     
-    return df
+    return strength_by_horizon, panel
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_least_squares_history(_panel, panel_version, normalize="basket"):
+    """Cumulative least-squares strength over the whole panel (one batched solve, cached per panel version)"""
+    close_df = _panel.frame('Close', PAIR_LIST)
+    per_bar = least_squares_strength_series(close_df, periods=1, currencies=CURRENCY_LIST, normalize=normalize)
+    return per_bar.fillna(0).cumsum()
 
 def create_strength_chart(df):
     """Create beautiful strength meter visualization"""
@@ -164,6 +144,36 @@ def create_strength_table(df):
     
     return display_df
 
+def create_strength_history_chart(history_df):
+    """Line chart of cumulative currency strength over time"""
+    fig = go.Figure()
+    for currency in history_df.columns:
+        fig.add_trace(go.Scatter(
+            x=history_df.index,
+            y=history_df[currency],
+            mode='lines',
+            name=currency,
+            hovertemplate=f'<b>{currency}</b><br>%{{x}}<br>Cumulative: %{{y:.2f}}%<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title={
+            'text': "📈 Historical Strength Trends",
+            'x': 0.5,
+            'font': {'size': 18, 'color': 'white', 'family': 'Arial Black'}
+        },
+        xaxis_title="Date",
+        yaxis_title="Cumulative Strength (%)",
+        font=dict(size=12, color='white'),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=500,
+        hovermode='x unified'
+    )
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.7)
+    
+    return fig
+
 def strength_meter():
     st.title("💪 Currency Strength Meter")
     
@@ -172,22 +182,37 @@ def strength_meter():
     
     with col1:
         refresh_data = st.button("🔄 Refresh Live Data", help="Calculate latest currency strength")
+        estimator_label = st.selectbox(
+            "🧮 Estimator",
+            list(ESTIMATORS),
+            help="Least Squares fits one strength factor per currency to all crosses at once"
+        )
+        estimator = ESTIMATORS[estimator_label]
+        normalize = "basket"
+        if estimator == "least_squares":
+            normalize = NORMALIZATIONS[st.selectbox("⚖️ Normalization", list(NORMALIZATIONS))]
+    
+    with col2:
+        horizon = st.radio(
+            "⏱️ Horizon",
+            list(STRENGTH_HORIZONS),
+            index=list(STRENGTH_HORIZONS).index("1d"),
+            horizontal=True,
+            help="All horizons are computed together from one hourly panel"
+        )
     
     with col3:
         st.info(f"🕐 {datetime.now().strftime('%H:%M UTC')}")
     
-    # Generate or use cached data
-    if refresh_data or 'strength_meter_cache' not in st.session_state:
-        st.info("🚀 Calculating currency strength...")
-        
-        with st.spinner("Analyzing currency pairs..."):
-            strength_df = calculate_currency_strength()
-            st.session_state.strength_meter_cache = strength_df
-            st.session_state.strength_timestamp = datetime.now()
-    else:
-        strength_df = st.session_state.strength_meter_cache
-        cache_time = st.session_state.get('strength_timestamp', datetime.now())
-        st.caption(f"📋 Cached data from: {cache_time.strftime('%H:%M:%S')}")
+    with st.spinner("Analyzing currency pairs..."):
+        strength_by_horizon, panel = calculate_currency_strength(
+            force_refresh=refresh_data, estimator=estimator, normalize=normalize
+        )
+    
+    if panel is not None:
+        st.caption(f"📋 Shared price panel from: {datetime.fromtimestamp(panel.created).strftime('%H:%M:%S')}")
+    
+    strength_df = strength_by_horizon.get(horizon, pd.DataFrame())
     
     # Display results
     if not strength_df.empty:
@@ -253,6 +278,16 @@ def strength_meter():
             strength_range = strength_df['Strength_Score'].max() - strength_df['Strength_Score'].min()
             st.metric("📏 Range", f"{strength_range:.2f}%")
         
+        # Historical strength trends
+        if estimator == "least_squares":
+            history_df = get_least_squares_history(panel, panel.version, normalize)
+        else:
+            history_df = get_strength_history().frame()
+            if replay_time() is not None:
+                history_df = history_df[history_df.index <= panel.index[-1]]
+        if not history_df.empty:
+            st.plotly_chart(create_strength_history_chart(history_df), use_container_width=True)
+        
         # Export functionality
         st.subheader("💾 Export Data")
         col1, col2 = st.columns(2)
@@ -262,7 +297,7 @@ def strength_meter():
             st.download_button(
                 "📥 Download CSV",
                 csv_data,
-                file_name=f"currency_strength_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                file_name=f"currency_strength_{estimator}_{horizon}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                 mime="text/csv"
             )
         
@@ -285,5 +320,8 @@ def strength_meter():
     **📊 Calculation Method:**
     - For each currency pair (e.g., EURUSD), if EUR goes up, EUR gets +points and USD gets -points
     - Each currency's final score is the average of all its pair performances
-    - Rankings show relative strength in the current market session
+    - Horizons (1h to 1m) measure each pair's change back from the latest hourly bar
+    - Historical trends accumulate the same per-bar scores over the whole panel
+    - **Least Squares** instead solves return(pair) = strength(base) - strength(quote) across every
+      available cross at once (log returns), normalized to a zero-mean basket or to USD = 0
     """)
\ No newline at end of file
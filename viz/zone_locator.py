@@ -2,78 +2,170 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import yfinance as yf
 from datetime import datetime, timedelta
-import sys
-import os
 
-# Import your existing zone locator function
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
-from zone_locator import generate_current_zone_snapshot, TICKER_LIST, ZONE_DEFINITIONS
+from core.zone_locator import generate_current_zone_snapshot, levels_version, TICKER_LIST, ZONE_COLORS, ZONE_DEFINITIONS
+from core.zone_bands import attach_zone_bands
+from core.zone_stats import get_history_panel, get_zone_dwell_stats
+from core.level_proximity import scan_level_touches
+from core.zone_probabilities import get_reach_model
+from core.zone_scanner import near_boundary_watchlist, WATCHLIST_SIZE
+from viz.replay import active_replay, replay_time
+from core.report_store import get_report_store
+from core.downsample import downsample_ohlc, downsample_line, MAX_CHART_POINTS
 
-def zone_locator():
-    # Custom CSS for enhanced styling
-    st.markdown("""
-    <style>
-    .zone-header {
-        background: linear-gradient(90deg, #1e40af 0%, #3b82f6 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        text-align: center;
-    }
-    
-    .zone-card {
-        background: linear-gradient(145deg, #f8fafc 0%, #e2e8f0 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        margin: 1rem 0;
-        border-left: 5px solid;
-        color: #374151;
-    }
-    
-    .zone-reset { border-left-color: #A9A9A9; background: linear-gradient(145deg, #f8fafc 0%, #f1f5f9 100%); }
-    .zone-clearance { border-left-color: #FF5555; background: linear-gradient(145deg, #fef2f2 0%, #fecaca 100%); }
-    .zone-discount { border-left-color: #FF9999; background: linear-gradient(145deg, #fff5f5 0%, #fed7d7 100%); }
-    .zone-budget { border-left-color: #ADD8E6; background: linear-gradient(145deg, #eff6ff 0%, #dbeafe 100%); }
-    .zone-fair { border-left-color: #90EE90; background: linear-gradient(145deg, #f0fdf4 0%, #dcfce7 100%); }
-    .zone-plus { border-left-color: #FFA500; background: linear-gradient(145deg, #fffbeb 0%, #fed7aa 100%); }
-    .zone-premium { border-left-color: #FFD700; background: linear-gradient(145deg, #fefce8 0%, #fef08a 100%); }
-    .zone-premium-plus { border-left-color: #DA70D6; background: linear-gradient(145deg, #faf5ff 0%, #e9d5ff 100%); }
-    
-    .metric-box {
-        background: linear-gradient(145deg, #f8fafc 0%, #e2e8f0 100%);
-        padding: 1rem;
-        border-radius: 8px;
-        text-align: center;
-        margin: 0.5rem 0;
-        border: 2px solid #e2e8f0;
-    }
-    
-    .zone-legend {
-        background: linear-gradient(145deg, #f0f9ff 0%, #e0f2fe 100%);
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        color: #374151;
+# === CONFIG ===
+PERIOD_MAP = {
+    "1 Month": "1mo",
+    "3 Months": "3mo",
+    "6 Months": "6mo",
+    "1 Year": "1y"
+}
+INTERVAL_MAP = {"Daily": "1d", "Hourly": "1h"}
+CHART_CACHE_SECONDS = 5 * 60
+
+ZONE_INFO = {
+    'Premium+': {'color': '#DA70D6', 'desc': 'Extreme highs, very expensive'},
+    'Premium': {'color': '#FFD700', 'desc': 'Historical highs, expensive'},
+    'Plus+': {'color': '#FFA500', 'desc': 'Above fair value'},
+    'Fair': {'color': '#90EE90', 'desc': 'Balanced pricing'},
+    'Budget': {'color': '#ADD8E6', 'desc': 'Good value territory'},
+    'Discount': {'color': '#FF9999', 'desc': 'Below fair value'},
+    'Clearance': {'color': '#FF5555', 'desc': 'Very cheap levels'},
+    'Reset': {'color': '#A9A9A9', 'desc': 'Historical lows, extreme'}
+}
+
+ZONE_CLASSES = {
+    'Premium+': 'zone-premium-plus',
+    'Premium': 'zone-premium',
+    'Plus+': 'zone-plus',
+    'Fair': 'zone-fair',
+    'Budget': 'zone-budget',
+    'Discount': 'zone-discount',
+    'Clearance': 'zone-clearance',
+    'Reset': 'zone-reset'
+}
+
+ZONE_INTERPRETATIONS = {
+    'Reset': {
+        'emoji': '⚪',
+        'title': 'RESET Zone - Extreme Oversold',
+        'description': 'This currency pair is at historical lows. Maximum risk/reward potential.',
+        'strategy': 'Consider: Contrarian plays, small position sizing, wait for confirmation',
+        'risk': 'Very High - New lows possible, fundamental deterioration likely'
+    },
+    'Clearance': {
+        'emoji': '🔴',
+        'title': 'CLEARANCE Zone - Very Cheap',
+        'description': 'Significantly below normal levels. Strong oversold conditions.',
+        'strategy': 'Consider: Value plays, gradual accumulation, support levels',
+        'risk': 'High - Further decline possible, but good risk/reward'
+    },
+    'Discount': {
+        'emoji': '🟡',
+        'title': 'DISCOUNT Zone - Below Fair Value',
+        'description': 'Trading below historical average. Good value territory.',
+        'strategy': 'Consider: Buying opportunities, normal position sizing',
+        'risk': 'Medium - Normal volatility, favorable entry levels'
+    },
+    'Budget': {
+        'emoji': '🔵',
+        'title': 'BUDGET Zone - Good Value',
+        'description': 'Attractive pricing with room for upside to fair value.',
+        'strategy': 'Consider: Long positions, trend following, value plays',
+        'risk': 'Low-Medium - Good risk/reward balance'
+    },
+    'Fair': {
+        'emoji': '🟢',
+        'title': 'FAIR Zone - Balanced Pricing',
+        'description': 'Trading around historical average levels. Neutral valuation.',
+        'strategy': 'Consider: Momentum strategies, breakout plays, trend following',
+        'risk': 'Medium - Normal volatility expected'
+    },
+    'Plus+': {
+        'emoji': '🟠',
+        'title': 'PLUS+ Zone - Above Fair Value',
+        'description': 'Trading above normal levels. Momentum or early overvaluation.',
+        'strategy': 'Consider: Momentum continuation, reduced position sizing',
+        'risk': 'Medium-High - Correction risk increasing'
+    },
+    'Premium': {
+        'emoji': '🟡',
+        'title': 'PREMIUM Zone - Expensive Territory',
+        'description': 'At historically high levels. Strong momentum or overvaluation.',
+        'strategy': 'Consider: Trend continuation, tight stops, take profits',
+        'risk': 'High - Significant correction risk'
+    },
+    'Premium+': {
+        'emoji': '🟣',
+        'title': 'PREMIUM+ Zone - Extreme Highs',
+        'description': 'At extreme historical levels. Maximum overvaluation risk.',
+        'strategy': 'Consider: Short opportunities, minimal long exposure',
+        'risk': 'Very High - Major correction likely'
     }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Header
-    st.markdown("""
-    <div class="zone-header">
-        <h1>🎯 Zone Locator</h1>
-        <p>Identify if currency pairs are cheap, fairly priced, or expensive based on historical zones</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Control Panel
+}
+
+@st.cache_data(ttl=CHART_CACHE_SECONDS, max_entries=64, show_spinner=False)
+def get_price_chart_json(pair, period, interval, chart_mode, zone_levels_version, max_points=MAX_CHART_POINTS):
+    """
+    Serialized price chart for one pair, shared by every session until it expires.
+    Long histories are downsampled to at most max_points candles (or LTTB points in line mode).
+    """
+    hist_data = yf.Ticker(pair).history(period=period, interval=interval)
+    if hist_data.empty:
+        return None
+    
+    fig = go.Figure()
+    if chart_mode == "Line":
+        close = downsample_line(hist_data['Close'], max_points)
+        fig.add_trace(go.Scatter(
+            x=close.index,
+            y=close.values,
+            mode='lines',
+            name=pair,
+            line=dict(color='#1e40af', width=1.5)
+        ))
+    else:
+        candles = downsample_ohlc(hist_data, max_points)
+        fig.add_trace(go.Candlestick(
+            x=candles.index,
+            open=candles['Open'],
+            high=candles['High'], 
+            low=candles['Low'],
+            close=candles['Close'],
+            name=pair,
+            increasing_line_color='#059669',
+            decreasing_line_color='#dc2626'
+        ))
+    
+    fig.update_layout(
+        xaxis_title="Date",
+        yaxis_title="Price",
+        height=500,
+        template="plotly_white",
+        showlegend=False
+    )
+    return fig.to_json()
+
+def get_zone_snapshot(refresh_data=False):
+    """Current zone snapshot, computed once per session until refreshed (or from the replay clock)"""
+    session = active_replay()
+    if session is not None:
+        return session.snapshot()
+    if refresh_data or 'zone_data' not in st.session_state:
+        scan_time = pd.Timestamp.utcnow()
+        st.session_state.zone_data = generate_current_zone_snapshot(scan_time)
+        st.session_state.zone_data_time = scan_time
+    return st.session_state.zone_data
+
+@st.fragment
+def pair_analysis(zone_df):
+    """Controls, zone card and chart for one pair; changing them reruns only this fragment"""
     st.markdown("## ⚙️ Analysis Controls")
     
-    col1, col2, col3 = st.columns([2, 2, 1])
+    col1, col2, col3 = st.columns([2, 2, 2])
     
     with col1:
         selected_pair = st.selectbox(
@@ -85,57 +177,18 @@ def zone_locator():
     with col2:
         analysis_period = st.selectbox(
             "📅 Analysis Period",
-            ["1 Month", "3 Months", "6 Months", "1 Year"],
+            list(PERIOD_MAP),
             index=2,
             help="Historical period for zone context visualization"
         )
     
     with col3:
-        refresh_data = st.button("🔄 Refresh Data", type="primary")
-    
-    # Zone Legend
-    st.markdown("### 📊 Zone Classification Legend")
-    
-    zone_info = {
-        'Premium+': {'color': '#DA70D6', 'desc': 'Extreme highs, very expensive'},
-        'Premium': {'color': '#FFD700', 'desc': 'Historical highs, expensive'},
-        'Plus+': {'color': '#FFA500', 'desc': 'Above fair value'},
-        'Fair': {'color': '#90EE90', 'desc': 'Balanced pricing'},
-        'Budget': {'color': '#ADD8E6', 'desc': 'Good value territory'},
-        'Discount': {'color': '#FF9999', 'desc': 'Below fair value'},
-        'Clearance': {'color': '#FF5555', 'desc': 'Very cheap levels'},
-        'Reset': {'color': '#A9A9A9', 'desc': 'Historical lows, extreme'}
-    }
-    
-    cols = st.columns(4)
-    for i, (zone, info) in enumerate(zone_info.items()):
-        with cols[i % 4]:
-            st.markdown(f"""
-            <div class="zone-legend">
-                <div style="background: {info['color']}; height: 4px; margin-bottom: 8px; border-radius: 2px;"></div>
-                <strong>{zone}</strong><br>
-                <small>{info['desc']}</small>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown("---")
-    
-    # Get zone data
-    try:
-        with st.spinner("🔍 Loading zone data..."):
-            if refresh_data or 'zone_data' not in st.session_state:
-                zone_df = generate_current_zone_snapshot()
-                st.session_state.zone_data = zone_df
-            else:
-                zone_df = st.session_state.zone_data
-            
-            if zone_df.empty:
-                st.warning("⚠️ No zone data available")
-                return
-                
-    except Exception as e:
-        st.error(f"❌ Error loading zone data: {str(e)}")
-        return
+        chart_interval = st.selectbox(
+            "🕯️ Chart Bars",
+            list(INTERVAL_MAP),
+            help="Long hourly histories are merged into coarser candles for display"
+        )
+        chart_mode = st.radio("Chart Type", ["Candles", "Line"], horizontal=True, label_visibility="collapsed")
     
     # Find selected pair data
     selected_data = zone_df[zone_df['Ticker'] == selected_pair]
@@ -147,35 +200,14 @@ def zone_locator():
     current_zone = selected_data.iloc[0]['Current Zone']
     current_price = selected_data.iloc[0]['Current Price']
     
-    # Zone color mapping
-    zone_colors = {
-        'Premium+': '#DA70D6',
-        'Premium': '#FFD700', 
-        'Plus+': '#FFA500',
-        'Fair': '#90EE90',
-        'Budget': '#ADD8E6',
-        'Discount': '#FF9999',
-        'Clearance': '#FF5555',
-        'Reset': '#A9A9A9'
-    }
-    
-    zone_classes = {
-        'Premium+': 'zone-premium-plus',
-        'Premium': 'zone-premium',
-        'Plus+': 'zone-plus',
-        'Fair': 'zone-fair',
-        'Budget': 'zone-budget',
-        'Discount': 'zone-discount',
-        'Clearance': 'zone-clearance',
-        'Reset': 'zone-reset'
-    }
-    
-    zone_color = zone_colors.get(current_zone, '#6b7280')
-    zone_class = zone_classes.get(current_zone, 'zone-neutral')
+    zone_color = ZONE_COLORS.get(current_zone, '#6b7280')
+    zone_class = ZONE_CLASSES.get(current_zone, 'zone-neutral')
     
     # Current Zone Analysis
     st.markdown("## 📍 Current Zone Analysis")
     
+    interpretation = ZONE_INTERPRETATIONS.get(current_zone, ZONE_INTERPRETATIONS['Fair'])
+    
     col1, col2 = st.columns([1, 2])
     
     with col1:
@@ -193,99 +225,14 @@ def zone_locator():
         """, unsafe_allow_html=True)
     
     with col2:
-        # Zone distribution chart
-        zone_counts = zone_df['Current Zone'].value_counts()
-        
-        fig_dist = go.Figure(data=[
-            go.Bar(
-                x=zone_counts.index,
-                y=zone_counts.values,
-                marker_color=[zone_colors.get(zone, '#6b7280') for zone in zone_counts.index],
-                text=zone_counts.values,
-                textposition='auto',
-            )
-        ])
-        
-        fig_dist.update_layout(
-            title="Current Zone Distribution Across All Pairs",
-            xaxis_title="Zone",
-            yaxis_title="Number of Pairs",
-            height=300,
-            template="plotly_white"
-        )
-        
-        st.plotly_chart(fig_dist, use_container_width=True)
-    
-    # Zone interpretation
-    zone_interpretations = {
-        'Reset': {
-            'emoji': '⚪',
-            'title': 'RESET Zone - Extreme Oversold',
-            'description': 'This currency pair is at historical lows. Maximum risk/reward potential.',
-            'strategy': 'Consider: Contrarian plays, small position sizing, wait for confirmation',
-            'risk': 'Very High - New lows possible, fundamental deterioration likely'
-        },
-        'Clearance': {
-            'emoji': '🔴',
-            'title': 'CLEARANCE Zone - Very Cheap',
-            'description': 'Significantly below normal levels. Strong oversold conditions.',
-            'strategy': 'Consider: Value plays, gradual accumulation, support levels',
-            'risk': 'High - Further decline possible, but good risk/reward'
-        },
-        'Discount': {
-            'emoji': '🟡',
-            'title': 'DISCOUNT Zone - Below Fair Value',
-            'description': 'Trading below historical average. Good value territory.',
-            'strategy': 'Consider: Buying opportunities, normal position sizing',
-            'risk': 'Medium - Normal volatility, favorable entry levels'
-        },
-        'Budget': {
-            'emoji': '🔵',
-            'title': 'BUDGET Zone - Good Value',
-            'description': 'Attractive pricing with room for upside to fair value.',
-            'strategy': 'Consider: Long positions, trend following, value plays',
-            'risk': 'Low-Medium - Good risk/reward balance'
-        },
-        'Fair': {
-            'emoji': '🟢',
-            'title': 'FAIR Zone - Balanced Pricing',
-            'description': 'Trading around historical average levels. Neutral valuation.',
-            'strategy': 'Consider: Momentum strategies, breakout plays, trend following',
-            'risk': 'Medium - Normal volatility expected'
-        },
-        'Plus+': {
-            'emoji': '🟠',
-            'title': 'PLUS+ Zone - Above Fair Value',
-            'description': 'Trading above normal levels. Momentum or early overvaluation.',
-            'strategy': 'Consider: Momentum continuation, reduced position sizing',
-            'risk': 'Medium-High - Correction risk increasing'
-        },
-        'Premium': {
-            'emoji': '🟡',
-            'title': 'PREMIUM Zone - Expensive Territory',
-            'description': 'At historically high levels. Strong momentum or overvaluation.',
-            'strategy': 'Consider: Trend continuation, tight stops, take profits',
-            'risk': 'High - Significant correction risk'
-        },
-        'Premium+': {
-            'emoji': '🟣',
-            'title': 'PREMIUM+ Zone - Extreme Highs',
-            'description': 'At extreme historical levels. Maximum overvaluation risk.',
-            'strategy': 'Consider: Short opportunities, minimal long exposure',
-            'risk': 'Very High - Major correction likely'
-        }
-    }
-    
-    interpretation = zone_interpretations.get(current_zone, zone_interpretations['Fair'])
-    
-    st.markdown(f"""
-    <div class="zone-card {zone_class}">
-        <h3>{interpretation['emoji']} {interpretation['title']}</h3>
-        <p><strong>{interpretation['description']}</strong></p>
-        <p><strong>Strategy Considerations:</strong> {interpretation['strategy']}</p>
-        <p><strong>Risk Level:</strong> {interpretation['risk']}</p>
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="zone-card {zone_class}">
+            <h3>{interpretation['emoji']} {interpretation['title']}</h3>
+            <p><strong>{interpretation['description']}</strong></p>
+            <p><strong>Strategy Considerations:</strong> {interpretation['strategy']}</p>
+            <p><strong>Risk Level:</strong> {interpretation['risk']}</p>
+        </div>
+        """, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -293,30 +240,14 @@ def zone_locator():
     st.markdown("## 📈 Price Chart with Zone Context")
     
     try:
-        period_map = {
-            "1 Month": "1mo",
-            "3 Months": "3mo", 
-            "6 Months": "6mo",
-            "1 Year": "1y"
-        }
-        
-        ticker = yf.Ticker(selected_pair)
-        hist_data = ticker.history(period=period_map[analysis_period])
+        chart_json = get_price_chart_json(
+            selected_pair, PERIOD_MAP[analysis_period], INTERVAL_MAP[chart_interval],
+            chart_mode, levels_version()
+        )
         
-        if not hist_data.empty:
-            # Create candlestick chart
-            fig = go.Figure()
-            
-            fig.add_trace(go.Candlestick(
-                x=hist_data.index,
-                open=hist_data['Open'],
-                high=hist_data['High'], 
-                low=hist_data['Low'],
-                close=hist_data['Close'],
-                name=selected_pair,
-                increasing_line_color='#059669',
-                decreasing_line_color='#dc2626'
-            ))
+        if chart_json is not None:
+            fig = pio.from_json(chart_json)
+            attach_zone_bands(fig, selected_pair)
             
             # Add current price line
             fig.add_hline(
@@ -326,14 +257,7 @@ def zone_locator():
                 annotation_text=f"Current: {current_price:.5f} ({current_zone})"
             )
             
-            fig.update_layout(
-                title=f"{selected_pair} - Current Zone: {current_zone}",
-                xaxis_title="Date",
-                yaxis_title="Price",
-                height=500,
-                template="plotly_white",
-                showlegend=False
-            )
+            fig.update_layout(title=f"{selected_pair} - Current Zone: {current_zone}", margin=dict(r=90))
             
             st.plotly_chart(fig, use_container_width=True)
         else:
@@ -342,9 +266,93 @@ def zone_locator():
     except Exception as e:
         st.error(f"❌ Error creating chart: {str(e)}")
     
-    # All Zones Summary
+    # Time spent in each zone over the hourly history
+    st.markdown("## ⏳ Time in Zone")
+    
+    try:
+        dwell_stats = get_zone_dwell_stats(as_of=replay_time())
+        pair_stats = dwell_stats[(dwell_stats['Ticker'] == selected_pair) & (dwell_stats['Bars'] > 0)]
+        
+        if not pair_stats.empty:
+            col1, col2 = st.columns([1, 1])
+            
+            with col1:
+                fig_dwell = go.Figure(data=[
+                    go.Bar(
+                        x=pair_stats['Time %'],
+                        y=pair_stats['Zone'],
+                        orientation='h',
+                        marker_color=[ZONE_COLORS.get(zone, '#6b7280') for zone in pair_stats['Zone']],
+                        text=[f"{share:.1f}%" for share in pair_stats['Time %']],
+                        textposition='auto',
+                    )
+                ])
+                fig_dwell.update_layout(
+                    title=f"{selected_pair} - Share of Hourly Bars per Zone",
+                    xaxis_title="Time in Zone (%)",
+                    height=320,
+                    template="plotly_white",
+                    yaxis=dict(autorange="reversed")
+                )
+                st.plotly_chart(fig_dwell, use_container_width=True)
+            
+            with col2:
+                st.dataframe(
+                    pair_stats.drop(columns=['Ticker']),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        else:
+            st.info("ℹ️ No zone history available for this pair")
+            
+    except Exception as e:
+        st.error(f"❌ Error computing zone statistics: {str(e)}")
+    
+    # Historical odds of reaching each zone from the current one
+    st.markdown("## 🎲 Zone Reach Probabilities")
+    
+    try:
+        reach_model = get_reach_model(as_of=replay_time())
+        if reach_model is not None and current_zone in ZONE_COLORS:
+            reach_df = reach_model.reach_table(selected_pair, current_zone)
+            st.caption(f"Share of past hourly bars in {current_zone} that reached each zone within the horizon")
+            st.dataframe(
+                reach_df.style.background_gradient(cmap="Blues", axis=None).format("{:.1f}%", na_rep="–"),
+                use_container_width=True
+            )
+        else:
+            st.info("ℹ️ No zone history available for this pair")
+            
+    except Exception as e:
+        st.error(f"❌ Error computing reach probabilities: {str(e)}")
+
+def zone_summary(zone_df):
+    """Zone distribution, table and counts across every pair"""
     st.markdown("## 📊 All Pairs Zone Summary")
     
+    # Zone distribution chart
+    zone_counts = zone_df['Current Zone'].value_counts()
+    
+    fig_dist = go.Figure(data=[
+        go.Bar(
+            x=zone_counts.index,
+            y=zone_counts.values,
+            marker_color=[ZONE_COLORS.get(zone, '#6b7280') for zone in zone_counts.index],
+            text=zone_counts.values,
+            textposition='auto',
+        )
+    ])
+    
+    fig_dist.update_layout(
+        title="Current Zone Distribution Across All Pairs",
+        xaxis_title="Zone",
+        yaxis_title="Number of Pairs",
+        height=300,
+        template="plotly_white"
+    )
+    
+    st.plotly_chart(fig_dist, use_container_width=True)
+    
     # Style the dataframe
     styled_df = zone_df.copy()
     styled_df['Current Price'] = styled_df['Current Price'].round(5)
@@ -359,6 +367,24 @@ def zone_locator():
         }
     )
     
+    # The workbook is only built on request, from the stored scan this session is showing
+    scan_time = st.session_state.get('zone_data_time')
+    if active_replay() is None and scan_time is not None:
+        workbook = st.session_state.get('zone_workbook')
+        if (workbook is None or workbook[0] != scan_time) and st.button("📊 Prepare Excel Heatmap"):
+            workbook = (scan_time, get_report_store().snapshot_workbook_bytes(scan_time))
+            st.session_state.zone_workbook = workbook
+        if workbook is not None and workbook[0] == scan_time:
+            if workbook[1]:
+                st.download_button(
+                    "📥 Download Excel Heatmap",
+                    workbook[1],
+                    file_name=f"zone_snapshot_{scan_time.strftime('%Y%m%d_%H%M')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            else:
+                st.warning("⚠️ This snapshot is no longer in the report store")
+    
     # Zone Statistics
     col1, col2, col3 = st.columns(3)
     
@@ -374,6 +400,138 @@ def zone_locator():
         cheap_zones = zone_df[zone_df['Current Zone'].isin(['Discount', 'Clearance', 'Reset'])].shape[0]
         st.metric("🔵 Cheap Pairs", cheap_zones)
     
+    # Pairs closest to leaving their current zone
+    st.markdown(f"### 🚨 Near Zone Boundary (Top {WATCHLIST_SIZE})")
+    
+    try:
+        watchlist_df = near_boundary_watchlist(zone_df, WATCHLIST_SIZE, replay_time())
+        
+        if watchlist_df.empty:
+            st.info("ℹ️ No pairs with known zone boundaries")
+        else:
+            st.dataframe(watchlist_df, use_container_width=True, hide_index=True)
+            st.caption("Signed distance from the current price to the zone's upper (+) and lower (−) boundary; "
+                       "ATR is the 14-day average true range. Pairs are ranked by the nearer boundary.")
+            
+    except Exception as e:
+        st.error(f"❌ Error building near-boundary watchlist: {str(e)}")
+    
+    # Key levels touched by recent hourly bars
+    st.markdown("### 📌 Key Level Touches (Last 24h)")
+    
+    try:
+        history_panel = get_history_panel(as_of=replay_time())
+        touches_df = scan_level_touches(history_panel) if history_panel is not None else pd.DataFrame()
+        
+        if touches_df.empty:
+            st.info("ℹ️ No key level touches in the last 24 hours")
+        else:
+            st.dataframe(touches_df, use_container_width=True, hide_index=True)
+            
+    except Exception as e:
+        st.error(f"❌ Error scanning key level touches: {str(e)}")
+
+def zone_locator():
+    # Custom CSS for enhanced styling
+    st.markdown("""
+    <style>
+    .zone-header {
+        background: linear-gradient(90deg, #1e40af 0%, #3b82f6 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        text-align: center;
+    }
+    
+    .zone-card {
+        background: linear-gradient(145deg, #f8fafc 0%, #e2e8f0 100%);
+        padding: 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+        margin: 1rem 0;
+        border-left: 5px solid;
+        color: #374151;
+    }
+    
+    .zone-reset { border-left-color: #A9A9A9; background: linear-gradient(145deg, #f8fafc 0%, #f1f5f9 100%); }
+    .zone-clearance { border-left-color: #FF5555; background: linear-gradient(145deg, #fef2f2 0%, #fecaca 100%); }
+    .zone-discount { border-left-color: #FF9999; background: linear-gradient(145deg, #fff5f5 0%, #fed7d7 100%); }
+    .zone-budget { border-left-color: #ADD8E6; background: linear-gradient(145deg, #eff6ff 0%, #dbeafe 100%); }
+    .zone-fair { border-left-color: #90EE90; background: linear-gradient(145deg, #f0fdf4 0%, #dcfce7 100%); }
+    .zone-plus { border-left-color: #FFA500; background: linear-gradient(145deg, #fffbeb 0%, #fed7aa 100%); }
+    .zone-premium { border-left-color: #FFD700; background: linear-gradient(145deg, #fefce8 0%, #fef08a 100%); }
+    .zone-premium-plus { border-left-color: #DA70D6; background: linear-gradient(145deg, #faf5ff 0%, #e9d5ff 100%); }
+    
+    .metric-box {
+        background: linear-gradient(145deg, #f8fafc 0%, #e2e8f0 100%);
+        padding: 1rem;
+        border-radius: 8px;
+        text-align: center;
+        margin: 0.5rem 0;
+        border: 2px solid #e2e8f0;
+    }
+    
+    .zone-legend {
+        background: linear-gradient(145deg, #f0f9ff 0%, #e0f2fe 100%);
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 1rem 0;
+        color: #374151;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+    
+    # Header
+    st.markdown("""
+    <div class="zone-header">
+        <h1>🎯 Zone Locator</h1>
+        <p>Identify if currency pairs are cheap, fairly priced, or expensive based on historical zones</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Refresh recomputes the snapshot for every pair (full rerun)
+    col1, col2 = st.columns([6, 1])
+    
+    with col2:
+        refresh_data = st.button("🔄 Refresh Data", type="primary")
+    
+    # Zone Legend
+    st.markdown("### 📊 Zone Classification Legend")
+    
+    cols = st.columns(4)
+    for i, (zone, info) in enumerate(ZONE_INFO.items()):
+        with cols[i % 4]:
+            st.markdown(f"""
+            <div class="zone-legend">
+                <div style="background: {info['color']}; height: 4px; margin-bottom: 8px; border-radius: 2px;"></div>
+                <strong>{zone}</strong><br>
+                <small>{info['desc']}</small>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Get zone data
+    try:
+        with st.spinner("🔍 Loading zone data..."):
+            zone_df = get_zone_snapshot(refresh_data)
+            
+            if zone_df.empty:
+                st.warning("⚠️ No zone data available")
+                return
+                
+    except Exception as e:
+        st.error(f"❌ Error loading zone data: {str(e)}")
+        return
+    
+    # Pair controls rerun only this fragment; the all-pairs summary below is not rebuilt
+    pair_analysis(zone_df)
+    
+    st.markdown("---")
+    
+    zone_summary(zone_df)
+    
     # Footer
     st.markdown("---")
     st.markdown("""
@@ -383,4 +541,4 @@ def zone_locator():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    zone_locator()
\ No newline at end of file
+    zone_locator()
@@ -1,27 +1,29 @@
 # viz/zone_transitions.py
 import streamlit as st
 import pandas as pd
-import os
 from datetime import datetime, timedelta, timezone
 
+from core.report_store import get_report_store
+from viz.replay import active_replay
+
 def zone_transitions():
     st.title("🔄 Zone Transitions")
 
-    log_file = "reports/zone_transition_log.csv"
-    if not os.path.exists(log_file):
-        st.warning("Zone transition log not found.")
-        return
-
+    store = get_report_store()
+    session = active_replay()
     try:
-        # Read the CSV file
-        df = pd.read_csv(log_file)
+        # In replay mode the page shows the replayed log, which stops at the replay clock
+        df = session.transitions() if session is not None else store.transitions()
+        if df.empty:
+            st.warning("Zone transition log not found.")
+            return
         
         # Standardize column names - convert 'Date' to 'Timestamp' if needed
         if 'Date' in df.columns and 'Timestamp' not in df.columns:
             df = df.rename(columns={'Date': 'Timestamp'})
         
         if 'Timestamp' not in df.columns:
-            st.error("No valid date column found in the CSV file.")
+            st.error("No valid date column found in the transition log.")
             return
         
         # Parse the timestamp column with proper format handling
@@ -31,7 +33,8 @@ def zone_transitions():
         df['Timestamp'] = df['Timestamp'].dt.tz_convert(None)  # Remove timezone info
         
         # Filter for last 24 hours only
-        cutoff_time = datetime.now() - timedelta(hours=24)
+        now = session.clock.now().tz_convert(None) if session is not None else datetime.now()
+        cutoff_time = now - timedelta(hours=24)
         
         # Filter dataframe for last 24 hours
         df_recent = df[df['Timestamp'] >= cutoff_time].copy()
@@ -95,11 +98,11 @@ def zone_transitions():
         st.error(f"Failed to load zone transitions: {e}")
         st.write("Error details:", str(e))
         
-        # Try to show what's actually in the file for debugging
+        # Try to show what's actually in the store for debugging
         try:
-            df_sample = pd.read_csv(log_file, nrows=5)
-            st.write("First few lines of the CSV file:")
+            df_sample = store.transitions().head(5)
+            st.write("First few rows of the transition log:")
             st.write(df_sample)
             st.write("Available columns:", list(df_sample.columns))
         except Exception as debug_e:
-            st.write("Could not read CSV file at all:", str(debug_e))
\ No newline at end of file
+            st.write(f"Could not read {store.path.name} at all:", str(debug_e))
\ No newline at end of file